@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from adminapp.services.audit_service import maintain_audit_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly audit_log partitions and detach/drop months past retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=None, help="Future partitions to keep ready.")
+        parser.add_argument("--keep-months", type=int, default=None, help="Retention in months (0 = keep all).")
+        parser.add_argument("--mode", choices=["detach", "drop"], default=None, help="What to do with old months.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be retired.")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Run periodically every N seconds (0 = run once).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            report = maintain_audit_partitions(
+                months_ahead=options["months_ahead"],
+                keep_months=options["keep_months"],
+                mode=options["mode"],
+                dry_run=options["dry_run"],
+            )
+
+            mb = report["retired_bytes"] / (1024 * 1024)
+            verb = "Would retire" if report["dry_run"] else ("Dropped" if report["mode"] == "drop" else "Detached")
+            self.stdout.write(
+                f"Created {report['created']} partitions. {verb} {len(report['retired'])} "
+                f"({mb:.2f} MB): {', '.join(report['retired']) or '-'}"
+            )
+
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
@@ -38,10 +38,11 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Iterator
 from uuid import UUID
 
-from backend.utils.db import fetch_all
+from backend.utils.db import fetch_all, fetch_one, execute, stream_all
+from backend.utils.user_labels import get_user_labels
 
 USER_ID_KEYS = {"owner_id", "created_by", "updated_by", "uploaded_by", "user_id"}
 
@@ -81,39 +82,88 @@ def _collect_user_ids_from_obj(obj: Any, bucket: set[str]) -> None:
                     _collect_user_ids_from_obj(item, bucket)
 
 
-def _enrich_obj_with_user_labels(obj: Any, user_map: dict[str, str]) -> Any:
+def _enrich_obj_with_user_labels(obj: Any, user_map: dict[str, str | None]) -> Any:
+    """
+    Adds <x>_email for every user id key, at any depth: full rows, {"old", "new"}
+    pairs and diff payloads ({"key", "old", "new"} holding only changed columns) alike.
+    In place: payloads are freshly decoded per page, and dicts without user ids are
+    left untouched instead of being rebuilt.
+    """
     if not isinstance(obj, dict):
         return obj
 
-    enriched = {}
+    labels = {}
 
     for key, value in obj.items():
         if isinstance(value, dict):
-            enriched[key] = _enrich_obj_with_user_labels(value, user_map)
-            continue
-
-        if isinstance(value, list):
-            enriched[key] = [
-                _enrich_obj_with_user_labels(item, user_map) if isinstance(item, dict) else item
-                for item in value
-            ]
-            continue
-
-        enriched[key] = value
-
-        if key in USER_ID_KEYS:
+            _enrich_obj_with_user_labels(value, user_map)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    _enrich_obj_with_user_labels(item, user_map)
+        elif key in USER_ID_KEYS:
             uid = _safe_uuid(value)
             if uid:
                 label_key = key.replace("_id", "_email") if key.endswith("_id") else f"{key}_email"
-                enriched[label_key] = user_map.get(uid)
+                labels[label_key] = user_map.get(uid)
 
-    return enriched
+    if labels:
+        obj.update(labels)
+    return obj
 
 
-def list_audit_logs(limit: int, action: str | None, entity: str | None) -> list[dict]:
+AUDIT_LOG_COLUMNS = """
+          a.id,
+          a.actor_id,
+          a.action,
+          a.entity,
+          a.entity_id,
+          a.payload,
+          a.created_at
+"""
+
+
+def _audit_where(
+    action: str | None = None,
+    entity: str | None = None,
+    date_from=None,
+    date_to=None,
+    entity_id: str | None = None,
+    actor_id: str | None = None,
+    before: tuple | None = None,
+    task_id: str | None = None,
+) -> tuple[str, list]:
     where = []
     params = []
 
+    if task_id:
+        where.append("a.task_id = %s")
+        params.append(task_id)
+
+    if entity_id:
+        where.append("a.entity_id = %s")
+        params.append(entity_id)
+
+    if actor_id:
+        where.append("a.actor_id = %s")
+        params.append(actor_id)
+
+    if before:
+        # the row comparison drives the index; partitions are only pruned on a plain
+        # created_at bound, so repeat it (<=: same-timestamp rows with a lower id)
+        where.append("(a.created_at, a.id) < (%s, %s)")
+        where.append("a.created_at <= %s")
+        params += [before[0], before[1], before[0]]
+
+    # plain created_at bounds let the planner prune monthly partitions
+    if date_from:
+        where.append("a.created_at >= %s")
+        params.append(date_from)
+
+    if date_to:
+        where.append("a.created_at < %s")
+        params.append(date_to)
+
     if action:
         where.append("a.action = %s")
         params.append(action)
@@ -123,27 +173,57 @@ def list_audit_logs(limit: int, action: str | None, entity: str | None) -> list[
         params.append(entity)
 
     where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    return where_sql, params
+
+
+def list_audit_logs(limit: int, action: str | None, entity: str | None, **filters) -> list[dict]:
+    """
+    Newest first. filters: date_from, date_to, entity_id, actor_id, task_id and
+    `before` = (created_at, id) keyset cursor. Each single filter has a matching
+    (<col>, created_at, id) index, so a page is an index range scan.
+    task_id = the task plus its comments and attachments (one timeline).
+    """
+    where_sql, params = _audit_where(action=action, entity=entity, **filters)
 
     logs = fetch_all(
         f"""
-        SELECT
-          a.id,
-          a.actor_id,
-          u.email AS actor_email,
-          a.action,
-          a.entity,
-          a.entity_id,
-          a.payload,
-          a.created_at
+        SELECT {AUDIT_LOG_COLUMNS}
         FROM audit_log a
-        LEFT JOIN users u ON u.id = a.actor_id
         {where_sql}
-        ORDER BY a.created_at DESC
+        ORDER BY a.created_at DESC, a.id DESC
         LIMIT %s;
         """,
         params + [limit],
     )
 
+    return _enrich_logs(logs)
+
+
+def iter_audit_logs(chunk_size: int, **filters) -> Iterator[list[dict]]:
+    """
+    Every matching row, oldest first, as enriched chunks of chunk_size (export).
+    Same filters as list_audit_logs; read through a server-side cursor.
+    """
+    where_sql, params = _audit_where(**filters)
+
+    for chunk in stream_all(
+        f"""
+        SELECT {AUDIT_LOG_COLUMNS}
+        FROM audit_log a
+        {where_sql}
+        ORDER BY a.created_at, a.id;
+        """,
+        params,
+        chunk_size=chunk_size,
+    ):
+        yield _enrich_logs(chunk)
+
+
+def _enrich_logs(logs: list[dict]) -> list[dict]:
+    """
+    actor_email + payload user labels for the whole page in one get_user_labels() call
+    (cached ids cost nothing; the rest are one batched users lookup).
+    """
     if not logs:
         return logs
 
@@ -158,28 +238,41 @@ def list_audit_logs(limit: int, action: str | None, entity: str | None) -> list[
         log["payload"] = payload
         _collect_user_ids_from_obj(payload, user_ids)
 
-    if not user_ids:
-        return logs
+    user_map = get_user_labels(user_ids)
+
+    for log in logs:
+        log["actor_email"] = user_map.get(_safe_uuid(log.get("actor_id")) or "")
+        if user_map:
+            _enrich_obj_with_user_labels(log["payload"], user_map)
+
+    return logs
+
+
+def ensure_audit_partitions(months_ahead: int) -> int:
+    row = fetch_one("SELECT fn_audit_log_ensure_partitions(%s) AS created;", [months_ahead])
+    return int(row["created"]) if row else 0
+
 
-    user_rows = fetch_all(
+def list_audit_partitions() -> list[dict]:
+    return fetch_all(
+        """
+        SELECT
+          c.relname AS name,
+          pg_get_expr(c.relpartbound, c.oid) AS bound,
+          pg_total_relation_size(c.oid) AS total_bytes
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass('audit_log')
+        ORDER BY c.relname;
         """
-        SELECT id, email
-        FROM users
-        WHERE id = ANY(%s::uuid[])
-        """,
-        [list(user_ids)],
     )
 
-    user_map = {str(row["id"]): row["email"] for row in user_rows}
 
-    enriched_logs = []
-    for log in logs:
-        enriched_logs.append(
-            {
-                **log,
-                "payload": _enrich_obj_with_user_labels(log.get("payload"), user_map),
-            }
-        )
-
-    #print("AUDIT ENRICHED SAMPLE:", enriched_logs[0] if enriched_logs else None)
-    return enriched_logs
\ No newline at end of file
+def detach_audit_partition(name: str, archive_name: str) -> None:
+    # names come from list_audit_partitions and are checked by the caller
+    execute(f'ALTER TABLE audit_log DETACH PARTITION "{name}";')
+    execute(f'ALTER TABLE "{name}" RENAME TO "{archive_name}";')
+
+
+def drop_audit_partition(name: str) -> None:
+    execute(f'DROP TABLE "{name}";')
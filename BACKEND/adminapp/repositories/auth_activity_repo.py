@@ -1,23 +1,39 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
 from django.utils.dateparse import parse_date
 from backend.utils.db import fetch_all, fetch_one
 
 ALLOWED_EVENTS = {"LOGIN", "LOGOUT", "FAILED_LOGIN","SESSION_TIMEOUT"}
 
-def list_auth_activity(
+
+def _day_start(d):
+    # midnight in TIME_ZONE (UTC), same day boundary the old created_at::date used
+    return timezone.make_aware(datetime.combine(d, time.min))
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _auth_activity_where(
     email=None,
     event=None,
     success=None,
     date_from=None,
     date_to=None,
-    limit=100,
-    offset=0,
-):
+) -> tuple[str, list]:
+    """
+    Shared by list + count. Every condition is index-friendly: the email substring
+    uses idx_auth_activity_email_trgm, dates are a half-open created_at range
+    (idx_auth_activity_created_at), date_to being inclusive of that whole day.
+    """
     where = []
     params = []
 
     if email:
         where.append("LOWER(a.email) LIKE %s")
-        params.append(f"%{email.strip().lower()}%")
+        params.append(f"%{_like_escape(email.strip().lower())}%")
 
     if event:
         ev = event.strip().upper()
@@ -32,16 +48,29 @@ def list_auth_activity(
     if date_from:
         d = parse_date(date_from)
         if d:
-            where.append("a.created_at::date >= %s")
-            params.append(d)
+            where.append("a.created_at >= %s")
+            params.append(_day_start(d))
 
     if date_to:
         d = parse_date(date_to)
         if d:
-            where.append("a.created_at::date <= %s")
-            params.append(d)
+            where.append("a.created_at < %s")
+            params.append(_day_start(d + timedelta(days=1)))
 
     where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    return where_sql, params
+
+
+def list_auth_activity(
+    email=None,
+    event=None,
+    success=None,
+    date_from=None,
+    date_to=None,
+    limit=100,
+    offset=0,
+):
+    where_sql, params = _auth_activity_where(email, event, success, date_from, date_to)
 
     sql = f"""
         SELECT
@@ -70,39 +99,10 @@ def count_auth_activity(
     date_from=None,
     date_to=None,
 ) -> int:
-    where = []
-    params = []
-
-    if email:
-        where.append("LOWER(a.email) LIKE %s")
-        params.append(f"%{email.strip().lower()}%")
-
-    if event:
-        ev = event.strip().upper()
-        if ev in ALLOWED_EVENTS:
-            where.append("a.event = %s")
-            params.append(ev)
-
-    if success in ["true", "false"]:
-        where.append("a.success = %s")
-        params.append(success == "true")
-
-    if date_from:
-        d = parse_date(date_from)
-        if d:
-            where.append("a.created_at::date >= %s")
-            params.append(d)
-
-    if date_to:
-        d = parse_date(date_to)
-        if d:
-            where.append("a.created_at::date <= %s")
-            params.append(d)
-
-    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    where_sql, params = _auth_activity_where(email, event, success, date_from, date_to)
 
     row = fetch_one(
         f"SELECT COUNT(*)::bigint AS total FROM auth_activity a {where_sql};",
         params,
     )
-    return int(row["total"]) if row else 0
\ No newline at end of file
+    return int(row["total"]) if row else 0
@@ -1,3 +1,4 @@
+from backend.utils.cursors import encode_cursor
 from adminapp.repositories.user_repo import list_users
 from adminapp.repositories.audit_repo import list_audit_logs
 from adminapp.repositories.auth_activity_repo import list_auth_activity, count_auth_activity
@@ -8,8 +9,8 @@ def get_users() -> list[dict]:
         u["id"] = str(u["id"])
     return users
 
-def get_audit_logs(limit: int, action: str | None, entity: str | None) -> list[dict]:
-    logs = list_audit_logs(limit=limit, action=action, entity=entity)
+def get_audit_logs(limit: int, action: str | None, entity: str | None, date_from=None, date_to=None, **filters) -> list[dict]:
+    logs = list_audit_logs(limit=limit, action=action, entity=entity, date_from=date_from, date_to=date_to, **filters)
 
     for l in logs:
         if l.get("actor_id"):
@@ -19,6 +20,25 @@ def get_audit_logs(limit: int, action: str | None, entity: str | None) -> list[d
 
     return logs
 
+def get_audit_logs_page(limit: int, **filters) -> dict:
+    """
+    filters: action, entity, date_from, date_to, entity_id, actor_id, task_id, before (cursor tuple).
+    """
+    logs = get_audit_logs(
+        limit=limit + 1,
+        action=filters.pop("action", None),
+        entity=filters.pop("entity", None),
+        **filters,
+    )
+    has_more = len(logs) > limit
+    logs = logs[:limit]
+
+    return {
+        "logs": logs,
+        "next_before": encode_cursor(logs[-1]["created_at"], logs[-1]["id"]) if logs else None,
+        "has_more": has_more,
+    }
+
 def get_auth_activity(email: str | None, date_from: str | None, date_to: str | None, page: int, limit: int) -> dict:
     offset = (page - 1) * limit
     items = list_auth_activity(email=email, date_from=date_from, date_to=date_to, limit=limit, offset=offset)
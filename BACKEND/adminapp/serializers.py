@@ -108,6 +108,11 @@ class AuditLogQuerySerializer(serializers.Serializer):
     limit = serializers.IntegerField(required=False, default=100)
     action = serializers.CharField(required=False, allow_blank=True)
     entity = serializers.CharField(required=False, allow_blank=True)
+    date_from = serializers.DateTimeField(required=False)
+    date_to = serializers.DateTimeField(required=False)
+    entity_id = serializers.UUIDField(required=False)
+    actor_id = serializers.UUIDField(required=False)
+    before = serializers.CharField(required=False, allow_blank=False, max_length=200)
 
     def validate_limit(self, value: int):
         if value < 1 or value > 500:
@@ -123,6 +128,30 @@ class AuditLogQuerySerializer(serializers.Serializer):
         return v.lower() if v else ""
 
 
+class AuditLogExportSerializer(serializers.Serializer):
+    format = serializers.ChoiceField(choices=["ndjson", "csv"], required=False, default="ndjson")
+    action = serializers.CharField(required=False, allow_blank=True)
+    entity = serializers.CharField(required=False, allow_blank=True)
+    date_from = serializers.DateTimeField(required=False)
+    date_to = serializers.DateTimeField(required=False)
+    entity_id = serializers.UUIDField(required=False)
+    actor_id = serializers.UUIDField(required=False)
+
+    def validate_action(self, value: str):
+        v = (value or "").strip()
+        return v.upper() if v else ""
+
+    def validate_entity(self, value: str):
+        v = (value or "").strip()
+        return v.lower() if v else ""
+
+
+class NotificationArchiveSerializer(serializers.Serializer):
+    days = serializers.IntegerField(required=False, min_value=1, max_value=3650)
+    # kept small: bigger backlogs belong to `manage.py archive_notifications`
+    max_batches = serializers.IntegerField(required=False, default=5, min_value=1, max_value=10)
+
+
 class SendDocumentSerializer(serializers.Serializer):
     to_email = serializers.EmailField(required=True)
     subject = serializers.CharField(required=False, allow_blank=True, default="Document")
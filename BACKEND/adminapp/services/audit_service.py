@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+import re
+from datetime import date
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from adminapp.repositories.audit_repo import (
+    ensure_audit_partitions,
+    list_audit_partitions,
+    detach_audit_partition,
+    drop_audit_partition,
+    iter_audit_logs,
+)
+
+PARTITION_RE = re.compile(r"^audit_log_(\d{4})(\d{2})$")
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_CSV_COLUMNS = ["created_at", "id", "actor_id", "actor_email", "action", "entity", "entity_id", "payload"]
+
+
+def _add_months(d: date, months: int) -> date:
+    y, m = divmod(d.year * 12 + (d.month - 1) + months, 12)
+    return date(y, m + 1, 1)
+
+
+def maintain_audit_partitions(
+    months_ahead: int | None = None,
+    keep_months: int | None = None,
+    mode: str | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Create the next monthly audit_log partitions and retire whole months older than
+    `keep_months` (0 = keep everything): "detach" keeps them as audit_log_archived_YYYYMM,
+    "drop" deletes them.
+    """
+    months_ahead = settings.AUDIT_LOG_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    keep_months = settings.AUDIT_LOG_RETENTION_MONTHS if keep_months is None else keep_months
+    mode = mode or settings.AUDIT_LOG_RETENTION_MODE
+    if mode not in ("detach", "drop"):
+        raise ValueError("mode must be detach or drop")
+
+    created = 0 if dry_run else ensure_audit_partitions(months_ahead)
+
+    expired = []
+    if keep_months > 0:
+        this_month = timezone.now().date().replace(day=1)  # UTC (USE_TZ)
+        cutoff = _add_months(this_month, -keep_months)
+        for p in list_audit_partitions():
+            m = PARTITION_RE.match(p["name"])
+            if m and date(int(m.group(1)), int(m.group(2)), 1) < cutoff:
+                expired.append(p)
+
+    if not dry_run:
+        for p in expired:
+            with transaction.atomic():
+                if mode == "drop":
+                    drop_audit_partition(p["name"])
+                else:
+                    detach_audit_partition(p["name"], p["name"].replace("audit_log_", "audit_log_archived_", 1))
+
+    return {
+        "created": created,
+        "mode": mode,
+        "dry_run": dry_run,
+        "retired": [p["name"] for p in expired],
+        "retired_bytes": sum(int(p["total_bytes"]) for p in expired),
+    }
+
+
+def _json(value) -> str:
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(",", ":"))
+
+
+def export_audit_logs(fmt: str, chunk_size: int | None = None, **filters):
+    """
+    Yields the export body (oldest first) one chunk at a time: rows come from a
+    server-side cursor and user labels are resolved per chunk, so memory does not grow
+    with the number of rows. filters: same as list_audit_logs, without `before`.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("format must be ndjson or csv")
+    chunk_size = chunk_size or settings.AUDIT_EXPORT_CHUNK_SIZE
+
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(EXPORT_CSV_COLUMNS)
+        yield buf.getvalue().encode()
+
+    for chunk in iter_audit_logs(chunk_size, **filters):
+        if fmt == "ndjson":
+            yield "".join(_json(log) + "\n" for log in chunk).encode()
+            continue
+
+        buf.seek(0)
+        buf.truncate()
+        for log in chunk:
+            writer.writerow([
+                log["created_at"].isoformat(),
+                log["id"],
+                log.get("actor_id") or "",
+                log.get("actor_email") or "",
+                log["action"],
+                log["entity"],
+                log.get("entity_id") or "",
+                _json(log.get("payload")),
+            ])
+        yield buf.getvalue().encode()
@@ -57,10 +57,13 @@
 import secrets
 from datetime import timedelta
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
 from backend.utils.security import hash_password, sha256_hex
-from backend.utils.mailer import send_welcome_email, send_verification_email
+from backend.utils.outbox import enqueue_email
+from backend.utils.user_labels import invalidate_user_labels
+from tasks.repositories.task_repo import invalidate_notify_prefs
 
 from adminapp.repositories.user_repo import (
     user_exists_by_email,
@@ -82,32 +85,27 @@ def create_user(actor_id: str, email: str, role: str) -> None:
     temp_password = secrets.token_urlsafe(10)
     password_hash = hash_password(temp_password)
 
-    create_user_via_proc(actor_id, email, password_hash, role)
+    with transaction.atomic():
+        create_user_via_proc(actor_id, email, password_hash, role)
 
-    urow = get_user_id_by_email(email)
-    if not urow:
-        return
+        urow = get_user_id_by_email(email)
+        if not urow:
+            return
 
-    raw_token = secrets.token_urlsafe(32)
-    token_sha = sha256_hex(raw_token)
+        raw_token = secrets.token_urlsafe(32)
+        token_sha = sha256_hex(raw_token)
 
-    minutes = getattr(settings, "VERIFY_TOKEN_MINUTES", 60)
-    expires_at = timezone.now() + timedelta(minutes=minutes)
+        minutes = getattr(settings, "VERIFY_TOKEN_MINUTES", 60)
+        expires_at = timezone.now() + timedelta(minutes=minutes)
 
-    invalidate_email_verification_tokens(str(urow["id"]))
-    insert_email_verification_token(str(urow["id"]), token_sha, expires_at)
+        invalidate_email_verification_tokens(str(urow["id"]))
+        insert_email_verification_token(str(urow["id"]), token_sha, expires_at)
 
-    verify_link = f"{settings.FRONTEND_VERIFY_URL}?token={raw_token}"
+        verify_link = f"{settings.FRONTEND_VERIFY_URL}?token={raw_token}"
 
-    try:
-        send_welcome_email(email)
-    except Exception:
-        pass
-
-    try:
-        send_verification_email(email, verify_link, minutes)
-    except Exception:
-        pass
+        # ✉️ sent by the outbox worker once the user row is committed
+        enqueue_email("WELCOME", email)
+        enqueue_email("VERIFY_EMAIL", email, {"verify_link": verify_link, "minutes": minutes})
 
 
 def change_user_status(actor_id: str, target_user_id: str, is_active: bool) -> dict:
@@ -130,6 +128,8 @@ def change_user_status(actor_id: str, target_user_id: str, is_active: bool) -> d
         }
 
     update_user_active_status(target_user_id, is_active)
+    invalidate_notify_prefs(target_user_id)
+    invalidate_user_labels()
 
     action = "ACTIVATE_USER" if is_active else "DEACTIVATE_USER"
     insert_user_status_audit_log(
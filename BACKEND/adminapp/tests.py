@@ -1,3 +1,30 @@
-from django.test import TestCase
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from adminapp.repositories.audit_repo import _enrich_logs
+
+U1 = str(uuid.uuid4())
+U2 = str(uuid.uuid4())
+
+
+class EnrichLogsTests(SimpleTestCase):
+    def test_labels_added_in_place_and_untouched_dicts_not_copied(self):
+        key = {"task_id": str(uuid.uuid4())}
+        payload = {"key": key, "old": {"owner_id": U1}, "new": {"owner_id": None}}
+        log = {"id": 1, "actor_id": uuid.UUID(U2), "payload": payload}
+
+        with mock.patch(
+            "adminapp.repositories.audit_repo.get_user_labels",
+            return_value={U1: "a@x", U2: "b@x"},
+        ):
+            (out,) = _enrich_logs([log])
+
+        self.assertIs(out, log)
+        self.assertIs(out["payload"], payload)
+        self.assertIs(out["payload"]["key"], key)
+        self.assertEqual(list(key), ["task_id"])
+        self.assertEqual(out["actor_email"], "b@x")
+        self.assertEqual(payload["old"], {"owner_id": U1, "owner_email": "a@x"})
+        self.assertEqual(payload["new"], {"owner_id": None})
@@ -4,9 +4,12 @@ from .views import (
     CreateUserView,
     UpdateUserStatusView,
     ListAuditLogsView,
+    AuditLogExportView,
     SendDocumentEmailView,
     AdminAuthActivityView,
     AdminAuthActivityExportView,
+    NotificationStorageView,
+    NotificationArchiveView,
 )
 
 urlpatterns = [
@@ -14,7 +17,10 @@ urlpatterns = [
     path("users/create", CreateUserView.as_view()),
     path("users/<uuid:user_id>/status", UpdateUserStatusView.as_view()),
     path("audit-logs", ListAuditLogsView.as_view()),
+    path("audit-logs/export", AuditLogExportView.as_view()),
     path("send-document", SendDocumentEmailView.as_view()),
     path("auth-activity", AdminAuthActivityView.as_view()),
     path("auth-activity/export", AdminAuthActivityExportView.as_view()),
+    path("notifications/storage", NotificationStorageView.as_view()),
+    path("notifications/archive", NotificationArchiveView.as_view()),
 ]
\ No newline at end of file
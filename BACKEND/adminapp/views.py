@@ -159,22 +159,32 @@
 
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.conf import settings
 from django.http import HttpResponse
+from django.utils import timezone
 import csv
 
 from backend.utils.decorators import require_auth
 from backend.utils.responses import ok, fail
+from backend.utils.circuit_breaker import CircuitOpenError
+from backend.utils.mailer import SendDeadlineExceeded
+from backend.utils.cursors import decode_cursor
+from backend.utils.streaming import streaming_response
 
 from adminapp.serializers import (
     CreateUserSerializer,
     UpdateUserStatusSerializer,
     AuditLogQuerySerializer,
+    AuditLogExportSerializer,
     SendDocumentSerializer,
+    NotificationArchiveSerializer,
 )
 
-from adminapp.selectors.admin_selector import get_users, get_audit_logs
+from adminapp.selectors.admin_selector import get_users, get_audit_logs_page
 from adminapp.services.user_service import create_user, change_user_status
 from adminapp.services.document_service import send_document
+from adminapp.services.audit_service import export_audit_logs, EXPORT_FORMATS
+from tasks.services.notification_service import archive_old_notifications, get_notification_storage
 
 from adminapp.repositories.auth_activity_repo import (
     list_auth_activity,
@@ -237,6 +247,10 @@ class UpdateUserStatusView(APIView):
 
 
 class ListAuditLogsView(APIView):
+    """
+    GET /api/admin/audit-logs?limit=100&action=&entity=&entity_id=&actor_id=
+        &date_from=&date_to=&before=<next_before>
+    """
     @require_auth(roles=["ADMIN"])
     def get(self, request):
         ser = AuditLogQuerySerializer(data=request.GET)
@@ -246,8 +260,63 @@ class ListAuditLogsView(APIView):
         action = ser.validated_data.get("action") or None
         entity = ser.validated_data.get("entity") or None
 
-        logs = get_audit_logs(limit=limit, action=action, entity=entity)
-        return ok(data={"logs": logs})
+        try:
+            before = decode_cursor(ser.validated_data["before"]) if ser.validated_data.get("before") else None
+        except ValueError as ex:
+            return fail("Invalid cursor", errors={"detail": str(ex)}, status=400)
+
+        entity_id = ser.validated_data.get("entity_id")
+        actor_id = ser.validated_data.get("actor_id")
+
+        page = get_audit_logs_page(
+            limit=limit,
+            action=action,
+            entity=entity,
+            date_from=ser.validated_data.get("date_from"),
+            date_to=ser.validated_data.get("date_to"),
+            entity_id=str(entity_id) if entity_id else None,
+            actor_id=str(actor_id) if actor_id else None,
+            before=before,
+        )
+        return ok(data=page)
+
+
+class AuditLogExportView(APIView):
+    """
+    GET /api/admin/audit-logs/export?format=ndjson|csv&action=&entity=&entity_id=
+        &actor_id=&date_from=&date_to=
+    Streams every matching row, oldest first.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= is ours, not DRF's renderer override
+        return super().perform_content_negotiation(request, force=True)
+
+    @require_auth(roles=["ADMIN"])
+    def get(self, request):
+        ser = AuditLogExportSerializer(data=request.GET)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        fmt = data["format"]
+        entity_id = data.get("entity_id")
+        actor_id = data.get("actor_id")
+
+        body = export_audit_logs(
+            fmt,
+            action=data.get("action") or None,
+            entity=data.get("entity") or None,
+            date_from=data.get("date_from"),
+            date_to=data.get("date_to"),
+            entity_id=str(entity_id) if entity_id else None,
+            actor_id=str(actor_id) if actor_id else None,
+        )
+
+        filename = f"audit_log_{timezone.now():%Y%m%d_%H%M%S}.{fmt}"
+        resp = streaming_response(request, body, content_type=EXPORT_FORMATS[fmt])
+        resp["Content-Disposition"] = f'attachment; filename="{filename}"'
+        resp["X-Accel-Buffering"] = "no"
+        return resp
 
 
 class SendDocumentEmailView(APIView):
@@ -268,12 +337,47 @@ class SendDocumentEmailView(APIView):
             )
         except ValueError as ex:
             return fail("Validation failed", errors={"detail": str(ex)}, status=422)
+        except (CircuitOpenError, SendDeadlineExceeded) as ex:
+            resp = fail("Email service unavailable, try again later", errors={"detail": str(ex)}, status=503)
+            resp["Retry-After"] = str(int(getattr(ex, "retry_after", 0)) or settings.SMTP_BREAKER_OPEN_SECONDS)
+            return resp
         except Exception as ex:
             return fail("Email failed", errors={"detail": str(ex)}, status=400)
 
         return ok(message="PDF sent successfully via email")
 
 
+class NotificationStorageView(APIView):
+    """
+    GET /api/admin/notifications/storage -> current size of notifications + archive
+    """
+    @require_auth(roles=["ADMIN"])
+    def get(self, request):
+        return ok(data={"storage": get_notification_storage()})
+
+
+class NotificationArchiveView(APIView):
+    """
+    POST /api/admin/notifications/archive {days?, max_batches?} -> run retention, sizes before/after
+    A few batches and no VACUUM per request; the archive_notifications command does the heavy runs.
+    """
+    @require_auth(roles=["ADMIN"])
+    def post(self, request):
+        ser = NotificationArchiveSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+
+        try:
+            report = archive_old_notifications(
+                days=ser.validated_data.get("days"),
+                max_batches=ser.validated_data["max_batches"],
+                vacuum=False,
+            )
+        except Exception as ex:
+            return fail("Could not archive notifications", errors={"detail": str(ex)}, status=500)
+
+        return ok(message=f"Archived {report['archived']} notifications", data=report)
+
+
 class AdminAuthActivityView(APIView):
     @require_auth(roles=["ADMIN"])
     def get(self, request):
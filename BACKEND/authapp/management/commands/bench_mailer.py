@@ -0,0 +1,117 @@
+import socketserver
+import threading
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from backend.utils.mailer import welcome_message, send_messages
+
+
+class _SMTPStandIn(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP to accept mail. `handshake_delay` is paid once per
+    connection and stands in for TCP + STARTTLS + AUTH against a real server.
+    """
+
+    handshake_delay = 0.0
+    received = 0
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write((line + "\r\n").encode())
+        self.wfile.flush()
+
+    def handle(self):
+        time.sleep(self.handshake_delay)
+        self._reply("220 localhost bench")
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode(errors="replace").strip().upper()
+
+            if cmd.startswith(("EHLO", "HELO")):
+                self._reply("250 localhost")
+            elif cmd.startswith("DATA"):
+                self._reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                type(self).received += 1
+                self._reply("250 OK")
+            elif cmd.startswith("QUIT"):
+                self._reply("221 bye")
+                return
+            else:
+                # MAIL / RCPT / RSET / NOOP
+                self._reply("250 OK")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Command(BaseCommand):
+    help = "Compare one-connection-per-email vs the pooled mailer against a local SMTP stand-in."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=500, help="Emails per run.")
+        parser.add_argument(
+            "--handshake-ms",
+            type=float,
+            default=150,
+            help="Simulated connect + STARTTLS + login cost per connection.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        _SMTPStandIn.handshake_delay = options["handshake_ms"] / 1000.0
+
+        server = _Server(("127.0.0.1", 0), _SMTPStandIn)
+        port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        def connection():
+            return get_connection(
+                "django.core.mail.backends.smtp.EmailBackend",
+                host="127.0.0.1",
+                port=port,
+                username="",
+                password="",
+                use_tls=False,
+                use_ssl=False,
+                fail_silently=False,
+            )
+
+        messages = [welcome_message(f"user{i}@example.com") for i in range(count)]
+
+        try:
+            # before: every send_mail() opened its own connection
+            _SMTPStandIn.received = 0
+            t0 = time.perf_counter()
+            for msg in messages:
+                connection().send_messages([msg])
+            per_message = time.perf_counter() - t0
+            sent_before = _SMTPStandIn.received
+
+            # after: one kept-alive connection for the whole batch
+            _SMTPStandIn.received = 0
+            conn = connection()
+            t0 = time.perf_counter()
+            errors = [e for e in send_messages(messages, connection=conn) if e is not None]
+            pooled = time.perf_counter() - t0
+            conn.close()
+            sent_after = _SMTPStandIn.received
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(f"{count} emails, {options['handshake_ms']:.0f} ms handshake")
+        self.stdout.write(
+            f"  connection per email : {per_message:.2f}s  ({sent_before / per_message:.1f} msg/s)"
+        )
+        self.stdout.write(
+            f"  pooled connection    : {pooled:.2f}s  ({sent_after / pooled:.1f} msg/s, {len(errors)} errors)"
+        )
+        self.stdout.write(f"  speedup              : {per_message / pooled:.1f}x")
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from backend.utils.outbox import send_outbox_batch
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from email_outbox (safe to run several workers at once)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="Rows claimed per round.")
+        parser.add_argument("--once", action="store_true", help="Drain what is due now and exit.")
+        parser.add_argument("--idle-sleep", type=float, default=2.0, help="Seconds to wait when nothing is due.")
+
+    def handle(self, *args, **options):
+        while True:
+            result = send_outbox_batch(limit=options["batch_size"])
+
+            if result["claimed"]:
+                self.stdout.write(
+                    f"Claimed {result['claimed']}: sent {result['sent']}, failed {result['failed']}, "
+                    f"deferred {result['deferred']}."
+                )
+
+            if result["retry_after"] > 0:
+                self.stdout.write(f"SMTP circuit open, pausing {result['retry_after']:.0f}s.")
+                if options["once"]:
+                    break
+                time.sleep(result["retry_after"])
+                continue
+
+            if result["claimed"]:
+                continue
+
+            if options["once"]:
+                break
+            time.sleep(options["idle_sleep"])
@@ -78,6 +78,7 @@ class ProfileUpdateSerializer(serializers.Serializer):
     bio = serializers.CharField(required=False, allow_blank=True, max_length=500)
     notify_email = serializers.BooleanField(required=False)
     notify_inapp = serializers.BooleanField(required=False)
+    notify_digest = serializers.ChoiceField(choices=["OFF", "HOURLY", "DAILY"], required=False)
 
 
 class ChangeMyPasswordSerializer(serializers.Serializer):
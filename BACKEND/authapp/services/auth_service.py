@@ -1,11 +1,12 @@
 import secrets
 from datetime import timedelta
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
 from backend.utils.security import verify_password, sha256_hex, hash_password
 from backend.utils.jwt_utils import make_access_token, make_refresh_token, refresh_expiry
-from backend.utils.mailer import send_reset_password_email, send_set_password_email
+from backend.utils.outbox import enqueue_email
 
 from authapp.repositories.auth_repo import (
     get_user_for_login,
@@ -91,11 +92,12 @@ def forgot_password(email: str) -> None:
     minutes = getattr(settings, "RESET_TOKEN_MINUTES", 15)
     expires_at = timezone.now() + timedelta(minutes=minutes)
 
-    invalidate_password_reset_tokens(str(user["id"]))
-    insert_password_reset_token(str(user["id"]), token_sha, expires_at)
-
     reset_link = f"{settings.FRONTEND_RESET_URL}?token={raw_token}"
-    send_reset_password_email(user["email"], reset_link, minutes)
+
+    with transaction.atomic():
+        invalidate_password_reset_tokens(str(user["id"]))
+        insert_password_reset_token(str(user["id"]), token_sha, expires_at)
+        enqueue_email("RESET_PASSWORD", user["email"], {"reset_link": reset_link, "minutes": minutes})
 
 
 def reset_password(token: str, new_password: str) -> None:
@@ -121,9 +123,6 @@ def verify_email(token: str) -> None:
 
     user_id = str(row["user_id"])
 
-    set_email_verified(user_id)
-    mark_email_verification_token_used(str(row["id"]))
-
     # create set-password token
     raw_token = secrets.token_urlsafe(32)
     spt_sha = sha256_hex(raw_token)
@@ -131,16 +130,17 @@ def verify_email(token: str) -> None:
     minutes = getattr(settings, "SET_PASSWORD_MINUTES", 60)
     expires_at = timezone.now() + timedelta(minutes=minutes)
 
-    invalidate_set_password_tokens(user_id)
-    insert_set_password_token(user_id, spt_sha, expires_at)
+    with transaction.atomic():
+        set_email_verified(user_id)
+        mark_email_verification_token_used(str(row["id"]))
+
+        invalidate_set_password_tokens(user_id)
+        insert_set_password_token(user_id, spt_sha, expires_at)
 
-    u = get_user_email(user_id)
-    if u and u.get("email"):
-        set_password_link = f"{settings.FRONTEND_SET_PASSWORD_URL}?token={raw_token}"
-        try:
-            send_set_password_email(u["email"], set_password_link, minutes)
-        except:
-            pass
+        u = get_user_email(user_id)
+        if u and u.get("email"):
+            set_password_link = f"{settings.FRONTEND_SET_PASSWORD_URL}?token={raw_token}"
+            enqueue_email("SET_PASSWORD", u["email"], {"link": set_password_link, "minutes": minutes})
 
 
 def set_password(token: str, new_password: str) -> None:
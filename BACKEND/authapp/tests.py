@@ -1,3 +1,123 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from backend.utils import circuit_breaker, outbox
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClockMixin:
+    def setUp(self):
+        super().setUp()
+        self.now = 1000.0
+        patcher = mock.patch.object(circuit_breaker.time, "monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class CircuitBreakerTests(FakeClockMixin, SimpleTestCase):
+    def _breaker(self, **kwargs):
+        opts = {"failure_threshold": 3, "window_seconds": 60, "open_seconds": 30}
+        opts.update(kwargs)
+        return CircuitBreaker("smtp", **opts)
+
+    def test_opens_after_threshold_failures_then_half_opens_and_closes(self):
+        b = self._breaker()
+        for _ in range(3):
+            self.assertTrue(b.allow())
+            b.record(False)
+
+        self.assertEqual(b.state, CircuitBreaker.OPEN)
+        self.assertFalse(b.allow())
+        with self.assertRaises(CircuitOpenError) as ctx:
+            b.check()
+        self.assertEqual(ctx.exception.retry_after, 30)
+
+        self.now += 30
+        self.assertEqual(b.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(b.allow())
+        self.assertFalse(b.allow())  # only one trial call at a time
+
+        b.record(True)
+        self.assertEqual(b.state, CircuitBreaker.CLOSED)
+        self.assertTrue(b.allow())
+
+    def test_failed_trial_opens_again(self):
+        b = self._breaker(failure_threshold=1)
+        b.record(False)
+        self.now += 30
+        self.assertTrue(b.allow())
+
+        b.record(False)
+        self.assertEqual(b.state, CircuitBreaker.OPEN)
+        self.assertEqual(b.retry_after(), 30)
+
+    def test_failures_outside_the_window_do_not_count(self):
+        b = self._breaker()
+        b.record(False)
+        b.record(False)
+        self.now += 61
+        b.record(False)
+        self.assertEqual(b.state, CircuitBreaker.CLOSED)
+
+        self.now += 1
+        b.record(False)
+        self.assertEqual(b.state, CircuitBreaker.CLOSED)
+        b.record(False)
+        self.assertEqual(b.state, CircuitBreaker.OPEN)
+
+    def test_slow_calls_count_as_failures(self):
+        b = self._breaker(failure_threshold=2, slow_call_seconds=5)
+        b.record(True, elapsed=4)
+        b.record(True, elapsed=6)
+        self.assertEqual(b.state, CircuitBreaker.CLOSED)
+        b.record(True, elapsed=7)
+        self.assertEqual(b.state, CircuitBreaker.OPEN)
+
+
+class SendOutboxBatchTests(FakeClockMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.breaker = CircuitBreaker("smtp", failure_threshold=1, open_seconds=30)
+        for p in [
+            mock.patch.object(outbox.mailer, "smtp_breaker", self.breaker),
+            mock.patch.dict(outbox.EMAIL_KINDS, {"WELCOME": lambda to_email: to_email}),
+        ]:
+            p.start()
+            self.addCleanup(p.stop)
+
+        self.repo = {}
+        for name in ["claim_emails", "mark_email_sent", "mark_email_failed", "release_email"]:
+            p = mock.patch.object(outbox, name)
+            self.repo[name] = p.start()
+            self.addCleanup(p.stop)
+
+    def _rows(self, n):
+        return [
+            {"id": f"e{i}", "kind": "WELCOME", "to_email": f"u{i}@x", "payload": "{}", "attempts": 1, "max_attempts": 5}
+            for i in range(n)
+        ]
+
+    def test_open_circuit_releases_claimed_emails_without_spending_an_attempt(self):
+        self.repo["claim_emails"].return_value = self._rows(3)
+        results = [None, CircuitOpenError("smtp", 12), RuntimeError("boom")]
+
+        with mock.patch.object(outbox.mailer, "send_messages", return_value=results):
+            report = outbox.send_outbox_batch()
+
+        self.assertEqual(report["claimed"], 3)
+        self.assertEqual((report["sent"], report["deferred"], report["failed"]), (1, 1, 1))
+        self.repo["mark_email_sent"].assert_called_once_with("e0")
+        self.repo["release_email"].assert_called_once_with("e1", 12)
+        self.repo["mark_email_failed"].assert_called_once_with("e2", 1, 5, "boom")
+
+    def test_nothing_is_claimed_while_the_circuit_is_open(self):
+        self.breaker.record(False)
+
+        with mock.patch.object(outbox.mailer, "send_messages") as send:
+            report = outbox.send_outbox_batch()
+
+        self.assertEqual(report["claimed"], 0)
+        self.assertEqual(report["retry_after"], 30)
+        self.repo["claim_emails"].assert_not_called()
+        send.assert_not_called()
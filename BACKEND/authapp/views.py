@@ -33,7 +33,9 @@ from backend.utils.security import verify_password, hash_password
 from authapp.serializers import ProfileUpdateSerializer, ChangeMyPasswordSerializer
 
 from tasks.repositories.notification_repo import create_notification
-from django.core.mail import send_mail
+from tasks.repositories.task_repo import invalidate_notify_prefs
+from django.db import transaction
+from backend.utils.outbox import enqueue_email
 
 # ✅ ---- HELPER FUNCTIONS HERE ----
 
@@ -424,7 +426,8 @@ class MyProfileView(APIView):
                 phone,
                 bio,
                 notify_email,
-                notify_inapp
+                notify_inapp,
+                notify_digest
             FROM users
             WHERE id = %s;
             """,
@@ -444,47 +447,63 @@ class MyProfileView(APIView):
         user_id = request.user_ctx["id"]
         data = ser.validated_data
 
-        execute(
-            """
-            UPDATE users
-            SET
-                full_name = %s,
-                phone = %s,
-                bio = %s,
-                notify_email = %s,
-                notify_inapp = %s,
-                updated_at = NOW()
-            WHERE id = %s;
-            """,
-            [
-                data.get("full_name", ""),
-                data.get("phone", ""),
-                data.get("bio", ""),
-                data.get("notify_email", True),
-                data.get("notify_inapp", True),
-                user_id,
-            ],
-        )
+        with transaction.atomic():
+            execute(
+                """
+                UPDATE users
+                SET
+                    full_name = %s,
+                    phone = %s,
+                    bio = %s,
+                    notify_email = %s,
+                    notify_inapp = %s,
+                    notify_digest = COALESCE(%s, notify_digest),
+                    updated_at = NOW()
+                WHERE id = %s;
+                """,
+                [
+                    data.get("full_name", ""),
+                    data.get("phone", ""),
+                    data.get("bio", ""),
+                    data.get("notify_email", True),
+                    data.get("notify_inapp", True),
+                    data.get("notify_digest"),
+                    user_id,
+                ],
+            )
 
-        updated = fetch_one(
-            """
-            SELECT
-                id,
-                email,
-                role,
-                full_name,
-                phone,
-                bio,
-                notify_email,
-                notify_inapp
-            FROM users
-            WHERE id = %s;
-            """,
-            [user_id],
-        )
+            updated = fetch_one(
+                """
+                SELECT
+                    id,
+                    email,
+                    role,
+                    full_name,
+                    phone,
+                    bio,
+                    notify_email,
+                    notify_inapp,
+                    notify_digest
+                FROM users
+                WHERE id = %s;
+                """,
+                [user_id],
+            )
 
-        if not updated:
-            return fail("User not found", status=404)
+            if not updated:
+                return fail("User not found", status=404)
+
+            invalidate_notify_prefs(str(user_id))
+
+            # -------------------------------
+            # Email notification (email_outbox, committed with the update)
+            # -------------------------------
+            if updated.get("notify_email") and updated.get("email"):
+                enqueue_email(
+                    "PROFILE_UPDATED",
+                    updated["email"],
+                    {"full_name": updated.get("full_name") or ""},
+                )
 
         # -------------------------------
         # In-app notification
@@ -501,25 +520,6 @@ class MyProfileView(APIView):
         except Exception as ex:
             print("PROFILE IN-APP NOTIFICATION ERROR:", ex)
 
-        # -------------------------------
-        # Email notification
-        # -------------------------------
-        try:
-            if updated.get("notify_email") and updated.get("email"):
-                send_mail(
-                    subject="Profile updated successfully",
-                    message=(
-                        f"Hi {updated.get('full_name') or 'User'},\n\n"
-                        "Your profile was updated successfully.\n\n"
-                        "If you did not make this change, please change your password immediately."
-                    ),
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[updated["email"]],
-                    fail_silently=False,
-                )
-        except Exception as ex:
-            print("PROFILE EMAIL NOTIFICATION ERROR:", ex)
-
         return ok(data=updated, message="Profile updated")
 
 
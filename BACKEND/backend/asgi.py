@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+
+Run with an ASGI server (e.g. `uvicorn backend.asgi:application`) so that
+/api/notifications/stream (Server-Sent Events) is available.
 """
 
 import os
@@ -13,4 +16,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# needs apps loaded (get_asgi_application runs django.setup())
+from tasks.sse import notification_stream  # noqa: E402
+
+SSE_ROUTES = {
+    "/api/notifications/stream": notification_stream,
+}
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["method"] == "GET":
+        handler = SSE_ROUTES.get(scope["path"])
+        if handler:
+            return await handler(scope, receive, send)
+    return await django_application(scope, receive, send)
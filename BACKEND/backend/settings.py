@@ -89,6 +89,25 @@ DATABASES = {
     }
 }
 
+# =========================
+# CACHE
+# =========================
+# LocMem is per process: with several workers point CACHE_BACKEND/CACHE_LOCATION at a shared
+# cache (Redis/Memcached) so invalidations reach every worker; the TTL bounds staleness otherwise.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "taskmanager"),
+    }
+}
+
+# users.notify_* / role / is_active used by notification side effects
+NOTIFY_PREFS_CACHE_SECONDS = int(os.getenv("NOTIFY_PREFS_CACHE_SECONDS", 300))
+
+# user id -> email labels (audit log, notifications, comments), per process
+USER_LABEL_CACHE_SIZE = int(os.getenv("USER_LABEL_CACHE_SIZE", 10000))
+USER_LABEL_CACHE_SECONDS = int(os.getenv("USER_LABEL_CACHE_SECONDS", 600))
+
 # =========================
 # PASSWORD VALIDATION
 # =========================
@@ -118,6 +137,35 @@ STATIC_URL = "static/"
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
 
+# =========================
+# ATTACHMENT STORAGE
+# =========================
+
+# "local" (MEDIA_ROOT/task_attachments) or "s3" (any S3-compatible endpoint, e.g. MinIO)
+ATTACHMENT_STORAGE = os.getenv("ATTACHMENT_STORAGE", "local")
+
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_PREFIX = os.getenv("S3_PREFIX", "task_attachments/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "")
+S3_REGION = os.getenv("S3_REGION", "")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID", "")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY", "")
+
+# lifetime of presigned direct-download URLs
+S3_PRESIGN_SECONDS = int(os.getenv("S3_PRESIGN_SECONDS", 300))
+
+# concurrent storage writes for multi-file uploads (thread pool)
+ATTACHMENT_IO_WORKERS = int(os.getenv("ATTACHMENT_IO_WORKERS", 8))
+
+# preview thumbnails (PNG/JPEG/WEBP/PDF first page), rendered in a process pool
+THUMB_WORKERS = int(os.getenv("THUMB_WORKERS", 2))
+
+# resumable chunked uploads (temp store is local to the node handling the session)
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR", str(MEDIA_ROOT / "upload_sessions"))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 200 * 1024 * 1024))
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", 8 * 1024 * 1024))
+UPLOAD_SESSION_HOURS = int(os.getenv("UPLOAD_SESSION_HOURS", 24))
+
 # =========================
 # REST FRAMEWORK
 # =========================
@@ -180,6 +228,49 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "Task Manager <no-reply@example.com>")
 
+# one kept-alive SMTP connection per process; probe with NOOP after this much idle time
+EMAIL_POOL_IDLE_SECONDS = int(os.getenv("EMAIL_POOL_IDLE_SECONDS", 30))
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 10))
+
+# hard limit for one send + circuit breaker (per process) around SMTP
+EMAIL_SEND_DEADLINE_SECONDS = float(os.getenv("EMAIL_SEND_DEADLINE_SECONDS", 15))
+SMTP_BREAKER_FAILURES = int(os.getenv("SMTP_BREAKER_FAILURES", 5))
+SMTP_BREAKER_WINDOW_SECONDS = int(os.getenv("SMTP_BREAKER_WINDOW_SECONDS", 60))
+SMTP_BREAKER_OPEN_SECONDS = int(os.getenv("SMTP_BREAKER_OPEN_SECONDS", 30))
+SMTP_SLOW_CALL_SECONDS = float(os.getenv("SMTP_SLOW_CALL_SECONDS", 5))
+
+# assignment emails: "links" = signed download links (inline only below EMAIL_INLINE_MAX_BYTES),
+# "inline" = embed every file (old behaviour, 20MB cap)
+EMAIL_ATTACHMENT_MODE = os.getenv("EMAIL_ATTACHMENT_MODE", "links")
+EMAIL_INLINE_MAX_BYTES = int(os.getenv("EMAIL_INLINE_MAX_BYTES", 256 * 1024))
+EMAIL_LINK_HOURS = int(os.getenv("EMAIL_LINK_HOURS", 24))
+BACKEND_PUBLIC_URL = os.getenv("BACKEND_PUBLIC_URL", "http://localhost:8000")
+
+# notification digests (python manage.py send_digests)
+DIGEST_BATCH_SIZE = int(os.getenv("DIGEST_BATCH_SIZE", 200))
+DIGEST_MAX_ITEMS = int(os.getenv("DIGEST_MAX_ITEMS", 50))
+
+# GET /api/notifications?after=...&wait=N holds the request at most this long
+NOTIFICATIONS_LONG_POLL_MAX_SECONDS = int(os.getenv("NOTIFICATIONS_LONG_POLL_MAX_SECONDS", 25))
+
+# read notifications older than this move to notifications_archive (python manage.py archive_notifications)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", 90))
+NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.getenv("NOTIFICATION_ARCHIVE_BATCH_SIZE", 1000))
+
+# email_outbox worker (python manage.py send_emails)
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 8))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", 30))
+EMAIL_OUTBOX_BACKOFF_MAX_SECONDS = int(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", 3600))
+EMAIL_OUTBOX_LOCK_SECONDS = int(os.getenv("EMAIL_OUTBOX_LOCK_SECONDS", 300))
+
+# =========================
+# AUDIT LOG (monthly partitions, python manage.py maintain_audit_log)
+# =========================
+AUDIT_LOG_PARTITIONS_AHEAD = int(os.getenv("AUDIT_LOG_PARTITIONS_AHEAD", 3))
+AUDIT_LOG_RETENTION_MONTHS = int(os.getenv("AUDIT_LOG_RETENTION_MONTHS", 12))  # 0 = keep all
+AUDIT_LOG_RETENTION_MODE = os.getenv("AUDIT_LOG_RETENTION_MODE", "detach")  # detach | drop
+AUDIT_EXPORT_CHUNK_SIZE = int(os.getenv("AUDIT_EXPORT_CHUNK_SIZE", 2000))  # rows per fetch / label lookup
+
 # =========================
 # FRONTEND URLS + TOKENS
 # =========================
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    CLOSED    -> calls go through; outcomes from the last `window_seconds` are kept.
+                 Opens when at least `failure_threshold` of them failed or were slower
+                 than `slow_call_seconds`.
+    OPEN      -> allow() is False for `open_seconds` (callers fail fast).
+    HALF_OPEN -> one trial call; success closes the circuit, failure opens it again.
+
+    State is per process (each web worker / outbox worker has its own).
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        window_seconds: float = 60,
+        open_seconds: float = 30,
+        slow_call_seconds: float | None = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._bad: deque[float] = deque()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def retry_after(self) -> float:
+        with self._lock:
+            self._refresh()
+            if self._state != self.OPEN:
+                return 0.0
+            return max(self._opened_at + self.open_seconds - time.monotonic(), 0.0)
+
+    def _refresh(self) -> None:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._trial_running = False
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._bad.clear()
+
+    def allow(self) -> bool:
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def check(self) -> None:
+        """
+        allow() that raises CircuitOpenError instead of returning False.
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def record(self, ok: bool, elapsed: float = 0.0) -> None:
+        bad = (not ok) or (self.slow_call_seconds is not None and elapsed > self.slow_call_seconds)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if bad:
+                    self._open()
+                else:
+                    self._state = self.CLOSED
+                    self._bad.clear()
+                self._trial_running = False
+                return
+
+            if not bad:
+                return
+
+            self._bad.append(now)
+            while self._bad and now - self._bad[0] > self.window_seconds:
+                self._bad.popleft()
+            if len(self._bad) >= self.failure_threshold:
+                self._open()
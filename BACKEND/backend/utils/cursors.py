@@ -0,0 +1,25 @@
+import base64
+import uuid
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    """
+    Opaque keyset cursor for (created_at, id) pagination.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Cursor -> (created_at, id); id is a UUID string or an int (BIGSERIAL tables).
+    ValueError if it was not made by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        row_id = int(row_id) if row_id.isdigit() else str(uuid.UUID(row_id))
+        return datetime.fromisoformat(created_at), row_id
+    except Exception:
+        raise ValueError("Invalid cursor")
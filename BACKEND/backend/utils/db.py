@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from django.db import connection, transaction
 
 def fetch_one(sql: str, params: Optional[list[Any]] = None) -> Optional[dict]:
@@ -17,6 +17,25 @@ def fetch_all(sql: str, params: Optional[list[Any]] = None) -> list[dict]:
         cols = [c[0] for c in cur.description]
         return [dict(zip(cols, r)) for r in rows]
 
+def stream_all(sql: str, params: Optional[list[Any]] = None, chunk_size: int = 1000) -> Iterator[list[dict]]:
+    """
+    Server-side (named) cursor: yields lists of at most chunk_size rows, so memory stays
+    at one chunk whatever the result size. Runs in its own transaction for as long as
+    it is consumed: under autocommit the cursor would be WITH HOLD, and Postgres would
+    materialize the whole result before sending the first row.
+    """
+    with transaction.atomic(), connection.chunked_cursor() as cur:
+        cur.execute(sql, params or [])
+        cols = None
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            if cols is None:
+                # named cursors only get a description after the first fetch
+                cols = [c[0] for c in cur.description]
+            yield [dict(zip(cols, r)) for r in rows]
+
 def execute(sql: str, params: Optional[list[Any]] = None) -> int:
     with connection.cursor() as cur:
         cur.execute(sql, params or [])
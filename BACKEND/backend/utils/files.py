@@ -1,41 +1,48 @@
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 from django.utils.text import slugify
 
+from backend.utils.storage import PART_SUFFIX, get_storage
+from backend.utils.thumbnails import THUMB_FAILED_SUFFIX, THUMB_SUFFIX
+
 MAX_BASE_LEN = 80
 ALLOWED_EXTS = {".pdf", ".docx", ".png", ".jpg", ".jpeg", ".webp"}
 
+_io_pool: ThreadPoolExecutor | None = None
+
 
 def _truncate(s: str, n: int) -> str:
     s = (s or "").strip()
     return s[:n].rstrip() if len(s) > n else s
 
 
-def _next_available_name(base_dir: str, base: str, ext: str) -> str:
+def _get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=settings.ATTACHMENT_IO_WORKERS, thread_name_prefix="attachment-io")
+    return _io_pool
+
+
+def derived_names(storage_name: str) -> list[str]:
     """
-    base.ext, base(1).ext, base(2).ext ...
+    Files that belong to a blob: thumbnail, failed-render marker, interrupted write.
     """
-    candidate = f"{base}{ext}"
-    counter = 1
-    while os.path.exists(os.path.join(base_dir, candidate)):
-        candidate = f"{base}({counter}){ext}"
-        counter += 1
-    return candidate
+    return [f"{storage_name}{suffix}" for suffix in (THUMB_SUFFIX, THUMB_FAILED_SUFFIX, PART_SUFFIX)]
 
 
-def save_task_attachment(uploaded_file, preferred_name: str | None = None) -> tuple[str, str, int]:
-    """
-    Saves to MEDIA_ROOT/task_attachments/
-    Returns (absolute_path, storage_name, size_bytes)
+def _name_in_use(storage, name: str) -> bool:
+    # a leftover thumbnail / marker would otherwise be inherited by the new blob
+    return any(storage.exists(n) for n in [name, *derived_names(name)])
 
-    storage_name becomes:
-      <slug>.<ext>, <slug>(1).<ext>, <slug>(2).<ext> ...
-    """
-    base_dir = os.path.join(settings.MEDIA_ROOT, "task_attachments")
-    os.makedirs(base_dir, exist_ok=True)
 
-    original_name = getattr(uploaded_file, "name", "document")
+def _reserve_storage_name(storage, original_name: str, preferred_name: str | None, taken: set[str]) -> str:
+    """
+    Picks a free storage_name; `taken` holds names already handed out in this batch
+    (they are not on storage yet while their writes run concurrently).
+    """
+    original_name = original_name or "document"
     original_stem, ext = os.path.splitext(original_name)
     ext = (ext or "").lower()
 
@@ -49,12 +56,76 @@ def save_task_attachment(uploaded_file, preferred_name: str | None = None) -> tu
     base_slug = re.sub(r"-{2,}", "-", base_slug)
     base_slug = _truncate(base_slug, MAX_BASE_LEN)
 
-    storage_name = _next_available_name(base_dir, base_slug, ext)
-    abs_path = os.path.join(base_dir, storage_name)
+    candidate = f"{base_slug}{ext}"
+    counter = 1
+    while candidate in taken or _name_in_use(storage, candidate):
+        candidate = f"{base_slug}({counter}){ext}"
+        counter += 1
+
+    taken.add(candidate)
+    return candidate
+
+
+def save_task_attachment(uploaded_file, preferred_name: str | None = None) -> tuple[str | None, str, int]:
+    """
+    Saves through the configured attachment storage (local MEDIA_ROOT/task_attachments/ or S3)
+    Returns (absolute_path, storage_name, size_bytes)
+    absolute_path is None when the storage is not a local filesystem.
+
+    storage_name becomes:
+      <slug>.<ext>, <slug>(1).<ext>, <slug>(2).<ext> ...
+    """
+    original_name = getattr(uploaded_file, "name", "document")
+    return save_task_attachment_chunks(original_name, uploaded_file.chunks(), preferred_name=preferred_name)
+
+
+def save_task_attachment_chunks(original_name: str, chunks, preferred_name: str | None = None) -> tuple[str | None, str, int]:
+    """
+    Same as save_task_attachment for bytes that do not come from an UploadedFile
+    (e.g. a finalized chunked upload). `chunks` is any iterable of bytes.
+    """
+    storage = get_storage()
+
+    storage_name = _reserve_storage_name(storage, original_name, preferred_name, set())
+    size_bytes = storage.put(storage_name, chunks)
+
+    return storage.path(storage_name), storage_name, size_bytes
+
+
+def save_task_attachments(uploaded_files: list) -> list[tuple[str | None, str, int]]:
+    """
+    Same as save_task_attachment for many files: names are reserved up front,
+    then the writes run concurrently on a bounded I/O pool.
+    Returns results in the same order as uploaded_files.
+    On failure, files already written by this call are removed before re-raising.
+    """
+    if not uploaded_files:
+        return []
+
+    storage = get_storage()
+
+    taken: set[str] = set()
+    names = [_reserve_storage_name(storage, f.name, f.name, taken) for f in uploaded_files]
+
+    def _write(f, name):
+        return storage.path(name), name, storage.put(name, f.chunks())
+
+    futures = [_get_io_pool().submit(_write, f, n) for f, n in zip(uploaded_files, names)]
+
+    results = []
+    error = None
+    for fut in futures:
+        try:
+            results.append(fut.result())
+        except Exception as ex:
+            error = error or ex
 
-    with open(abs_path, "wb+") as dest:
-        for chunk in uploaded_file.chunks():
-            dest.write(chunk)
+    if error:
+        for _, name, _ in results:
+            try:
+                storage.delete(name)
+            except Exception:
+                pass
+        raise error
 
-    size_bytes = os.path.getsize(abs_path)
-    return abs_path, storage_name, size_bytes
\ No newline at end of file
+    return results
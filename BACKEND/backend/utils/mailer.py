@@ -1,11 +1,204 @@
 from django.conf import settings
-from django.core.mail import send_mail
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
+from contextlib import contextmanager
 import os
 import smtplib
+import socket
+import threading
+import time
 
+from backend.utils.storage import get_storage
+from backend.utils.security import sign_attachment_link
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 
-def send_welcome_email(to_email: str):
+# errors after which the SMTP connection is unusable -> reconnect and retry once
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, socket.timeout)
+
+_pool_lock = threading.Lock()
+_pool_conn = None
+_pool_last_used = 0.0
+
+# 🔌 fail fast while SMTP is down or slow instead of blocking request threads
+smtp_breaker = CircuitBreaker(
+    "smtp",
+    failure_threshold=settings.SMTP_BREAKER_FAILURES,
+    window_seconds=settings.SMTP_BREAKER_WINDOW_SECONDS,
+    open_seconds=settings.SMTP_BREAKER_OPEN_SECONDS,
+    slow_call_seconds=settings.SMTP_SLOW_CALL_SECONDS,
+)
+
+
+class SendDeadlineExceeded(TimeoutError):
+    pass
+
+
+def _message(to_email: str, subject: str, body: str) -> EmailMessage:
+    return EmailMessage(
+        subject=subject,
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+    )
+
+
+def _ensure_open(conn, last_used: float) -> None:
+    """
+    Open once, then reuse. After EMAIL_POOL_IDLE_SECONDS of silence the server
+    may have dropped us, so probe with NOOP before sending again.
+    """
+    if conn.connection is None:
+        conn.open()
+        return
+
+    if time.monotonic() - last_used < settings.EMAIL_POOL_IDLE_SECONDS:
+        return
+
+    try:
+        if conn.connection.noop()[0] == 250:
+            return
+    except Exception:
+        pass
+    _reconnect(conn)
+
+
+def _drop(conn) -> None:
+    # no QUIT: the server may be the thing that is hanging
+    try:
+        if conn.connection is not None:
+            conn.connection.close()
+    except Exception:
+        pass
+    conn.connection = None
+
+
+def _reconnect(conn) -> None:
+    _drop(conn)
+    conn.open()
+
+
+@contextmanager
+def _deadline(conn, seconds: float):
+    """
+    Hard wall-clock limit for one send (connect + STARTTLS + login + DATA).
+    A watchdog shuts the socket down, which unblocks whatever smtplib is waiting on.
+    """
+    fired = threading.Event()
+
+    def _abort():
+        fired.set()
+        sock = getattr(conn.connection, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    timer = threading.Timer(seconds, _abort)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield fired
+    except Exception:
+        if fired.is_set():
+            raise SendDeadlineExceeded(f"SMTP send exceeded {seconds:g}s deadline") from None
+        raise
+    finally:
+        timer.cancel()
+
+
+def _send_with_deadline(conn, msg: EmailMessage, last_used: float) -> None:
+    deadline = settings.EMAIL_SEND_DEADLINE_SECONDS
+    # socket timeout bounds the connect phase (no socket for the watchdog yet)
+    conn.timeout = min(conn.timeout or deadline, deadline)
+
+    with _deadline(conn, deadline) as expired:
+        _ensure_open(conn, last_used)
+        try:
+            conn.send_messages([msg])
+        except RECONNECT_ERRORS:
+            if expired.is_set():
+                raise
+            _reconnect(conn)
+            conn.send_messages([msg])
+
+
+def _send_over(conn, messages: list[EmailMessage], last_used: float, breaker: CircuitBreaker) -> list[Exception | None]:
+    results: list[Exception | None] = []
+
+    for msg in messages:
+        if not breaker.allow():
+            results.append(CircuitOpenError(breaker.name, breaker.retry_after()))
+            continue
+
+        t0 = time.monotonic()
+        try:
+            _send_with_deadline(conn, msg, last_used)
+        except smtplib.SMTPRecipientsRefused as ex:
+            # bad address, server itself is fine
+            breaker.record(True, time.monotonic() - t0)
+            results.append(ex)
+            continue
+        except Exception as ex:
+            breaker.record(False)
+            _drop(conn)
+            results.append(ex)
+            continue
+
+        breaker.record(True, time.monotonic() - t0)
+        last_used = time.monotonic()
+        results.append(None)
+
+    return results
+
+
+def send_messages(messages: list[EmailMessage], connection=None, breaker: CircuitBreaker | None = None) -> list[Exception | None]:
+    """
+    Sends every message over one kept-alive SMTP connection (one STARTTLS + login).
+    Returns one entry per message: None when sent, else the exception
+    (CircuitOpenError when the message was not even tried).
+
+    connection: an already built backend (e.g. for benchmarks); default is the
+    process-wide pooled connection.
+    """
+    global _pool_conn, _pool_last_used
+
+    if not messages:
+        return []
+
+    breaker = breaker or smtp_breaker
+
+    if connection is not None:
+        return _send_over(connection, messages, time.monotonic(), breaker)
+
+    with _pool_lock:
+        if _pool_conn is None:
+            _pool_conn = get_connection(fail_silently=False)
+        try:
+            return _send_over(_pool_conn, messages, _pool_last_used, breaker)
+        finally:
+            _pool_last_used = time.monotonic()
+
+
+def _send_one(msg: EmailMessage) -> None:
+    err = send_messages([msg])[0]
+    if err is not None:
+        raise err
+
+
+def close_pool() -> None:
+    global _pool_conn
+    with _pool_lock:
+        if _pool_conn is not None:
+            try:
+                _pool_conn.close()
+            except Exception:
+                pass
+            _pool_conn = None
+
+
+# ---- message builders (used directly by the outbox worker for batched sends) ----
+
+def welcome_message(to_email: str) -> EmailMessage:
     subject = "Welcome to Task Manager"
     body = (
         "Hi,\n\n"
@@ -13,9 +206,9 @@ def send_welcome_email(to_email: str):
         "You can login using your email and the password provided by Admin.\n\n"
         "Thanks,\nTeam"
     )
-    send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [to_email], fail_silently=False)
+    return _message(to_email, subject, body)
 
-def send_reset_password_email(to_email: str, reset_link: str, minutes: int):
+def reset_password_message(to_email: str, reset_link: str, minutes: int) -> EmailMessage:
     subject = "Reset your password"
     body = (
         "Hi,\n\n"
@@ -24,11 +217,9 @@ def send_reset_password_email(to_email: str, reset_link: str, minutes: int):
         "If you didn't request this, ignore this email.\n\n"
         "Thanks,\nTeam"
     )
-    send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [to_email], fail_silently=False)
-
-
+    return _message(to_email, subject, body)
 
-def send_verification_email(to_email: str, verify_link: str, minutes: int):
+def verification_message(to_email: str, verify_link: str, minutes: int) -> EmailMessage:
     subject = "Verify your email"
     body = (
         "Hi,\n\n"
@@ -37,53 +228,113 @@ def send_verification_email(to_email: str, verify_link: str, minutes: int):
         "If you didn't create this account, ignore this email.\n\n"
         "Thanks,\nTeam"
     )
-    send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [to_email], fail_silently=False)
+    return _message(to_email, subject, body)
 
-def send_pdf_attachment(
-    to_email: str,
-    subject: str,
-    body: str,
-    pdf_path: str
-):
+def set_password_message(to_email: str, link: str, minutes: int) -> EmailMessage:
+    subject = "Set your password"
+    body = (
+        "Hi,\n\n"
+        "Your email has been verified.\n\n"
+        f"Please set your password (valid for {minutes} minutes):\n{link}\n\n"
+        "Thanks,\nTeam"
+    )
+    return _message(to_email, subject, body)
+
+def profile_updated_message(to_email: str, full_name: str = "") -> EmailMessage:
+    subject = "Profile updated successfully"
+    body = (
+        f"Hi {full_name or 'User'},\n\n"
+        "Your profile was updated successfully.\n\n"
+        "If you did not make this change, please change your password immediately."
+    )
+    return _message(to_email, subject, body)
+
+def digest_message(to_email: str, full_name: str, period: str, items: list[dict], total: int) -> EmailMessage:
     """
-    Sends an email with PDF attachment
+    items: newest first, [{"type":..., "message":..., "task_title":..., "created_at": iso str}, ...]
     """
+    subject = f"Task Manager: {total} new notification{'s' if total != 1 else ''}"
 
-    email = EmailMessage(
-        subject=subject,
-        body=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[to_email],
+    lines = []
+    for it in items:
+        when = (it.get("created_at") or "")[:16].replace("T", " ")
+        title = f" [{it['task_title']}]" if it.get("task_title") else ""
+        lines.append(f"- {when} {it['type']}{title}: {it['message']}")
+
+    more = total - len(items)
+    if more > 0:
+        lines.append(f"... and {more} more in the app.")
+
+    body = (
+        f"Hi {full_name or 'User'},\n\n"
+        f"Here is your {period.lower()} summary:\n\n"
+        + "\n".join(lines)
+        + "\n\nYou can change digest settings on your profile page.\n\n"
+        "Thanks,\nTeam"
     )
+    return _message(to_email, subject, body)
+
+def _human_size(n: int) -> str:
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f} MB"
+    return f"{max(n, 1) // 1024 or 1} KB"
 
-    # attach pdf from server path
-    email.attach_file(pdf_path)
 
-    email.send(fail_silently=False)
-    
+def _split_inline_and_links(attachments: list[dict]) -> tuple[list[dict], list[dict]]:
+    """
+    "links" mode: small files are still embedded (up to EMAIL_INLINE_MAX_BYTES in total),
+    everything else goes out as a signed download link.
+    """
+    if settings.EMAIL_ATTACHMENT_MODE != "links":
+        return list(attachments), []
 
-def _smtp_send(msg: EmailMessage):
-    # Gmail SMTP example
-    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        server.starttls()
-        server.login(settings.SMTP_USER, settings.SMTP_PASS)
-        server.send_message(msg)
+    budget = settings.EMAIL_INLINE_MAX_BYTES
+    inline, links = [], []
+    for a in attachments:
+        size = int(a.get("size_bytes") or 0)
+        if not a.get("attachment_id") or size <= budget:
+            inline.append(a)
+            budget -= size
+        else:
+            links.append(a)
+    return inline, links
 
-def send_task_assigned_email(
+
+def attachment_link(attachment_id: str) -> str:
+    token = sign_attachment_link(attachment_id)
+    return f"{settings.BACKEND_PUBLIC_URL}/api/attachments/{attachment_id}/download?sig={token}"
+
+
+def task_assigned_message(
     to_email: str,
     task_title: str,
     task_desc: str,
     task_status: str,
     pdf_path: str | None = None,
     attachments: list[dict] | None = None,
-):
+) -> EmailMessage:
     """
     Backward compatible:
       - old code can still pass pdf_path (single file)
       - new code can pass attachments=[{"path":..., "name":..., "content_type":...}, ...]
+        or {"storage_name":..., "attachment_id":..., "size_bytes":...} to read the file
+        through the attachment storage (or link to it, see EMAIL_ATTACHMENT_MODE)
     """
     subject = f"New Task Assigned: {task_title}"
 
+    inline, links = _split_inline_and_links(attachments or [])
+
+    links_text = ""
+    if links:
+        lines = [
+            f"- {a.get('name') or 'file'} ({_human_size(int(a.get('size_bytes') or 0))}): {attachment_link(a['attachment_id'])}"
+            for a in links
+        ]
+        links_text = (
+            f"\n\nAttachments (links valid for {settings.EMAIL_LINK_HOURS} hours):\n"
+            + "\n".join(lines)
+        )
+
     body = f"""
 Hello,
 
@@ -93,18 +344,13 @@ Title: {task_title}
 Status: {task_status}
 
 Description:
-{task_desc}
+{task_desc}{links_text}
 
 Thanks,
 Task Manager
 """.strip()
 
-    email = EmailMessage(
-        subject=subject,
-        body=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[to_email],
-    )
+    email = _message(to_email, subject, body)
 
     # ✅ old single attachment support
     if pdf_path and os.path.exists(pdf_path):
@@ -114,8 +360,14 @@ Task Manager
             pass
 
     # ✅ new multi attachments support
-    for a in (attachments or []):
+    for a in inline:
         try:
+            # stored through the attachment storage (local or S3)
+            if a.get("storage_name"):
+                content = get_storage().get(a["storage_name"])
+                email.attach(a.get("name") or a["storage_name"], content, a.get("content_type") or None)
+                continue
+
             path = a.get("path")
             if not path or not os.path.exists(path):
                 continue
@@ -125,7 +377,54 @@ Task Manager
         except Exception:
             pass
 
-    email.send(fail_silently=False)
+    return email
+
+
+# ---- single-message helpers (same signatures as before, now over the pooled connection) ----
+
+def send_welcome_email(to_email: str):
+    _send_one(welcome_message(to_email))
+
+def send_reset_password_email(to_email: str, reset_link: str, minutes: int):
+    _send_one(reset_password_message(to_email, reset_link, minutes))
+
+def send_verification_email(to_email: str, verify_link: str, minutes: int):
+    _send_one(verification_message(to_email, verify_link, minutes))
+
+def send_pdf_attachment(
+    to_email: str,
+    subject: str,
+    body: str,
+    pdf_path: str
+):
+    """
+    Sends an email with PDF attachment
+    """
+    email = _message(to_email, subject, body)
+
+    # attach pdf from server path
+    email.attach_file(pdf_path)
+
+    _send_one(email)
+
+def send_task_assigned_email(
+    to_email: str,
+    task_title: str,
+    task_desc: str,
+    task_status: str,
+    pdf_path: str | None = None,
+    attachments: list[dict] | None = None,
+):
+    _send_one(
+        task_assigned_message(
+            to_email=to_email,
+            task_title=task_title,
+            task_desc=task_desc,
+            task_status=task_status,
+            pdf_path=pdf_path,
+            attachments=attachments,
+        )
+    )
 
 # def send_task_assigned_email(to_email: str, task_title: str, task_desc: str, task_status: str, pdf_path: str | None = None):
 #     subject = f"New Task Assigned: {task_title}"
@@ -159,14 +458,10 @@ Task Manager
 #     email.send(fail_silently=False)
 
 def send_set_password_email(to_email: str, link: str, minutes: int):
-    subject = "Set your password"
-    body = (
-        "Hi,\n\n"
-        "Your email has been verified.\n\n"
-        f"Please set your password (valid for {minutes} minutes):\n{link}\n\n"
-        "Thanks,\nTeam"
-    )
-    send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [to_email], fail_silently=False)
+    _send_one(set_password_message(to_email, link, minutes))
+
+def send_profile_updated_email(to_email: str, full_name: str = ""):
+    _send_one(profile_updated_message(to_email, full_name))
 
 def send_pdf_attachment_bytes(
     to_email: str,
@@ -178,11 +473,6 @@ def send_pdf_attachment_bytes(
     """
     Sends an email with PDF attachment using in-memory bytes (no temp file).
     """
-    email = EmailMessage(
-        subject=subject,
-        body=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[to_email],
-    )
+    email = _message(to_email, subject, body)
     email.attach(filename, pdf_bytes, "application/pdf")
-    email.send(fail_silently=False)
\ No newline at end of file
+    _send_one(email)
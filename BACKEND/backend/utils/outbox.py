@@ -0,0 +1,190 @@
+import json
+from django.conf import settings
+
+from backend.utils.db import fetch_all, execute
+from backend.utils import mailer
+from backend.utils.circuit_breaker import CircuitOpenError
+
+# kind -> mailer message builder; payload keys are passed as keyword arguments
+EMAIL_KINDS = {
+    "WELCOME": mailer.welcome_message,
+    "VERIFY_EMAIL": mailer.verification_message,
+    "RESET_PASSWORD": mailer.reset_password_message,
+    "SET_PASSWORD": mailer.set_password_message,
+    "TASK_ASSIGNED": mailer.task_assigned_message,
+    "PROFILE_UPDATED": mailer.profile_updated_message,
+    "DIGEST": mailer.digest_message,
+}
+
+
+def enqueue_email(kind: str, to_email: str, payload: dict | None = None) -> None:
+    """
+    Call inside the same transaction.atomic() block as the business change:
+    the email is only sent if that change commits.
+    """
+    if kind not in EMAIL_KINDS:
+        raise ValueError(f"Unknown email kind: {kind}")
+
+    execute(
+        """
+        INSERT INTO email_outbox (kind, to_email, payload, max_attempts)
+        VALUES (%s, %s, %s::jsonb, %s);
+        """,
+        [kind, to_email, json.dumps(payload or {}, default=str), settings.EMAIL_OUTBOX_MAX_ATTEMPTS],
+    )
+
+
+def enqueue_emails(items: list[tuple[str, str, dict]]) -> None:
+    """
+    Bulk version of enqueue_email: items = [(kind, to_email, payload), ...] in one INSERT.
+    """
+    if not items:
+        return
+
+    values = []
+    params = []
+    for kind, to_email, payload in items:
+        if kind not in EMAIL_KINDS:
+            raise ValueError(f"Unknown email kind: {kind}")
+        values.append("(%s, %s, %s::jsonb, %s)")
+        params += [kind, to_email, json.dumps(payload or {}, default=str), settings.EMAIL_OUTBOX_MAX_ATTEMPTS]
+
+    execute(
+        f"""
+        INSERT INTO email_outbox (kind, to_email, payload, max_attempts)
+        VALUES {", ".join(values)};
+        """,
+        params,
+    )
+
+
+def claim_emails(limit: int) -> list[dict]:
+    """
+    Concurrent workers never claim the same row (SKIP LOCKED).
+    SENDING rows whose worker died are picked up again after EMAIL_OUTBOX_LOCK_SECONDS.
+    """
+    return fetch_all(
+        """
+        UPDATE email_outbox
+        SET status = 'SENDING',
+            locked_at = NOW(),
+            attempts = attempts + 1
+        WHERE id IN (
+            SELECT id
+            FROM email_outbox
+            WHERE (status = 'PENDING' AND next_attempt_at <= NOW())
+               OR (status = 'SENDING' AND locked_at < NOW() - make_interval(secs => %s))
+            ORDER BY next_attempt_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, kind, to_email, payload, attempts, max_attempts;
+        """,
+        [settings.EMAIL_OUTBOX_LOCK_SECONDS, limit],
+    )
+
+
+def mark_email_sent(email_id: str) -> None:
+    execute(
+        """
+        UPDATE email_outbox
+        SET status = 'SENT', sent_at = NOW(), locked_at = NULL, last_error = NULL
+        WHERE id = %s;
+        """,
+        [email_id],
+    )
+
+
+def mark_email_failed(email_id: str, attempts: int, max_attempts: int, error: str) -> None:
+    # exponential backoff: base, 2*base, 4*base ... capped
+    base = settings.EMAIL_OUTBOX_BACKOFF_SECONDS
+    delay = min(base * (2 ** max(attempts - 1, 0)), settings.EMAIL_OUTBOX_BACKOFF_MAX_SECONDS)
+    status = "DEAD" if attempts >= max_attempts else "PENDING"
+
+    execute(
+        """
+        UPDATE email_outbox
+        SET status = %s,
+            locked_at = NULL,
+            last_error = %s,
+            next_attempt_at = NOW() + make_interval(secs => %s)
+        WHERE id = %s;
+        """,
+        [status, (error or "")[:2000], delay, email_id],
+    )
+
+
+def release_email(email_id: str, delay_seconds: float) -> None:
+    """
+    Not attempted (SMTP circuit open): back to PENDING without spending an attempt.
+    """
+    execute(
+        """
+        UPDATE email_outbox
+        SET status = 'PENDING',
+            locked_at = NULL,
+            attempts = GREATEST(attempts - 1, 0),
+            next_attempt_at = NOW() + make_interval(secs => %s)
+        WHERE id = %s;
+        """,
+        [max(delay_seconds, 1), email_id],
+    )
+
+
+def _load_payload(payload) -> dict:
+    if isinstance(payload, str):
+        return json.loads(payload or "{}")
+    return payload or {}
+
+
+def send_outbox_batch(limit: int = 50) -> dict:
+    """
+    Claims up to `limit` due emails and sends them over one SMTP connection.
+    Returns {"claimed", "sent", "failed", "deferred", "retry_after"}.
+    """
+    # circuit open: leave the rows alone until SMTP gets another chance
+    retry_after = mailer.smtp_breaker.retry_after()
+    if retry_after > 0:
+        return {"claimed": 0, "sent": 0, "failed": 0, "deferred": 0, "retry_after": retry_after}
+
+    rows = claim_emails(limit)
+    sent = 0
+    failed = 0
+    deferred = 0
+
+    ready: list[tuple[str, dict]] = []
+    messages = []
+    for r in rows:
+        try:
+            msg = EMAIL_KINDS[r["kind"]](to_email=r["to_email"], **_load_payload(r["payload"]))
+        except Exception as ex:
+            failed += 1
+            mark_email_failed(str(r["id"]), int(r["attempts"]), int(r["max_attempts"]), str(ex))
+            continue
+        ready.append((str(r["id"]), r))
+        messages.append(msg)
+
+    try:
+        results = mailer.send_messages(messages)
+    except Exception as ex:
+        # could not even connect: every message in the batch failed
+        results = [ex] * len(messages)
+
+    for (email_id, r), err in zip(ready, results):
+        if err is None:
+            sent += 1
+            mark_email_sent(email_id)
+        elif isinstance(err, CircuitOpenError):
+            deferred += 1
+            release_email(email_id, err.retry_after)
+        else:
+            failed += 1
+            mark_email_failed(email_id, int(r["attempts"]), int(r["max_attempts"]), str(err))
+
+    return {
+        "claimed": len(rows),
+        "sent": sent,
+        "failed": failed,
+        "deferred": deferred,
+        "retry_after": mailer.smtp_breaker.retry_after(),
+    }
@@ -1,5 +1,8 @@
 import bcrypt
 import hashlib
+from django.core import signing
+
+ATTACHMENT_LINK_SALT = "attachment-link"
 
 def hash_password(plain: str) -> str:
     salt = bcrypt.gensalt(rounds=12)
@@ -18,4 +21,14 @@ def verify_token(token: str, token_hash: str) -> bool:
     return bcrypt.checkpw(token.encode("utf-8"), token_hash.encode("utf-8"))
 
 def sha256_hex(value: str) -> str:
-    return hashlib.sha256(value.encode("utf-8")).hexdigest()
\ No newline at end of file
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+def sign_attachment_link(attachment_id: str) -> str:
+    return signing.TimestampSigner(salt=ATTACHMENT_LINK_SALT).sign(str(attachment_id))
+
+def verify_attachment_link(token: str, attachment_id: str, max_age_seconds: int) -> bool:
+    try:
+        value = signing.TimestampSigner(salt=ATTACHMENT_LINK_SALT).unsign(token, max_age=max_age_seconds)
+    except signing.BadSignature:
+        return False
+    return value == str(attachment_id)
@@ -0,0 +1,261 @@
+import os
+from typing import Iterable, Iterator
+from django.conf import settings
+
+CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = ".part"
+
+
+class LocalStorage:
+    """
+    Files under <root>/<name>. Default driver (MEDIA_ROOT/task_attachments).
+    """
+
+    kind = "local"
+
+    def __init__(self, root: str):
+        self.root = str(root)
+
+    def spec(self) -> dict:
+        return {"kind": self.kind, "root": self.root}
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self.path(name))
+
+    def size(self, name: str) -> int:
+        return os.path.getsize(self.path(name))
+
+    def put(self, name: str, chunks: Iterable[bytes]) -> int:
+        """
+        Writes to <name>.part first so readers never see a half-written file.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        abs_path = self.path(name)
+        tmp = f"{abs_path}{PART_SUFFIX}"
+        size = 0
+        with open(tmp, "wb") as dest:
+            for chunk in chunks:
+                dest.write(chunk)
+                size += len(chunk)
+        os.replace(tmp, abs_path)
+        return size
+
+    def get(self, name: str) -> bytes:
+        with open(self.path(name), "rb") as f:
+            return f.read()
+
+    def open(self, name: str):
+        return open(self.path(name), "rb")
+
+    def stream(self, name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        with open(self.path(name), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def delete(self, name: str) -> None:
+        try:
+            os.remove(self.path(name))
+        except FileNotFoundError:
+            pass
+
+    def presign(self, name: str, expires: int = 300, filename: str | None = None, content_type: str | None = None) -> str | None:
+        # bytes have to go through Django for local files
+        return None
+
+    def iter_files(self) -> Iterator[tuple[str, int, float]]:
+        """
+        Yields (name, size_bytes, modified_ts) lazily; never lists the whole directory.
+        """
+        if not os.path.isdir(self.root):
+            return
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                yield entry.name, st.st_size, st.st_mtime
+
+
+class S3Storage:
+    """
+    S3-compatible driver (AWS S3, MinIO, ...). Objects live at <prefix><name>.
+    """
+
+    kind = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "task_attachments/",
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self._client = None
+
+    def spec(self) -> dict:
+        return {
+            "kind": self.kind,
+            "bucket": self.bucket,
+            "prefix": self.prefix,
+            "endpoint_url": self.endpoint_url,
+            "region": self.region,
+            "access_key": self.access_key,
+            "secret_key": self.secret_key,
+        }
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=self.endpoint_url or None,
+                region_name=self.region or None,
+                aws_access_key_id=self.access_key or None,
+                aws_secret_access_key=self.secret_key or None,
+            )
+        return self._client
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def path(self, name: str) -> str | None:
+        return None
+
+    def exists(self, name: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key(name))
+            return True
+        except ClientError as ex:
+            if ex.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def size(self, name: str) -> int:
+        head = self.client.head_object(Bucket=self.bucket, Key=self.key(name))
+        return int(head["ContentLength"])
+
+    def put(self, name: str, chunks: Iterable[bytes]) -> int:
+        # upload_fileobj does multipart upload for big files
+        reader = _ChunkReader(chunks)
+        self.client.upload_fileobj(reader, self.bucket, self.key(name))
+        return reader.size
+
+    def get(self, name: str) -> bytes:
+        obj = self.client.get_object(Bucket=self.bucket, Key=self.key(name))
+        return obj["Body"].read()
+
+    def open(self, name: str):
+        obj = self.client.get_object(Bucket=self.bucket, Key=self.key(name))
+        return obj["Body"]
+
+    def stream(self, name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        obj = self.client.get_object(Bucket=self.bucket, Key=self.key(name))
+        body = obj["Body"]
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    def delete(self, name: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(name))
+
+    def presign(self, name: str, expires: int = 300, filename: str | None = None, content_type: str | None = None) -> str | None:
+        params = {"Bucket": self.bucket, "Key": self.key(name)}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires)
+
+    def iter_files(self) -> Iterator[tuple[str, int, float]]:
+        """
+        Yields (name, size_bytes, modified_ts) page by page (1000 keys per request).
+        """
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                name = obj["Key"][len(self.prefix):]
+                if not name or "/" in name:
+                    continue
+                yield name, int(obj["Size"]), obj["LastModified"].timestamp()
+
+
+class _ChunkReader:
+    """
+    File-like adapter over an iterable of chunks (for boto3 upload_fileobj).
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._it = iter(chunks)
+        self._buf = b""
+        self.size = 0
+
+    def read(self, n: int = -1) -> bytes:
+        while n < 0 or len(self._buf) < n:
+            try:
+                chunk = next(self._it)
+            except StopIteration:
+                break
+            self.size += len(chunk)
+            self._buf += chunk
+
+        if n < 0:
+            out, self._buf = self._buf, b""
+        else:
+            out, self._buf = self._buf[:n], self._buf[n:]
+        return out
+
+
+def build_storage(spec: dict):
+    """
+    Rebuild a driver from spec() (used by worker processes; no settings access).
+    """
+    spec = dict(spec)
+    kind = spec.pop("kind")
+    if kind == "local":
+        return LocalStorage(**spec)
+    if kind == "s3":
+        return S3Storage(**spec)
+    raise ValueError(f"Unknown storage kind: {kind}")
+
+
+_storage = None
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        kind = getattr(settings, "ATTACHMENT_STORAGE", "local")
+        if kind == "s3":
+            _storage = S3Storage(
+                bucket=settings.S3_BUCKET,
+                prefix=settings.S3_PREFIX,
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                region=settings.S3_REGION,
+                access_key=settings.S3_ACCESS_KEY_ID,
+                secret_key=settings.S3_SECRET_ACCESS_KEY,
+            )
+        elif kind == "local":
+            _storage = LocalStorage(os.path.join(settings.MEDIA_ROOT, "task_attachments"))
+        else:
+            raise ValueError(f"Unknown ATTACHMENT_STORAGE: {kind}")
+    return _storage
@@ -0,0 +1,44 @@
+from typing import Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+class AsyncChunks:
+    """
+    Async view of a sync byte iterator: every chunk is pulled with sync_to_async, in
+    the request's own sync thread (DB cursors / transactions stay on one connection).
+    Handing Django a plain sync iterator under ASGI makes it list() the whole body first.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._it = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        chunk = await sync_to_async(next, thread_sensitive=True)(self._it, _DONE)
+        if chunk is _DONE:
+            raise StopAsyncIteration
+        return chunk
+
+    def close(self) -> None:
+        # response.close() (client gone / done): finish the generator's cleanup
+        close = getattr(self._it, "close", None)
+        if close:
+            close()
+
+
+def streaming_response(request, chunks: Iterable[bytes], content_type: str) -> StreamingHttpResponse:
+    """
+    StreamingHttpResponse that streams under both entry points:
+    sync iterator for WSGI, AsyncChunks for ASGI (uvicorn backend.asgi:application).
+    """
+    django_request = getattr(request, "_request", request)  # DRF Request wraps it
+    if isinstance(django_request, ASGIRequest):
+        chunks = AsyncChunks(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
@@ -0,0 +1,130 @@
+import io
+import logging
+import os
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+
+from backend.utils.storage import build_storage, get_storage
+
+logger = logging.getLogger(__name__)
+
+THUMB_EXTS = {".png", ".jpg", ".jpeg", ".webp", ".pdf"}
+THUMB_SUFFIX = ".thumb.jpg"
+THUMB_FAILED_SUFFIX = ".thumb.failed"
+THUMB_MAX_PX = 320
+THUMB_QUALITY = 80
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def supports_thumbnail(name: str) -> bool:
+    ext = os.path.splitext(name or "")[1].lower()
+    return ext in THUMB_EXTS
+
+
+def thumbnail_name(storage_name: str) -> str:
+    """
+    Thumbnail lives next to the blob (same storage):
+      report.pdf -> report.pdf.thumb.jpg
+    """
+    return f"{storage_name}{THUMB_SUFFIX}"
+
+
+def thumbnail_failed(storage_name: str) -> bool:
+    """
+    A render already failed for this blob (corrupt / unsupported content): don't retry.
+    """
+    return get_storage().exists(f"{storage_name}{THUMB_FAILED_SUFFIX}")
+
+
+def _open_first_page(name: str, data: bytes):
+    from PIL import Image
+
+    if name.lower().endswith(".pdf"):
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(data)
+        try:
+            page = pdf[0]
+            # render at a scale that is just big enough for the thumbnail
+            width = page.get_width() or THUMB_MAX_PX
+            scale = max(THUMB_MAX_PX / float(width), 0.1)
+            return page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+
+    return Image.open(io.BytesIO(data))
+
+
+def render_thumbnail(storage_spec: dict, name: str) -> str:
+    """
+    Runs inside the process pool (no Django / DB access here).
+    Reads the blob and writes the thumbnail through the same storage driver.
+    """
+    from PIL import Image
+
+    storage = build_storage(storage_spec)
+    img = _open_first_page(name, storage.get(name))
+    img.thumbnail((THUMB_MAX_PX, THUMB_MAX_PX))
+
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        bg = Image.new("RGB", img.size, (255, 255, 255))
+        bg.paste(img, mask=img.split()[-1])
+        img = bg
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=THUMB_QUALITY, optimize=True)
+
+    dst = thumbnail_name(name)
+    storage.put(dst, [out.getvalue()])
+    return dst
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: never fork a process that holds open DB sockets
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.THUMB_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _on_render_done(storage_name: str, future: Future) -> None:
+    exc = future.exception()
+    if exc is None:
+        return
+    logger.error("Thumbnail render failed for %s: %r", storage_name, exc)
+    try:
+        # marker next to the blob: get_thumbnail_file stops re-queueing it
+        get_storage().put(f"{storage_name}{THUMB_FAILED_SUFFIX}", [repr(exc).encode()])
+    except Exception:
+        logger.exception("Could not record failed thumbnail for %s", storage_name)
+
+
+def queue_thumbnail(storage_name: str) -> bool:
+    """
+    Fire-and-forget: returns True if a job was queued. Never raises (a preview must
+    not break the upload); failures are logged and recorded by _on_render_done.
+    """
+    if not supports_thumbnail(storage_name):
+        return False
+
+    try:
+        storage = get_storage()
+        if storage.exists(thumbnail_name(storage_name)) or thumbnail_failed(storage_name):
+            return False
+
+        future = _get_pool().submit(render_thumbnail, storage.spec(), storage_name)
+    except Exception:
+        logger.exception("Could not queue thumbnail for %s", storage_name)
+        return False
+
+    future.add_done_callback(lambda f: _on_render_done(storage_name, f))
+    return True
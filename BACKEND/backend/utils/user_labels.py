@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from backend.utils.db import fetch_all
+
+# bumped on every user change; with a shared CACHES backend this reaches every process
+GENERATION_KEY = "user_labels:generation"
+
+
+class UserLabelCache:
+    """
+    Process-wide user id -> email LRU (audit payloads, notification actors, comment authors).
+
+    Unknown ids are cached as None too. The whole cache is dropped when the generation
+    in the Django cache moves (invalidate_user_labels), and an entry never lives
+    longer than `ttl_seconds`, so a missed invalidation only costs that long.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._data: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+        self._generation = None
+
+    def _sync_generation(self) -> None:
+        generation = cache.get(GENERATION_KEY, 0)
+        with self._lock:
+            if generation != self._generation:
+                self._data.clear()
+                self._generation = generation
+
+    def get_many(self, user_ids, now: float) -> tuple[dict[str, str | None], list[str]]:
+        """
+        -> (hits, missing ids)
+        """
+        hits, missing = {}, []
+        with self._lock:
+            for uid in user_ids:
+                entry = self._data.get(uid)
+                if entry is None or now - entry[1] > self.ttl_seconds:
+                    missing.append(uid)
+                    continue
+                self._data.move_to_end(uid)
+                hits[uid] = entry[0]
+        return hits, missing
+
+    def set_many(self, labels: dict[str, str | None], now: float) -> None:
+        with self._lock:
+            for uid, email in labels.items():
+                self._data[uid] = (email, now)
+                self._data.move_to_end(uid)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_labels = UserLabelCache(
+    maxsize=settings.USER_LABEL_CACHE_SIZE,
+    ttl_seconds=settings.USER_LABEL_CACHE_SECONDS,
+)
+
+
+def get_user_labels(user_ids) -> dict[str, str | None]:
+    """
+    {user_id: email or None} for canonical UUID strings; misses are loaded in one query.
+    """
+    ids = {str(u) for u in user_ids if u}
+    if not ids:
+        return {}
+
+    _labels._sync_generation()
+    now = time.monotonic()
+    labels, missing = _labels.get_many(ids, now)
+
+    if missing:
+        rows = fetch_all(
+            """
+            SELECT id, email
+            FROM users
+            WHERE id = ANY(%s::uuid[]);
+            """,
+            [missing],
+        )
+        loaded = {uid: None for uid in missing}
+        loaded.update({str(r["id"]): r["email"] for r in rows})
+        _labels.set_many(loaded, now)
+        labels.update(loaded)
+
+    return labels
+
+
+def invalidate_user_labels() -> None:
+    """
+    Call after an admin change to a users row that labels depend on (not on profile
+    saves: they cannot touch the email). Drops this process's labels now and every
+    other process's on its next lookup (after commit, so nobody re-caches the old row).
+    """
+    def _bump():
+        _labels.clear()
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            cache.set(GENERATION_KEY, 1, None)
+
+    transaction.on_commit(_bump)
@@ -10,6 +10,16 @@ LOWER_RE = re.compile(r"[a-z]")
 UPPER_RE = re.compile(r"[A-Z]")
 DIGIT_RE = re.compile(r"\d")
 SYMBOL_RE = re.compile(r"[^\w\s]")  # any symbol
+FILENAME_STRIP_RE = re.compile(r'["\'\x00-\x1f\x7f]')
+
+def clean_filename(name: str) -> str:
+    """
+    Client file name -> bare file name: last path part (either separator), no quotes or
+    control characters. "" if nothing usable is left (caller rejects or falls back).
+    """
+    n = (name or "").replace("\\", "/").split("/")[-1]
+    n = FILENAME_STRIP_RE.sub("", n).strip()
+    return "" if n in (".", "..") else n
 
 def validate_email(email: str) -> Optional[str]:
     e = (email or "").strip().lower()
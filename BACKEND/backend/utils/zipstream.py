@@ -0,0 +1,87 @@
+import os
+import zipfile
+from datetime import datetime
+
+from backend.utils.validators import clean_filename
+
+# already-compressed formats: deflating them again only burns CPU
+STORED_EXTS = {".pdf", ".jpg", ".jpeg", ".png", ".webp", ".docx"}
+
+
+class _Drain:
+    """
+    Write-only, non-seekable sink for ZipFile.
+    Bytes are buffered until the generator pops them, so memory stays at ~1 chunk.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def write(self, data) -> int:
+        self._buf += data
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+
+def _unique_name(name: str, used: set[str]) -> str:
+    """
+    report.pdf, report(1).pdf, report(2).pdf ...
+    Always a bare file name (no "../" or folders), whatever is stored in the DB.
+    """
+    stem, ext = os.path.splitext(clean_filename(name) or "document")
+    stem = stem or "document"
+    candidate = f"{stem}{ext}"
+    counter = 1
+    while candidate in used:
+        candidate = f"{stem}({counter}){ext}"
+        counter += 1
+    used.add(candidate)
+    return candidate
+
+
+def stream_zip(entries: list[dict]):
+    """
+    entries: [{"name": ..., "size": ..., "chunks": iterator of bytes, "modified": datetime | None}, ...]
+    "chunks" should be lazy (a generator) so files are opened one at a time.
+    Yields the archive as bytes; never holds more than one chunk in memory.
+    """
+    sink = _Drain()
+    used: set[str] = set()
+
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as zf:
+        for e in entries:
+            name = _unique_name(e.get("name"), used)
+            ext = os.path.splitext(name)[1].lower()
+
+            modified = e.get("modified") or datetime.now()
+            zinfo = zipfile.ZipInfo(name, date_time=modified.timetuple()[:6])
+            zinfo.compress_type = zipfile.ZIP_STORED if ext in STORED_EXTS else zipfile.ZIP_DEFLATED
+            zinfo.file_size = int(e["size"])
+
+            with zf.open(zinfo, mode="w") as dest:
+                for chunk in e["chunks"]:
+                    dest.write(chunk)
+                    data = sink.pop()
+                    if data:
+                        yield data
+
+            data = sink.pop()
+            if data:
+                yield data
+
+    # central directory
+    data = sink.pop()
+    if data:
+        yield data
@@ -79,8 +79,7 @@ CREATE TABLE IF NOT EXISTS audit_log (
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_audit_actor_id ON audit_log(actor_id);
-CREATE INDEX IF NOT EXISTS idx_audit_entity_created ON audit_log(entity, created_at);
+-- query indexes: see AUDIT LOG QUERY INDEXES (created once audit_log is partitioned)
 
 -- ============================================================
 -- 4) REFRESH TOKENS (LATEST = token_sha256)
@@ -172,7 +171,7 @@ CREATE TABLE IF NOT EXISTS task_comments (
   updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_task_comments_task_id ON task_comments(task_id);
+-- per-task lookups: idx_task_comments_task_created (COMMENT PAGINATION)
 CREATE INDEX IF NOT EXISTS idx_task_comments_created_at ON task_comments(created_at);
 
 -- ============================================================
@@ -188,8 +187,7 @@ CREATE TABLE IF NOT EXISTS notifications (
   created_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_notifications_recipient ON notifications(recipient_id);
-CREATE INDEX IF NOT EXISTS idx_notifications_read ON notifications(recipient_id, is_read);
+-- recipient lookups: idx_notifications_recipient_created / idx_notifications_unread (below)
 CREATE INDEX IF NOT EXISTS idx_notifications_created_at ON notifications(created_at);
 
 -- ============================================================
@@ -721,7 +719,7 @@ CREATE TABLE IF NOT EXISTS auth_activity (
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_auth_activity_email_lower ON auth_activity (LOWER(email));
+-- email search: idx_auth_activity_email_trgm (AUTH ACTIVITY SEARCH)
 CREATE INDEX IF NOT EXISTS idx_auth_activity_created_at ON auth_activity (created_at);
 CREATE INDEX IF NOT EXISTS idx_auth_activity_event ON auth_activity (event);
 
@@ -780,4 +778,601 @@ CHECK (type = ANY (ARRAY[
   'DEADLINE'::text,
   'COMMENT'::text,
   'PROFILE'::text
-]));
\ No newline at end of file
+]));
+
+-- =========================
+-- ATTACHMENT GC (orphan files lookup by storage_name)
+-- =========================
+CREATE INDEX IF NOT EXISTS idx_task_attachments_storage_name ON task_attachments(storage_name);
+
+
+-- =========================
+-- CHUNKED UPLOAD SESSIONS (resumable uploads, finalized into task_attachments)
+-- =========================
+CREATE TABLE IF NOT EXISTS upload_sessions (
+  id             UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id        UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  original_name  TEXT NOT NULL,
+  content_type   TEXT NOT NULL DEFAULT 'application/octet-stream',
+  size_bytes     BIGINT NOT NULL CHECK (size_bytes > 0),
+  sha256         TEXT NOT NULL,
+  received_bytes BIGINT NOT NULL DEFAULT 0,
+  status         TEXT NOT NULL DEFAULT 'OPEN' CHECK (status IN ('OPEN','FINALIZING','DONE')),
+  attachment_id  UUID NULL REFERENCES task_attachments(id) ON DELETE SET NULL,
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  expires_at     TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_upload_sessions_user_id ON upload_sessions(user_id);
+CREATE INDEX IF NOT EXISTS idx_upload_sessions_expires ON upload_sessions(expires_at);
+
+-- FINALIZING: blob being verified / stored outside any transaction
+ALTER TABLE upload_sessions DROP CONSTRAINT IF EXISTS upload_sessions_status_check;
+ALTER TABLE upload_sessions
+  ADD CONSTRAINT upload_sessions_status_check
+  CHECK (status IN ('OPEN','FINALIZING','DONE'));
+
+
+-- =========================
+-- EMAIL OUTBOX (written in the business transaction, sent by `manage.py send_emails`)
+-- =========================
+CREATE TABLE IF NOT EXISTS email_outbox (
+  id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  kind            TEXT NOT NULL,
+  to_email        TEXT NOT NULL,
+  payload         JSONB NOT NULL DEFAULT '{}'::jsonb,
+  status          TEXT NOT NULL DEFAULT 'PENDING' CHECK (status IN ('PENDING','SENDING','SENT','DEAD')),
+  attempts        INT NOT NULL DEFAULT 0,
+  max_attempts    INT NOT NULL DEFAULT 8,
+  next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  locked_at       TIMESTAMPTZ NULL,
+  last_error      TEXT NULL,
+  created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  sent_at         TIMESTAMPTZ NULL
+);
+
+-- worker only scans rows that still need work
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+  ON email_outbox(next_attempt_at)
+  WHERE status IN ('PENDING','SENDING');
+
+
+-- =========================
+-- NOTIFICATION DIGESTS (one summary email per user per window; `manage.py send_digests`)
+-- =========================
+ALTER TABLE users
+ADD COLUMN IF NOT EXISTS notify_digest TEXT NOT NULL DEFAULT 'OFF'
+  CHECK (notify_digest IN ('OFF','HOURLY','DAILY'));
+
+ALTER TABLE users
+ADD COLUMN IF NOT EXISTS digest_last_sent_at TIMESTAMPTZ NULL;
+
+ALTER TABLE notifications
+ADD COLUMN IF NOT EXISTS digested_at TIMESTAMPTZ NULL;
+
+-- unread rows not yet included in any digest
+CREATE INDEX IF NOT EXISTS idx_notifications_digest_pending
+  ON notifications(recipient_id, created_at)
+  WHERE is_read = FALSE AND digested_at IS NULL;
+
+
+-- =========================
+-- NOTIFICATION PUSH (LISTEN notifications -> /api/notifications/stream, see tasks/sse.py)
+-- =========================
+CREATE OR REPLACE FUNCTION trg_notifications_notify()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM pg_notify(
+      'notifications',
+      json_build_object('recipient_id', NEW.recipient_id, 'event', 'created', 'id', NEW.id)::text
+    );
+  ELSIF NEW.is_read IS DISTINCT FROM OLD.is_read THEN
+    -- same payload for every row of one UPDATE -> postgres delivers it once per transaction
+    PERFORM pg_notify(
+      'notifications',
+      json_build_object('recipient_id', NEW.recipient_id, 'event', 'read')::text
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS t_notifications_notify ON notifications;
+CREATE TRIGGER t_notifications_notify
+AFTER INSERT OR UPDATE OF is_read ON notifications
+FOR EACH ROW
+EXECUTE FUNCTION trg_notifications_notify();
+
+
+-- =========================
+-- UNREAD NOTIFICATION COUNTERS (badge = primary-key lookup instead of COUNT(*))
+-- =========================
+CREATE TABLE IF NOT EXISTS notification_counters (
+  user_id      UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+  unread_count INT NOT NULL DEFAULT 0 CHECK (unread_count >= 0),
+  updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION trg_notification_counters()
+RETURNS TRIGGER AS $$
+DECLARE
+  delta INT := 0;
+  uid   UUID;
+BEGIN
+  -- mark_all_read resets the counter itself (SET LOCAL app.skip_unread_counter = 'on')
+  IF current_setting('app.skip_unread_counter', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP = 'INSERT' THEN
+    uid := NEW.recipient_id;
+    IF NOT NEW.is_read THEN delta := 1; END IF;
+  ELSIF TG_OP = 'UPDATE' THEN
+    uid := NEW.recipient_id;
+    IF OLD.is_read AND NOT NEW.is_read THEN delta := 1; END IF;
+    IF NOT OLD.is_read AND NEW.is_read THEN delta := -1; END IF;
+  ELSIF TG_OP = 'DELETE' THEN
+    uid := OLD.recipient_id;
+    IF NOT OLD.is_read THEN delta := -1; END IF;
+  END IF;
+
+  IF delta > 0 THEN
+    INSERT INTO notification_counters(user_id, unread_count)
+    VALUES (uid, delta)
+    ON CONFLICT (user_id) DO UPDATE
+      SET unread_count = notification_counters.unread_count + EXCLUDED.unread_count,
+          updated_at = NOW();
+  ELSIF delta < 0 THEN
+    UPDATE notification_counters
+    SET unread_count = GREATEST(unread_count + delta, 0),
+        updated_at = NOW()
+    WHERE user_id = uid;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS t_notification_counters ON notifications;
+CREATE TRIGGER t_notification_counters
+AFTER INSERT OR UPDATE OF is_read OR DELETE ON notifications
+FOR EACH ROW
+EXECUTE FUNCTION trg_notification_counters();
+
+-- backfill / repair (safe to re-run)
+INSERT INTO notification_counters(user_id, unread_count)
+SELECT recipient_id, COUNT(*)
+FROM notifications
+WHERE is_read = FALSE
+GROUP BY recipient_id
+ON CONFLICT (user_id) DO UPDATE
+  SET unread_count = EXCLUDED.unread_count,
+      updated_at = NOW();
+
+
+-- =========================
+-- NOTIFICATION KEYSET PAGINATION (before/after cursors on (created_at, id))
+-- =========================
+CREATE INDEX IF NOT EXISTS idx_notifications_recipient_created
+  ON notifications(recipient_id, created_at DESC, id DESC);
+
+
+-- =========================
+-- NOTIFICATION RETENTION (python manage.py archive_notifications)
+-- read rows older than NOTIFICATION_RETENTION_DAYS move here; the hot table keeps unread + recent
+-- =========================
+CREATE TABLE IF NOT EXISTS notifications_archive (
+  id           UUID PRIMARY KEY,
+  recipient_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  task_id      UUID NULL,
+  type         TEXT NOT NULL,
+  message      TEXT NOT NULL,
+  is_read      BOOLEAN NOT NULL,
+  created_at   TIMESTAMPTZ NOT NULL,
+  actor_id     UUID NULL,
+  digested_at  TIMESTAMPTZ NULL,
+  archived_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_notifications_archive_recipient
+  ON notifications_archive(recipient_id, created_at DESC);
+
+-- unread list / mark_all_read only touch unread rows
+CREATE INDEX IF NOT EXISTS idx_notifications_unread
+  ON notifications(recipient_id, created_at DESC)
+  WHERE is_read = FALSE;
+
+-- covered by idx_notifications_unread and idx_notifications_recipient_created
+-- (only databases created before them still have these)
+DROP INDEX IF EXISTS idx_notifications_read;
+DROP INDEX IF EXISTS idx_notifications_recipient;
+
+
+-- =========================
+-- COMMENT PAGINATION + PER-TASK COMMENT COUNT
+-- =========================
+CREATE INDEX IF NOT EXISTS idx_task_comments_task_created
+  ON task_comments(task_id, created_at, id);
+
+-- covered by idx_task_comments_task_created (only databases created before it have this)
+DROP INDEX IF EXISTS idx_task_comments_task_id;
+
+-- side table (not a tasks column): bumping tasks would fire its audit + updated_at triggers
+CREATE TABLE IF NOT EXISTS task_comment_counts (
+  task_id       UUID PRIMARY KEY REFERENCES tasks(id) ON DELETE CASCADE,
+  comment_count INT NOT NULL DEFAULT 0 CHECK (comment_count >= 0)
+);
+
+CREATE OR REPLACE FUNCTION trg_task_comment_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO task_comment_counts(task_id, comment_count)
+    VALUES (NEW.task_id, 1)
+    ON CONFLICT (task_id) DO UPDATE
+      SET comment_count = task_comment_counts.comment_count + 1;
+  ELSIF TG_OP = 'DELETE' THEN
+    UPDATE task_comment_counts
+    SET comment_count = GREATEST(comment_count - 1, 0)
+    WHERE task_id = OLD.task_id;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS t_task_comment_counts ON task_comments;
+CREATE TRIGGER t_task_comment_counts
+AFTER INSERT OR DELETE ON task_comments
+FOR EACH ROW
+EXECUTE FUNCTION trg_task_comment_counts();
+
+-- backfill / repair (safe to re-run)
+INSERT INTO task_comment_counts(task_id, comment_count)
+SELECT task_id, COUNT(*)
+FROM task_comments
+GROUP BY task_id
+ON CONFLICT (task_id) DO UPDATE
+  SET comment_count = EXCLUDED.comment_count;
+
+-- fn_get_tasks_for_user (LATEST: + comment_count)
+DROP FUNCTION IF EXISTS fn_get_tasks_for_user(UUID);
+
+CREATE OR REPLACE FUNCTION fn_get_tasks_for_user(p_user_id UUID)
+RETURNS TABLE(
+  id UUID,
+  title TEXT,
+  description TEXT,
+  status TEXT,
+  owner_id UUID,
+  created_by UUID,
+  created_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ,
+  due_date TIMESTAMPTZ,
+  priority TEXT,
+  completed_at TIMESTAMPTZ,
+  can_edit_status BOOLEAN,
+  can_edit_content BOOLEAN,
+  can_delete BOOLEAN,
+  comment_count INT
+) AS $$
+DECLARE r TEXT;
+BEGIN
+  r := fn_user_role(p_user_id);
+
+  IF r = 'ADMIN' THEN
+    RETURN QUERY
+    SELECT
+      t.id, t.title, t.description, t.status,
+      t.owner_id, t.created_by,
+      t.created_at, t.updated_at,
+      t.due_date, t.priority, t.completed_at,
+      TRUE, TRUE, TRUE,
+      COALESCE(cc.comment_count, 0)
+    FROM tasks t
+    LEFT JOIN task_comment_counts cc ON cc.task_id = t.id
+    ORDER BY t.updated_at DESC;
+
+  ELSE
+    RETURN QUERY
+    SELECT
+      t.id, t.title, t.description, t.status,
+      t.owner_id, t.created_by,
+      t.created_at, t.updated_at,
+      t.due_date, t.priority, t.completed_at,
+      (t.owner_id = p_user_id) AS can_edit_status,
+      (t.created_by = p_user_id) AS can_edit_content,
+      (t.created_by = p_user_id) AS can_delete,
+      COALESCE(cc.comment_count, 0)
+    FROM tasks t
+    LEFT JOIN task_comment_counts cc ON cc.task_id = t.id
+    WHERE t.owner_id = p_user_id
+    ORDER BY t.updated_at DESC;
+  END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- =========================
+-- AUDIT LOG: monthly RANGE partitions on created_at (python manage.py maintain_audit_log)
+-- audit_log_YYYYMM per UTC month + audit_log_default as a safety net
+-- =========================
+CREATE OR REPLACE FUNCTION fn_audit_log_create_partition(p_month DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+  m_start TIMESTAMPTZ := date_trunc('month', p_month::timestamp) AT TIME ZONE 'UTC';
+  m_end   TIMESTAMPTZ := (date_trunc('month', p_month::timestamp) + INTERVAL '1 month') AT TIME ZONE 'UTC';
+  part    TEXT := 'audit_log_' || to_char(p_month, 'YYYYMM');
+BEGIN
+  IF to_regclass(part) IS NOT NULL THEN
+    RETURN FALSE;
+  END IF;
+
+  -- rows of this month that landed in audit_log_default have to move out first
+  CREATE TEMP TABLE IF NOT EXISTS _audit_log_spill (LIKE audit_log) ON COMMIT DROP;
+  IF to_regclass('audit_log_default') IS NOT NULL THEN
+    WITH moved AS (
+      DELETE FROM audit_log_default
+      WHERE created_at >= m_start AND created_at < m_end
+      RETURNING *
+    )
+    INSERT INTO _audit_log_spill SELECT * FROM moved;
+  END IF;
+
+  EXECUTE format(
+    'CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+    part, m_start, m_end
+  );
+
+  INSERT INTO audit_log SELECT * FROM _audit_log_spill;
+  TRUNCATE _audit_log_spill;
+  RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- current month + p_months_ahead; returns how many partitions were created
+CREATE OR REPLACE FUNCTION fn_audit_log_ensure_partitions(p_months_ahead INT DEFAULT 3)
+RETURNS INT AS $$
+DECLARE
+  m       DATE := date_trunc('month', NOW() AT TIME ZONE 'UTC')::date;
+  created INT := 0;
+BEGIN
+  FOR i IN 0..p_months_ahead LOOP
+    IF fn_audit_log_create_partition((m + make_interval(months => i))::date) THEN
+      created := created + 1;
+    END IF;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- one-time conversion of the plain table (copies history into monthly partitions)
+DO $$
+DECLARE
+  m DATE;
+  this_month DATE := date_trunc('month', NOW() AT TIME ZONE 'UTC')::date;
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'audit_log'::regclass) THEN
+    RETURN;
+  END IF;
+
+  ALTER TABLE audit_log RENAME TO audit_log_legacy;
+  ALTER TABLE audit_log_legacy ALTER COLUMN id DROP DEFAULT;
+  ALTER TABLE audit_log_legacy DROP CONSTRAINT IF EXISTS audit_log_pkey;
+  ALTER TABLE audit_log_legacy DROP CONSTRAINT IF EXISTS audit_log_actor_id_fkey;
+  DROP INDEX IF EXISTS idx_audit_actor_id;
+  DROP INDEX IF EXISTS idx_audit_entity_created;
+  ALTER SEQUENCE audit_log_id_seq OWNED BY NONE;
+
+  CREATE TABLE audit_log (
+    id         BIGINT NOT NULL DEFAULT nextval('audit_log_id_seq'),
+    actor_id   UUID NULL REFERENCES users(id) ON DELETE SET NULL,
+    action     TEXT NOT NULL,
+    entity     TEXT NOT NULL,
+    entity_id  UUID NULL,
+    payload    JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+  ) PARTITION BY RANGE (created_at);
+
+  ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.id;
+
+  CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT;
+
+  SELECT COALESCE(date_trunc('month', MIN(created_at) AT TIME ZONE 'UTC')::date, this_month)
+  INTO m
+  FROM audit_log_legacy;
+
+  WHILE m < this_month LOOP
+    PERFORM fn_audit_log_create_partition(m);
+    m := (m + INTERVAL '1 month')::date;
+  END LOOP;
+  PERFORM fn_audit_log_ensure_partitions(3);
+
+  INSERT INTO audit_log(id, actor_id, action, entity, entity_id, payload, created_at)
+  SELECT id, actor_id, action, entity, entity_id, payload, created_at
+  FROM audit_log_legacy;
+
+  DROP TABLE audit_log_legacy;
+END;
+$$;
+
+
+-- =========================
+-- AUDIT: diff-only UPDATE payloads
+-- {"diff": true, "key": {...}, "old": {changed cols}, "new": {changed cols}}
+-- no row when only bookkeeping columns changed.
+-- ALTER DATABASE <db> SET app.audit_mode = 'full' brings back full old/new rows.
+-- =========================
+CREATE OR REPLACE FUNCTION fn_audit_diff(p_old JSONB, p_new JSONB, p_ignore TEXT[])
+RETURNS JSONB AS $$
+  SELECT jsonb_build_object(
+    'old', COALESCE(jsonb_object_agg(n.key, p_old -> n.key), '{}'::jsonb),
+    'new', COALESCE(jsonb_object_agg(n.key, n.value), '{}'::jsonb)
+  )
+  FROM jsonb_each(p_new) n
+  WHERE NOT (n.key = ANY(p_ignore))
+    AND (p_old -> n.key) IS DISTINCT FROM n.value;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION trg_audit_tasks()
+RETURNS TRIGGER AS $$
+DECLARE
+  actor   UUID;
+  payload JSONB;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    actor := NEW.created_by;
+
+    INSERT INTO audit_log(actor_id, action, entity, entity_id, payload)
+    VALUES (actor, 'INSERT', 'tasks', NEW.id, to_jsonb(NEW));
+    RETURN NEW;
+
+  ELSIF TG_OP = 'UPDATE' THEN
+    actor := COALESCE(NEW.updated_by, NEW.created_by);
+
+    IF current_setting('app.audit_mode', true) = 'full' THEN
+      payload := jsonb_build_object('old', to_jsonb(OLD), 'new', to_jsonb(NEW));
+    ELSE
+      payload := fn_audit_diff(to_jsonb(OLD), to_jsonb(NEW), ARRAY['updated_at', 'updated_by']);
+      IF payload -> 'new' = '{}'::jsonb THEN
+        RETURN NEW;
+      END IF;
+      payload := payload || jsonb_build_object(
+        'diff', TRUE,
+        'key', jsonb_build_object('id', NEW.id, 'title', NEW.title, 'owner_id', NEW.owner_id)
+      );
+    END IF;
+
+    INSERT INTO audit_log(actor_id, action, entity, entity_id, payload)
+    VALUES (actor, 'UPDATE', 'tasks', NEW.id, payload);
+    RETURN NEW;
+
+  ELSIF TG_OP = 'DELETE' THEN
+    actor := OLD.created_by;
+
+    INSERT INTO audit_log(actor_id, action, entity, entity_id, payload)
+    VALUES (actor, 'DELETE', 'tasks', OLD.id, to_jsonb(OLD));
+    RETURN OLD;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_audit_task_comments()
+RETURNS TRIGGER AS $$
+DECLARE
+  payload JSONB;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO audit_log(actor_id, action, entity, entity_id, payload)
+    VALUES (NEW.user_id, 'INSERT', 'task_comments', NEW.id, to_jsonb(NEW));
+    RETURN NEW;
+
+  ELSIF TG_OP = 'UPDATE' THEN
+    IF current_setting('app.audit_mode', true) = 'full' THEN
+      payload := jsonb_build_object('old', to_jsonb(OLD), 'new', to_jsonb(NEW));
+    ELSE
+      payload := fn_audit_diff(to_jsonb(OLD), to_jsonb(NEW), ARRAY['updated_at']);
+      IF payload -> 'new' = '{}'::jsonb THEN
+        RETURN NEW;
+      END IF;
+      payload := payload || jsonb_build_object(
+        'diff', TRUE,
+        'key', jsonb_build_object('id', NEW.id, 'task_id', NEW.task_id, 'user_id', NEW.user_id)
+      );
+    END IF;
+
+    INSERT INTO audit_log(actor_id, action, entity, entity_id, payload)
+    VALUES (NEW.user_id, 'UPDATE', 'task_comments', NEW.id, payload);
+    RETURN NEW;
+
+  ELSIF TG_OP = 'DELETE' THEN
+    INSERT INTO audit_log(actor_id, action, entity, entity_id, payload)
+    VALUES (OLD.user_id, 'DELETE', 'task_comments', OLD.id, to_jsonb(OLD));
+    RETURN OLD;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- =========================
+-- AUDIT LOG QUERY INDEXES (keyset on (created_at, id), one per filter)
+-- =========================
+CREATE INDEX IF NOT EXISTS idx_audit_created_id ON audit_log(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_action_created ON audit_log(action, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_entity_created_id ON audit_log(entity, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_entity_id_created ON audit_log(entity_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_actor_created ON audit_log(actor_id, created_at, id);
+
+-- superseded by the (..., created_at, id) versions above; only databases created
+-- before these indexes still have them
+DROP INDEX IF EXISTS idx_audit_created;
+DROP INDEX IF EXISTS idx_audit_entity_created;
+DROP INDEX IF EXISTS idx_audit_actor_id;
+
+
+-- =========================
+-- TASK HISTORY (GET /api/tasks/<id>/history)
+-- audit_log.task_id = the task a row belongs to (the task itself, its comments, its attachments)
+-- =========================
+ALTER TABLE audit_log
+ADD COLUMN IF NOT EXISTS task_id UUID NULL;
+
+CREATE OR REPLACE FUNCTION fn_audit_task_id(p_entity TEXT, p_entity_id UUID, p_payload JSONB)
+RETURNS UUID AS $$
+  SELECT CASE
+    WHEN p_entity = 'tasks' THEN p_entity_id
+    WHEN p_entity IN ('task_comments', 'task_attachments') THEN
+      COALESCE(
+        p_payload ->> 'task_id',
+        p_payload -> 'key' ->> 'task_id',
+        p_payload -> 'new' ->> 'task_id'
+      )::uuid
+  END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION trg_audit_log_task_id()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF NEW.task_id IS NULL THEN
+    NEW.task_id := fn_audit_task_id(NEW.entity, NEW.entity_id, NEW.payload);
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS t_audit_log_task_id ON audit_log;
+CREATE TRIGGER t_audit_log_task_id
+BEFORE INSERT ON audit_log
+FOR EACH ROW
+EXECUTE FUNCTION trg_audit_log_task_id();
+
+-- backfill (only rows still missing it)
+UPDATE audit_log
+SET task_id = fn_audit_task_id(entity, entity_id, payload)
+WHERE task_id IS NULL
+  AND entity IN ('tasks', 'task_comments', 'task_attachments');
+
+CREATE INDEX IF NOT EXISTS idx_audit_task_created
+  ON audit_log(task_id, created_at, id)
+  WHERE task_id IS NOT NULL;
+
+
+-- =========================
+-- AUTH ACTIVITY SEARCH
+-- email filter is a substring match: LOWER(email) LIKE '%x%' needs a trigram index
+-- (the btree on LOWER(email) only serves prefix/equality and nothing queries that)
+-- =========================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_auth_activity_email_trgm
+  ON auth_activity USING gin (LOWER(email) gin_trgm_ops);
+
+-- only databases created before the trigram index still have the old btree
+DROP INDEX IF EXISTS idx_auth_activity_email_lower;
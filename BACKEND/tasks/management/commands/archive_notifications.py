@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.notification_service import archive_old_notifications
+
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.2f} MB"
+
+
+class Command(BaseCommand):
+    help = "Move read notifications older than the retention period into notifications_archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Retention (default NOTIFICATION_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows moved per transaction.")
+        parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM (ANALYZE) afterwards.")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Run periodically every N seconds (0 = run once).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            report = archive_old_notifications(
+                days=options["days"],
+                batch_size=options["batch_size"],
+                vacuum=not options["no_vacuum"],
+            )
+
+            before = report["before"].get("notifications", {})
+            after = report["after"].get("notifications", {})
+            self.stdout.write(
+                f"Archived {report['archived']} notifications read before {report['cutoff']} "
+                f"in {report['batches']} batches. notifications: "
+                f"{_mb(before.get('total_bytes', 0))} -> {_mb(after.get('total_bytes', 0))}, "
+                f"{before.get('live_rows', 0)} -> {after.get('live_rows', 0)} rows."
+            )
+
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
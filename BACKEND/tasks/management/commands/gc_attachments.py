@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.attachment_gc_service import collect_orphan_attachments
+from tasks.services.upload_service import purge_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete attachment files (and thumbnails) that no task_attachments row points to."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be reclaimed.")
+        parser.add_argument("--grace-hours", type=float, default=24, help="Never touch files younger than this.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Storage names per DB existence check.")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Run periodically every N seconds (0 = run once).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            report = collect_orphan_attachments(
+                grace_seconds=int(options["grace_hours"] * 3600),
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+
+            mb = report["orphan_bytes"] / (1024 * 1024)
+            verb = "Would reclaim" if report["dry_run"] else "Reclaimed"
+            self.stdout.write(
+                f"Scanned {report['scanned']} files ({report['skipped_recent']} inside grace period). "
+                f"{verb} {report['orphans']} orphans, {report['orphan_bytes']} bytes ({mb:.2f} MB)"
+                + ("" if report["dry_run"] else f", deleted {report['deleted']}.")
+            )
+
+            if not options["dry_run"]:
+                purged = purge_expired_uploads(batch_size=options["batch_size"])
+                if purged:
+                    self.stdout.write(f"Purged {purged} expired upload sessions.")
+
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.notification_service import send_notification_digests
+
+
+class Command(BaseCommand):
+    help = "Queue one digest email per user whose HOURLY/DAILY digest window has passed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Recipients per query batch.")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Run periodically every N seconds (0 = run once).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = send_notification_digests(batch_size=options["batch_size"])
+            self.stdout.write(
+                f"Queued {result['users']} digests covering {result['notifications']} notifications."
+            )
+
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
@@ -91,6 +91,39 @@ def insert_attachment(
     )
 
 
+def insert_attachments(task_id: str, uploaded_by: str, items: list[dict]) -> list[dict]:
+    """
+    One multi-row INSERT for all files of a task.
+    items: [{"original_name":..., "storage_name":..., "content_type":..., "size_bytes":...}, ...]
+    Rows come back with storage_name so callers can map ids (RETURNING order is not guaranteed).
+    """
+    if not items:
+        return []
+
+    values_sql = ",".join(["(%s,%s,%s,%s,%s,%s)"] * len(items))
+    params: list = []
+    for it in items:
+        params += [
+            task_id,
+            it["original_name"],
+            it["storage_name"],
+            it["content_type"],
+            it["size_bytes"],
+            uploaded_by,
+        ]
+
+    return fetch_all(
+        f"""
+        INSERT INTO task_attachments(
+          task_id, original_name, storage_name, content_type, size_bytes, uploaded_by
+        )
+        VALUES {values_sql}
+        RETURNING id, task_id, original_name, storage_name, content_type, size_bytes, created_at;
+        """,
+        params,
+    )
+
+
 def get_attachment_with_owner(attachment_id: str) -> dict | None:
     return fetch_one(
         """
@@ -109,4 +142,19 @@ def get_attachment_with_owner(attachment_id: str) -> dict | None:
         LIMIT 1;
         """,
         [attachment_id],
-    )
\ No newline at end of file
+    )
+
+def existing_storage_names(names: list[str]) -> set[str]:
+    """Batch existence check used by the orphan GC (served by idx_task_attachments_storage_name)."""
+    if not names:
+        return set()
+
+    rows = fetch_all(
+        """
+        SELECT storage_name
+        FROM task_attachments
+        WHERE storage_name = ANY(%s::text[]);
+        """,
+        [names],
+    )
+    return {r["storage_name"] for r in rows}
@@ -1,23 +1,47 @@
 from backend.utils.db import fetch_one, fetch_all
 
-def list_comments_for_task(task_id: str) -> list[dict]:
+def list_comments_for_task(
+    task_id: str,
+    limit: int | None = None,
+    before: tuple | None = None,
+    after: tuple | None = None,
+) -> list[dict]:
+    """
+    limit=None -> whole thread, oldest first.
+    Paged (idx_task_comments_task_created): newest first, or oldest first with only `after`.
+    """
+    params = [task_id]
+    keyset = ""
+    if before:
+        keyset += " AND (c.created_at, c.id) < (%s, %s::uuid)"
+        params += [before[0], before[1]]
+    if after:
+        keyset += " AND (c.created_at, c.id) > (%s, %s::uuid)"
+        params += [after[0], after[1]]
+
+    if limit is None:
+        order, limit_sql = "ASC", ""
+    else:
+        order, limit_sql = ("ASC" if after and not before else "DESC"), "LIMIT %s"
+        params.append(limit)
+
     return fetch_all(
-        """
+        f"""
         SELECT
           c.id,
           c.task_id,
           c.user_id,
-          u.email AS user_email,
           c.content,
           c.is_edited,
           c.created_at,
           c.updated_at
         FROM task_comments c
-        JOIN users u ON u.id = c.user_id
         WHERE c.task_id = %s
-        ORDER BY c.created_at ASC;
+          {keyset}
+        ORDER BY c.created_at {order}, c.id {order}
+        {limit_sql};
         """,
-        [task_id],
+        params,
     )
 
 def insert_comment(task_id: str, user_id: str, content: str) -> dict:
@@ -1,4 +1,11 @@
-from backend.utils.db import fetch_one, fetch_all
+import json
+import select
+import time
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+from backend.utils.db import fetch_one, fetch_all, execute
 
 def create_notification(recipient_id: str, task_id: str | None, ntype: str, message: str,  actor_id: str | None = None, ) -> dict:
     return fetch_one(
@@ -10,35 +17,123 @@ def create_notification(recipient_id: str, task_id: str | None, ntype: str, mess
         [recipient_id, task_id, ntype, message, actor_id],
     )
 
-def list_notifications_for_user(user_id: str, unread_only: bool = False, limit: int = 20) -> list[dict]:
-    return fetch_all(
+def create_notifications_for_role(role: str, task_id: str | None, ntype: str, message: str, actor_id: str | None = None) -> list[str]:
+    """
+    Fan-out in one statement: every user with `role` and notify_inapp on, except the actor.
+    """
+    rows = fetch_all(
         """
+        INSERT INTO notifications(recipient_id, task_id, type, message, actor_id)
+        SELECT u.id, %s, %s, %s, %s
+        FROM users u
+        WHERE u.role = %s
+          AND u.notify_inapp = TRUE
+          AND (%s::uuid IS NULL OR u.id <> %s::uuid)
+        RETURNING id;
+        """,
+        [task_id, ntype, message, actor_id, role, actor_id, actor_id],
+    )
+    return [str(r["id"]) for r in rows]
+
+def list_notifications_for_user(
+    user_id: str,
+    unread_only: bool = False,
+    limit: int = 20,
+    before: tuple | None = None,
+    after: tuple | None = None,
+) -> list[dict]:
+    """
+    before/after = (created_at, id) keyset cursors (idx_notifications_recipient_created).
+    Rows come newest first, except with only `after`: then the rows right after the
+    cursor come oldest first, so a client catching up never skips any.
+    """
+    params = [user_id, unread_only]
+    keyset = ""
+    if before:
+        keyset += " AND (n.created_at, n.id) < (%s, %s::uuid)"
+        params += [before[0], before[1]]
+    if after:
+        keyset += " AND (n.created_at, n.id) > (%s, %s::uuid)"
+        params += [after[0], after[1]]
+    order = "ASC" if after and not before else "DESC"
+    params.append(limit)
+
+    return fetch_all(
+        f"""
         SELECT 
             n.id, n.recipient_id, n.task_id, n.type, n.message, n.is_read, n.created_at,
             t.title AS task_title,
-            n.actor_id,
-            u.email AS actor_email
+            n.actor_id
         FROM notifications n
         LEFT JOIN tasks t ON t.id = n.task_id
-        LEFT JOIN users u ON u.id = n.actor_id
         WHERE n.recipient_id = %s
           AND (%s = FALSE OR n.is_read = FALSE)
-        ORDER BY n.created_at DESC
+          {keyset}
+        ORDER BY n.created_at {order}, n.id {order}
         LIMIT %s;
         """,
-        [user_id, unread_only, limit],
+        params,
+    )
+
+
+@contextmanager
+def listen_for_new_notifications(user_id: str):
+    """
+    LISTEN on this request's own DB connection (autocommit, outside atomic blocks) and
+    yield wait(timeout) -> True as soon as the notifications trigger reports a new row
+    for user_id. LISTEN is issued first, so a row inserted before wait() is not missed.
+    """
+    execute("LISTEN notifications;")
+    pg = connection.connection
+
+    def wait(timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if select.select([pg], [], [], remaining) == ([], [], []):
+                return False
+            pg.poll()
+            while pg.notifies:
+                n = pg.notifies.pop(0)
+                try:
+                    payload = json.loads(n.payload)
+                except ValueError:
+                    continue
+                if payload.get("event") == "created" and str(payload.get("recipient_id")) == str(user_id):
+                    return True
+
+    try:
+        yield wait
+    finally:
+        execute("UNLISTEN notifications;")
+        del pg.notifies[:]
+
+def get_notification_for_user(user_id: str, notif_id: str) -> dict | None:
+    return fetch_one(
+        """
+        SELECT
+            n.id, n.recipient_id, n.task_id, n.type, n.message, n.is_read, n.created_at,
+            t.title AS task_title,
+            n.actor_id
+        FROM notifications n
+        LEFT JOIN tasks t ON t.id = n.task_id
+        WHERE n.id = %s AND n.recipient_id = %s;
+        """,
+        [notif_id, user_id],
     )
 
 def count_unread(user_id: str) -> int:
+    # kept current by the t_notification_counters trigger
     row = fetch_one(
         """
-        SELECT COUNT(*) AS unread_count
-        FROM notifications
-        WHERE recipient_id = %s AND is_read = FALSE;
+        SELECT unread_count
+        FROM notification_counters
+        WHERE user_id = %s;
         """,
         [user_id],
     )
-    # pg COUNT returns Decimal/int depending on driver
     return int(row["unread_count"]) if row and row.get("unread_count") is not None else 0
 
 def mark_notification_read(user_id: str, notif_id: str) -> None:
@@ -53,13 +148,155 @@ def mark_notification_read(user_id: str, notif_id: str) -> None:
     )
 
 def mark_all_read(user_id: str) -> None:
-    # NOTE: fetch_one is ok, but returning 1 is weird; still fine.
-    fetch_one(
+    with transaction.atomic():
+        # counter is reset in O(1); the per-row counter trigger is skipped for this transaction.
+        # Reset first: it locks the counter row, so a concurrent insert's +1 lands after us.
+        execute("SET LOCAL app.skip_unread_counter = 'on';")
+        execute(
+            """
+            UPDATE notification_counters
+            SET unread_count = 0, updated_at = NOW()
+            WHERE user_id = %s;
+            """,
+            [user_id],
+        )
+        execute(
+            """
+            UPDATE notifications
+            SET is_read = TRUE
+            WHERE recipient_id = %s AND is_read = FALSE;
+            """,
+            [user_id],
+        )
+
+
+# ---- DIGESTS ----
+def claim_digest_recipients(after_id: str | None, limit: int) -> list[dict]:
+    """
+    Users whose digest window has passed and who have undigested unread rows.
+    Rows stay locked until the caller's transaction ends (parallel schedulers skip them).
+    """
+    return fetch_all(
+        """
+        SELECT u.id, u.email, u.full_name, u.notify_digest
+        FROM users u
+        WHERE u.notify_digest <> 'OFF'
+          AND u.notify_email = TRUE
+          AND u.is_active = TRUE
+          AND (%s::uuid IS NULL OR u.id > %s::uuid)
+          AND (
+                u.digest_last_sent_at IS NULL
+                OR u.digest_last_sent_at <= NOW() - CASE u.notify_digest
+                                                      WHEN 'HOURLY' THEN INTERVAL '1 hour'
+                                                      ELSE INTERVAL '1 day'
+                                                    END
+          )
+          AND EXISTS (
+                SELECT 1
+                FROM notifications n
+                WHERE n.recipient_id = u.id
+                  AND n.is_read = FALSE
+                  AND n.digested_at IS NULL
+          )
+        ORDER BY u.id
+        LIMIT %s
+        FOR UPDATE OF u SKIP LOCKED;
+        """,
+        [after_id, after_id, limit],
+    )
+
+def list_digest_items(recipient_ids: list[str], cutoff, per_user: int) -> list[dict]:
+    """
+    One query for the whole batch: newest `per_user` rows per recipient + total per recipient.
+    """
+    return fetch_all(
+        """
+        SELECT recipient_id, id, type, message, created_at, task_title, total
+        FROM (
+            SELECT
+                n.recipient_id, n.id, n.type, n.message, n.created_at,
+                t.title AS task_title,
+                ROW_NUMBER() OVER (PARTITION BY n.recipient_id ORDER BY n.created_at DESC) AS rn,
+                COUNT(*) OVER (PARTITION BY n.recipient_id) AS total
+            FROM notifications n
+            LEFT JOIN tasks t ON t.id = n.task_id
+            WHERE n.recipient_id = ANY(%s::uuid[])
+              AND n.is_read = FALSE
+              AND n.digested_at IS NULL
+              AND n.created_at <= %s
+        ) x
+        WHERE rn <= %s
+        ORDER BY recipient_id, created_at DESC;
+        """,
+        [recipient_ids, cutoff, per_user],
+    )
+
+def mark_digested(recipient_ids: list[str], cutoff) -> None:
+    execute(
         """
         UPDATE notifications
-        SET is_read = TRUE
-        WHERE recipient_id = %s AND is_read = FALSE
-        RETURNING 1;
+        SET digested_at = NOW()
+        WHERE recipient_id = ANY(%s::uuid[])
+          AND is_read = FALSE
+          AND digested_at IS NULL
+          AND created_at <= %s;
         """,
-        [user_id],
-    )
\ No newline at end of file
+        [recipient_ids, cutoff],
+    )
+    execute(
+        "UPDATE users SET digest_last_sent_at = NOW() WHERE id = ANY(%s::uuid[]);",
+        [recipient_ids],
+    )
+
+
+def archive_read_notifications(cutoff, limit: int) -> int:
+    """
+    Move up to `limit` read notifications created before `cutoff` into notifications_archive.
+    """
+    return execute(
+        """
+        WITH victims AS (
+            SELECT id
+            FROM notifications
+            WHERE is_read = TRUE
+              AND created_at < %s
+            ORDER BY created_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ),
+        moved AS (
+            DELETE FROM notifications n
+            USING victims v
+            WHERE n.id = v.id
+            RETURNING n.id, n.recipient_id, n.task_id, n.type, n.message, n.is_read,
+                      n.created_at, n.actor_id, n.digested_at
+        )
+        INSERT INTO notifications_archive
+            (id, recipient_id, task_id, type, message, is_read, created_at, actor_id, digested_at)
+        SELECT id, recipient_id, task_id, type, message, is_read, created_at, actor_id, digested_at
+        FROM moved
+        ON CONFLICT (id) DO NOTHING;
+        """,
+        [cutoff, limit],
+    )
+
+def vacuum_notifications() -> None:
+    # not allowed inside a transaction block: call only in autocommit mode
+    execute("VACUUM (ANALYZE) notifications;")
+
+def notification_storage() -> list[dict]:
+    return fetch_all(
+        """
+        SELECT
+            c.relname AS table_name,
+            pg_total_relation_size(c.oid) AS total_bytes,
+            pg_relation_size(c.oid) AS table_bytes,
+            pg_indexes_size(c.oid) AS index_bytes,
+            COALESCE(s.n_live_tup, 0) AS live_rows,
+            COALESCE(s.n_dead_tup, 0) AS dead_rows
+        FROM pg_class c
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        WHERE c.oid IN ('notifications'::regclass, to_regclass('notifications_archive'))
+        ORDER BY c.relname;
+        """
+    )
@@ -1,5 +1,11 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
 from backend.utils.db import fetch_one, fetch_all, callproc
 
+NOTIFY_PREFS_KEY = "notify_prefs:{}"
+
 def list_tasks_for_user(user_id: str) -> list[dict]:
     return fetch_all("SELECT * FROM fn_get_tasks_for_user(%s);", [user_id])
 
@@ -65,14 +71,24 @@ def get_admin_ids():
 
 
 def get_user_notify_prefs(user_id: str) -> dict | None:
-    return fetch_one(
-        """
-        SELECT notify_email, notify_inapp
-        FROM users
-        WHERE id = %s;
-        """,
-        [user_id],
-    )
+    """
+    Cached (NOTIFY_PREFS_CACHE_SECONDS); call invalidate_notify_prefs() after changing
+    notify_email / notify_inapp / role / is_active.
+    """
+    key = NOTIFY_PREFS_KEY.format(user_id)
+    row = cache.get(key)
+    if row is None:
+        # {} = no such user, cached too
+        row = fetch_one(
+            """
+            SELECT notify_email, notify_inapp, role, is_active
+            FROM users
+            WHERE id = %s;
+            """,
+            [user_id],
+        ) or {}
+        cache.set(key, row, settings.NOTIFY_PREFS_CACHE_SECONDS)
+    return row or None
 
 
 def should_notify_inapp(user_id: str) -> bool:
@@ -82,12 +98,10 @@ def should_notify_inapp(user_id: str) -> bool:
     return bool(row.get("notify_inapp"))
 
 
-def get_admin_ids_inapp_enabled():
-    rows = fetch_all(
-        """
-        SELECT id
-        FROM users
-        WHERE role = 'ADMIN' AND notify_inapp = TRUE;
-        """
-    )
-    return [str(r["id"]) for r in rows]
\ No newline at end of file
+def invalidate_notify_prefs(user_id: str) -> None:
+    """
+    Drop the cached prefs of user_id. Runs after commit, so a concurrent request
+    cannot re-cache the old row in between.
+    """
+    key = NOTIFY_PREFS_KEY.format(user_id)
+    transaction.on_commit(lambda: cache.delete(key))
\ No newline at end of file
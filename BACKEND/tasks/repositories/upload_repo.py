@@ -0,0 +1,126 @@
+from backend.utils.db import fetch_one, fetch_all, execute
+
+
+def create_upload_session(
+    user_id: str,
+    original_name: str,
+    content_type: str,
+    size_bytes: int,
+    sha256: str,
+    expires_at,
+) -> dict:
+    return fetch_one(
+        """
+        INSERT INTO upload_sessions(user_id, original_name, content_type, size_bytes, sha256, expires_at)
+        VALUES (%s,%s,%s,%s,%s,%s)
+        RETURNING id, original_name, content_type, size_bytes, received_bytes, status, expires_at;
+        """,
+        [user_id, original_name, content_type, size_bytes, sha256, expires_at],
+    )
+
+
+def get_upload_session(upload_id: str) -> dict | None:
+    return fetch_one(
+        """
+        SELECT
+          id, user_id, original_name, content_type, size_bytes, sha256,
+          received_bytes, status, attachment_id, created_at, expires_at
+        FROM upload_sessions
+        WHERE id = %s;
+        """,
+        [upload_id],
+    )
+
+
+def lock_upload_session(upload_id: str) -> dict | None:
+    """
+    get_upload_session + row lock; call inside transaction.atomic() and keep that
+    transaction short (no network / file I/O while the lock is held).
+    """
+    return fetch_one(
+        """
+        SELECT
+          id, user_id, original_name, content_type, size_bytes, sha256,
+          received_bytes, status, attachment_id, created_at, expires_at
+        FROM upload_sessions
+        WHERE id = %s
+        FOR UPDATE;
+        """,
+        [upload_id],
+    )
+
+
+def advance_upload_session(upload_id: str, expected_offset: int, chunk_len: int) -> dict | None:
+    """
+    Optimistic append: only moves forward if nobody else wrote at this offset first.
+    Returns None on a lost race / wrong offset.
+    """
+    return fetch_one(
+        """
+        UPDATE upload_sessions
+        SET received_bytes = received_bytes + %s
+        WHERE id = %s
+          AND status = 'OPEN'
+          AND received_bytes = %s
+          AND received_bytes + %s <= size_bytes
+        RETURNING received_bytes;
+        """,
+        [chunk_len, upload_id, expected_offset, chunk_len],
+    )
+
+
+def set_upload_status(upload_id: str, from_status: str, to_status: str) -> int:
+    """
+    Compare-and-swap on status (OPEN -> FINALIZING -> DONE, or back to OPEN).
+    """
+    return execute(
+        "UPDATE upload_sessions SET status = %s WHERE id = %s AND status = %s;",
+        [to_status, upload_id, from_status],
+    )
+
+
+def complete_upload_session(upload_id: str, attachment_id: str) -> int:
+    return execute(
+        """
+        UPDATE upload_sessions
+        SET status = 'DONE', attachment_id = %s
+        WHERE id = %s AND status = 'FINALIZING';
+        """,
+        [attachment_id, upload_id],
+    )
+
+
+def list_expired_upload_sessions(limit: int = 500) -> list[dict]:
+    return fetch_all(
+        """
+        SELECT id
+        FROM upload_sessions
+        WHERE status IN ('OPEN', 'FINALIZING') AND expires_at < NOW()
+        ORDER BY expires_at
+        LIMIT %s;
+        """,
+        [limit],
+    )
+
+
+def delete_upload_sessions(upload_ids: list[str]) -> int:
+    if not upload_ids:
+        return 0
+    return execute(
+        "DELETE FROM upload_sessions WHERE id = ANY(%s::uuid[]);",
+        [upload_ids],
+    )
+
+
+def reset_upload_session(upload_id: str) -> None:
+    """
+    Checksum mismatch: back to an empty OPEN session (called while FINALIZING).
+    """
+    execute(
+        """
+        UPDATE upload_sessions
+        SET received_bytes = 0, status = 'OPEN'
+        WHERE id = %s AND status IN ('OPEN', 'FINALIZING');
+        """,
+        [upload_id],
+    )
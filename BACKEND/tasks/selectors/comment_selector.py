@@ -1,10 +1,44 @@
+from backend.utils.cursors import encode_cursor
+from backend.utils.user_labels import get_user_labels
 from tasks.repositories.comment_repo import list_comments_for_task
 
+def _normalize(r: dict) -> dict:
+    r["id"] = str(r["id"])
+    r["task_id"] = str(r["task_id"])
+    r["user_id"] = str(r["user_id"])
+    r["is_edited"] = bool(r["is_edited"])
+    return r
+
+def _add_user_emails(rows: list[dict]) -> list[dict]:
+    labels = get_user_labels(r["user_id"] for r in rows)
+    for r in rows:
+        r["user_email"] = labels.get(r["user_id"])
+    return rows
+
 def get_comments(task_id: str) -> list[dict]:
     rows = list_comments_for_task(task_id)
     for r in rows:
-        r["id"] = str(r["id"])
-        r["task_id"] = str(r["task_id"])
-        r["user_id"] = str(r["user_id"])
-        r["is_edited"] = bool(r["is_edited"])
-    return rows
\ No newline at end of file
+        _normalize(r)
+    return _add_user_emails(rows)
+
+def get_comments_page(task_id: str, limit: int = 50, before: tuple | None = None, after: tuple | None = None) -> dict:
+    """
+    One page, oldest first in the response. Without cursors: the latest `limit` comments.
+    next_before -> older page, next_after -> newer comments; has_more is about the
+    direction that was asked for (older by default, newer with only `after`).
+    """
+    rows = list_comments_for_task(task_id, limit=limit + 1, before=before, after=after)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not (after and not before):
+        rows.reverse()
+    for r in rows:
+        _normalize(r)
+    _add_user_emails(rows)
+
+    return {
+        "comments": rows,
+        "next_before": encode_cursor(rows[0]["created_at"], rows[0]["id"]) if rows else None,
+        "next_after": encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if rows else (encode_cursor(*after) if after else None),
+        "has_more": has_more,
+    }
@@ -1,16 +1,63 @@
-from tasks.repositories.notification_repo import list_notifications_for_user, count_unread
+from backend.utils.cursors import encode_cursor
+from backend.utils.user_labels import get_user_labels
+from tasks.repositories.notification_repo import list_notifications_for_user, get_notification_for_user, count_unread
 
-def get_notifications(user_id: str, unread_only: bool = False, limit: int = 20) -> list[dict]:
-    rows = list_notifications_for_user(user_id=user_id, unread_only=unread_only, limit=limit)
+def _normalize(r: dict) -> dict:
+    r["id"] = str(r["id"])
+    r["recipient_id"] = str(r["recipient_id"])
+    r["task_id"] = str(r["task_id"]) if r.get("task_id") else None
+    r["task_title"] = r.get("task_title")
+    r["is_read"] = bool(r["is_read"])
+    r["actor_id"] = str(r["actor_id"]) if r.get("actor_id") else None
+    return r
+
+def _add_actor_emails(rows: list[dict]) -> list[dict]:
+    labels = get_user_labels(r["actor_id"] for r in rows)
     for r in rows:
-        r["id"] = str(r["id"])
-        r["recipient_id"] = str(r["recipient_id"])
-        r["task_id"] = str(r["task_id"]) if r.get("task_id") else None
-        r["task_title"] = r.get("task_title")
-        r["is_read"] = bool(r["is_read"])
-        r["actor_id"] = str(r["actor_id"]) if r.get("actor_id") else None
-        r["actor_email"] = r.get("actor_email")
+        r["actor_email"] = labels.get(r["actor_id"]) if r["actor_id"] else None
     return rows
 
+def get_notifications(
+    user_id: str,
+    unread_only: bool = False,
+    limit: int = 20,
+    before: tuple | None = None,
+    after: tuple | None = None,
+) -> list[dict]:
+    rows = list_notifications_for_user(
+        user_id=user_id, unread_only=unread_only, limit=limit, before=before, after=after
+    )
+    for r in rows:
+        _normalize(r)
+    return _add_actor_emails(rows)
+
+def get_notifications_page(
+    user_id: str,
+    unread_only: bool = False,
+    limit: int = 20,
+    before: tuple | None = None,
+    after: tuple | None = None,
+) -> dict:
+    """
+    Newest first. next_before pages to older rows, next_after asks for newer ones
+    (has_more: there is more in that direction than `limit`).
+    """
+    rows = get_notifications(user_id, unread_only=unread_only, limit=limit + 1, before=before, after=after)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after and not before:
+        rows.reverse()
+
+    return {
+        "notifications": rows,
+        "next_before": encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if rows else None,
+        "next_after": encode_cursor(rows[0]["created_at"], rows[0]["id"]) if rows else (encode_cursor(*after) if after else None),
+        "has_more": has_more,
+    }
+
+def get_notification(user_id: str, notif_id: str) -> dict | None:
+    row = get_notification_for_user(user_id=user_id, notif_id=notif_id)
+    return _add_actor_emails([_normalize(row)])[0] if row else None
+
 def get_unread_count(user_id: str) -> int:
-    return count_unread(user_id)
\ No newline at end of file
+    return count_unread(user_id)
@@ -1,5 +1,7 @@
 from tasks.repositories.task_repo import list_tasks_for_user
 from tasks.repositories.attachment_repo import list_attachments_for_tasks
+from backend.utils.thumbnails import supports_thumbnail
+from adminapp.selectors.admin_selector import get_audit_logs_page
 
 def get_tasks_with_attachments(actor_id: str) -> list[dict]:
     rows = list_tasks_for_user(actor_id)
@@ -17,6 +19,7 @@ def get_tasks_with_attachments(actor_id: str) -> list[dict]:
             "size_bytes": int(a["size_bytes"]),
             "content_type": a["content_type"],
             "download_url": f"/api/attachments/{aid}/download",
+            "thumbnail_url": f"/api/attachments/{aid}/thumbnail" if supports_thumbnail(a["storage_name"]) else None,
             "created_at": a["created_at"],
         })
 
@@ -28,9 +31,22 @@ def get_tasks_with_attachments(actor_id: str) -> list[dict]:
         r["can_edit_status"] = bool(r.get("can_edit_status", False))
         r["can_edit_content"] = bool(r.get("can_edit_content", False))
         r["can_delete"] = bool(r.get("can_delete", False))
+        r["comment_count"] = int(r.get("comment_count") or 0)
 
         # ✅ new fields exist in fn_get_tasks_for_user now
         # due_date may be None or datetime; priority is text; completed_at maybe datetime
         r["attachments"] = att_map.get(r["id"], [])
 
-    return rows
\ No newline at end of file
+    return rows
+
+
+def get_task_history(task_id: str, limit: int = 50, before: tuple | None = None) -> dict:
+    """
+    Audit timeline of one task and its comments/attachments, newest first.
+    """
+    page = get_audit_logs_page(limit=limit, task_id=task_id, before=before)
+    return {
+        "history": page["logs"],
+        "next_before": page["next_before"],
+        "has_more": page["has_more"],
+    }
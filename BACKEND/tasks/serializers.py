@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from backend.utils.validators import validate_task_title, validate_task_status
+from backend.utils.validators import validate_task_title, validate_task_status, clean_filename
 
 PRIORITIES = ("LOW", "MEDIUM", "HIGH")
 
@@ -66,6 +66,37 @@ class CommentUpdateSerializer(serializers.Serializer):
             raise serializers.ValidationError("Comment cannot be empty")
         return v
 
+class CommentListSerializer(serializers.Serializer):
+    limit = serializers.IntegerField(required=False, default=50, min_value=1, max_value=200)
+    before = serializers.CharField(required=False, allow_blank=False, max_length=200)
+    after = serializers.CharField(required=False, allow_blank=False, max_length=200)
+
+
+class TaskHistorySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(required=False, default=50, min_value=1, max_value=200)
+    before = serializers.CharField(required=False, allow_blank=False, max_length=200)
+
+
 class NotificationListSerializer(serializers.Serializer):
     unread_only = serializers.BooleanField(required=False, default=False)
-    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=100)
\ No newline at end of file
+    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=100)
+    before = serializers.CharField(required=False, allow_blank=False, max_length=200)
+    after = serializers.CharField(required=False, allow_blank=False, max_length=200)
+    wait = serializers.IntegerField(required=False, default=0, min_value=0, max_value=60)
+
+
+class UploadStartSerializer(serializers.Serializer):
+    filename = serializers.CharField(required=True, allow_blank=False, max_length=255)
+    size_bytes = serializers.IntegerField(required=True, min_value=1)
+    content_type = serializers.CharField(required=False, allow_blank=True, default="")
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=True)
+
+    def validate_filename(self, value: str):
+        name = clean_filename(value)
+        if not name:
+            raise serializers.ValidationError("Invalid file name")
+        return name
+
+
+class UploadFinalizeSerializer(serializers.Serializer):
+    task_id = serializers.UUIDField(required=True)
@@ -0,0 +1,87 @@
+import time
+
+from backend.utils.files import derived_names
+from backend.utils.storage import PART_SUFFIX, get_storage
+from backend.utils.thumbnails import THUMB_SUFFIX, THUMB_FAILED_SUFFIX
+
+from tasks.repositories.attachment_repo import existing_storage_names
+
+
+def _owner_name(name: str) -> str:
+    """
+    Map derived files back to the blob they belong to:
+      report.pdf.thumb.jpg    -> report.pdf
+      report.pdf.thumb.failed -> report.pdf
+      report.pdf.part         -> report.pdf (interrupted write)
+    """
+    if name.endswith(PART_SUFFIX):
+        name = name[: -len(PART_SUFFIX)]
+    if name.endswith(THUMB_SUFFIX):
+        name = name[: -len(THUMB_SUFFIX)]
+    if name.endswith(THUMB_FAILED_SUFFIX):
+        name = name[: -len(THUMB_FAILED_SUFFIX)]
+    return name
+
+
+def collect_orphan_attachments(grace_seconds: int = 24 * 60 * 60, batch_size: int = 500, dry_run: bool = True) -> dict:
+    """
+    Reconciles attachment storage against task_attachments.
+
+    - walks storage lazily, checks DB existence in batches of `batch_size`
+    - files younger than `grace_seconds` are skipped (create_task may still be inserting the row)
+    - `.part` leftovers are always orphans once past the grace period
+    - an orphan blob takes its derived files (thumbnail, marker, `.part`) with it,
+      whatever their age: its name can be reserved again right after
+    """
+    storage = get_storage()
+    cutoff = time.time() - grace_seconds
+
+    report = {
+        "scanned": 0,
+        "skipped_recent": 0,
+        "orphans": 0,
+        "orphan_bytes": 0,
+        "deleted": 0,
+        "dry_run": dry_run,
+    }
+
+    def _flush(batch: list[tuple[str, int]]) -> None:
+        owners = {_owner_name(name) for name, _ in batch}
+        alive = existing_storage_names(list(owners))
+
+        for name, size in batch:
+            is_part = name.endswith(PART_SUFFIX)
+            if not is_part and _owner_name(name) in alive:
+                continue
+
+            report["orphans"] += 1
+            report["orphan_bytes"] += size
+
+            if not dry_run:
+                try:
+                    # derived files first: the name stays taken until the blob is gone
+                    if _owner_name(name) == name:
+                        for derived in derived_names(name):
+                            storage.delete(derived)
+                    storage.delete(name)
+                    report["deleted"] += 1
+                except Exception:
+                    pass
+
+    batch: list[tuple[str, int]] = []
+    for name, size, modified_ts in storage.iter_files():
+        report["scanned"] += 1
+
+        if modified_ts > cutoff:
+            report["skipped_recent"] += 1
+            continue
+
+        batch.append((name, size))
+        if len(batch) >= batch_size:
+            _flush(batch)
+            batch = []
+
+    if batch:
+        _flush(batch)
+
+    return report
@@ -2,10 +2,9 @@ from tasks.repositories.task_repo import (
     get_task_acl,
     get_admin_ids,
     should_notify_inapp,
-    get_admin_ids_inapp_enabled,
 )
 from tasks.repositories.comment_repo import insert_comment, get_comment, update_comment , delete_comment
-from tasks.repositories.notification_repo import create_notification
+from tasks.repositories.notification_repo import create_notification, create_notifications_for_role
 
 
 def _can_access_task(actor_id: str, actor_role: str, task_id: str) -> dict:
@@ -44,17 +43,14 @@ def add_comment(actor_id: str, actor_role: str, task_id: str, content: str) -> d
                     actor_id=actor_id,
                 )
         else:
-            admin_ids = get_admin_ids_inapp_enabled()
-            for aid in admin_ids:
-                if aid == str(actor_id):
-                    continue
-                create_notification(
-                    recipient_id=aid,
-                    task_id=task_id,
-                    ntype="COMMENT",
-                    message="User commented on a task",
-                    actor_id=actor_id,
-                )
+            # one INSERT ... SELECT for all admins (not one round trip each)
+            create_notifications_for_role(
+                role="ADMIN",
+                task_id=task_id,
+                ntype="COMMENT",
+                message="User commented on a task",
+                actor_id=actor_id,
+            )
     except Exception:
         pass
     # try:
@@ -1,8 +1,45 @@
-from tasks.repositories.notification_repo import mark_notification_read, mark_all_read
-from tasks.selectors.notification_selector import get_unread_count, get_notifications
+from datetime import timedelta
 
-def list_my_notifications(user_id: str, unread_only: bool = False, limit: int = 20):
-    return get_notifications(user_id=user_id, unread_only=unread_only, limit=limit)
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend.utils.outbox import enqueue_emails
+from tasks.repositories.notification_repo import (
+    mark_notification_read,
+    mark_all_read,
+    claim_digest_recipients,
+    list_digest_items,
+    mark_digested,
+    listen_for_new_notifications,
+    archive_read_notifications,
+    vacuum_notifications,
+    notification_storage,
+)
+from tasks.selectors.notification_selector import get_unread_count, get_notifications_page
+
+def list_my_notifications(
+    user_id: str,
+    unread_only: bool = False,
+    limit: int = 20,
+    before: tuple | None = None,
+    after: tuple | None = None,
+    wait: int = 0,
+) -> dict:
+    """
+    wait > 0 together with `after` = long-poll: if nothing newer than `after` exists yet,
+    hold the request (max NOTIFICATIONS_LONG_POLL_MAX_SECONDS) until a notification arrives.
+    """
+    kwargs = dict(user_id=user_id, unread_only=unread_only, limit=limit, before=before, after=after)
+    if not (wait and after) or before:
+        return get_notifications_page(**kwargs)
+
+    wait = min(wait, settings.NOTIFICATIONS_LONG_POLL_MAX_SECONDS)
+    with listen_for_new_notifications(user_id) as wait_for_new:
+        page = get_notifications_page(**kwargs)
+        if not page["notifications"] and wait_for_new(wait):
+            page = get_notifications_page(**kwargs)
+    return page
 
 def unread_count(user_id: str) -> int:
     return get_unread_count(user_id)
@@ -11,4 +48,116 @@ def read_notification(user_id: str, notif_id: str) -> None:
     mark_notification_read(user_id=user_id, notif_id=notif_id)
 
 def read_all(user_id: str) -> None:
-    mark_all_read(user_id=user_id)
\ No newline at end of file
+    mark_all_read(user_id=user_id)
+
+
+def send_notification_digests(batch_size: int | None = None) -> dict:
+    """
+    One summary email per due recipient (users.notify_digest = HOURLY/DAILY).
+    Per batch: 1 claim query, 1 items query, 1 outbox insert, 2 updates, one transaction.
+    """
+    batch_size = batch_size or settings.DIGEST_BATCH_SIZE
+    users = 0
+    items_total = 0
+    after_id = None
+
+    while True:
+        with transaction.atomic():
+            recipients = claim_digest_recipients(after_id=after_id, limit=batch_size)
+            if not recipients:
+                break
+
+            ids = [str(r["id"]) for r in recipients]
+            cutoff = timezone.now()
+
+            by_user: dict[str, list[dict]] = {}
+            totals: dict[str, int] = {}
+            for row in list_digest_items(ids, cutoff, settings.DIGEST_MAX_ITEMS):
+                rid = str(row["recipient_id"])
+                by_user.setdefault(rid, []).append(
+                    {
+                        "type": row["type"],
+                        "message": row["message"],
+                        "task_title": row["task_title"],
+                        "created_at": row["created_at"].isoformat(),
+                    }
+                )
+                totals[rid] = int(row["total"])
+
+            emails = []
+            for r in recipients:
+                rid = str(r["id"])
+                if not by_user.get(rid):
+                    continue
+                emails.append(
+                    (
+                        "DIGEST",
+                        r["email"],
+                        {
+                            "full_name": r["full_name"] or "",
+                            "period": r["notify_digest"],
+                            "items": by_user[rid],
+                            "total": totals[rid],
+                        },
+                    )
+                )
+                items_total += totals[rid]
+
+            enqueue_emails(emails)
+            mark_digested(ids, cutoff)
+            users += len(emails)
+
+        after_id = ids[-1]
+        if len(recipients) < batch_size:
+            break
+
+    return {"users": users, "notifications": items_total}
+
+
+def get_notification_storage() -> dict:
+    """
+    {table_name: {total_bytes, table_bytes, index_bytes, live_rows, dead_rows}}
+    """
+    return {
+        r["table_name"]: {k: int(v) for k, v in r.items() if k != "table_name"}
+        for r in notification_storage()
+    }
+
+
+def archive_old_notifications(
+    days: int | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    vacuum: bool = True,
+) -> dict:
+    """
+    Move read notifications older than `days` to notifications_archive, one short
+    transaction per batch (unread rows are never archived, the counters stay exact).
+    """
+    days = settings.NOTIFICATION_RETENTION_DAYS if days is None else days
+    batch_size = batch_size or settings.NOTIFICATION_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=days)
+
+    before = get_notification_storage()
+    archived = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            moved = archive_read_notifications(cutoff=cutoff, limit=batch_size)
+        batches += 1
+        archived += moved
+        if moved < batch_size:
+            break
+
+    # dead tuples -> reusable space, fresh stats for the "after" numbers
+    if vacuum and archived:
+        vacuum_notifications()
+
+    return {
+        "cutoff": cutoff.isoformat(),
+        "archived": archived,
+        "batches": batches,
+        "before": before,
+        "after": get_notification_storage(),
+    }
@@ -1,8 +1,12 @@
 import os
 from django.conf import settings
+from django.db import transaction
 
-from backend.utils.files import save_task_attachment
-from backend.utils.mailer import send_task_assigned_email
+from backend.utils.files import save_task_attachments
+from backend.utils.storage import get_storage
+from backend.utils.security import verify_attachment_link
+from backend.utils.outbox import enqueue_email
+from backend.utils.thumbnails import queue_thumbnail, supports_thumbnail, thumbnail_name, thumbnail_failed
 
 from tasks.repositories.task_repo import (
     create_task_returning_id,
@@ -13,21 +17,25 @@ from tasks.repositories.task_repo import (
     delete_task as repo_delete_task,
     get_admin_ids,
     should_notify_inapp,
-    get_admin_ids_inapp_enabled,
 )
 
-from tasks.repositories.attachment_repo import insert_attachment, get_attachment_with_owner
-from tasks.repositories.notification_repo import create_notification
+from tasks.repositories.attachment_repo import (
+    insert_attachments,
+    get_attachment_with_owner,
+    list_attachments_for_tasks,
+)
+from tasks.repositories.notification_repo import create_notification, create_notifications_for_role
 
 MAX_FILE_BYTES = 10 * 1024 * 1024
 
-ALLOWED_EXTS = {".pdf", ".docx", ".png", ".jpg", ".jpeg"}
+ALLOWED_EXTS = {".pdf", ".docx", ".png", ".jpg", ".jpeg", ".webp"}
 
 ALLOWED_CONTENT_TYPES = {
     "application/pdf",
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document",  # docx
     "image/png",
     "image/jpeg",
+    "image/webp",
 }
 
 # def _validate_pdf(uploaded_file):
@@ -76,49 +84,86 @@ def create_task(actor_id: str, actor_role: str, data: dict, uploaded_files=None)
     for f in uploaded_files:
         _validate_attachment(f)
 
-    row = create_task_returning_id(
-        actor_id=actor_id,
-        title=title,
-        description=description,
-        status=status,
-        owner_id=owner_id,
-        due_date=due_date,
-        priority=priority,
-    )
-    task_id = str(row["id"])
-
     # determine final owner (for non-admin it is actor)
     final_owner_id = owner_id if actor_role == "ADMIN" else actor_id
     owner_row = get_user_email(final_owner_id)
 
     attachment_ids: list[str] = []
-    saved_for_email: list[dict] = []  # [{"path":..., "name":..., "content_type":...}]
-
-    # ✅ Save each file + insert DB record
-    for f in uploaded_files:
-        saved_path, storage_name, size_bytes = save_task_attachment(
-            f,
-            preferred_name=f.name,  # ✅ filename based on task title
+    saved_for_email: list[dict] = []  # [{"attachment_id":..., "storage_name":..., "name":..., ...}]
+
+    # ✅ Save all files concurrently (outside the transaction; gc_attachments reclaims them on rollback)
+    saved = save_task_attachments(uploaded_files)
+
+    items = [
+        {
+            "original_name": f.name,
+            "storage_name": storage_name,
+            "content_type": getattr(f, "content_type", "application/octet-stream"),
+            "size_bytes": size_bytes,
+        }
+        for f, (_, storage_name, size_bytes) in zip(uploaded_files, saved)
+    ]
+
+    with transaction.atomic():
+        row = create_task_returning_id(
+            actor_id=actor_id,
+            title=title,
+            description=description,
+            status=status,
+            owner_id=owner_id,
+            due_date=due_date,
+            priority=priority,
         )
+        task_id = str(row["id"])
+
+        # ✅ insert all attachment rows in one statement
+        rows = insert_attachments(task_id=task_id, uploaded_by=actor_id, items=items)
+        id_by_storage_name = {r["storage_name"]: str(r["id"]) for r in rows}
+
+        for it in items:
+            attachment_ids.append(id_by_storage_name[it["storage_name"]])
+            saved_for_email.append(
+                {
+                    "attachment_id": id_by_storage_name[it["storage_name"]],
+                    "storage_name": it["storage_name"],
+                    "name": it["original_name"],
+                    "content_type": it["content_type"],
+                    "size_bytes": int(it["size_bytes"]),
+                }
+            )
 
-        att = insert_attachment(
-            task_id=task_id,
-            original_name=f.name,
-            storage_name=storage_name,
-            content_type=getattr(f, "content_type", "application/octet-stream"),
-            size_bytes=size_bytes,
-            uploaded_by=actor_id,
-        )
-        attachment_ids.append(str(att["id"]))
+        # ✅ Email with attachments (protect size) -> email_outbox, committed with the task
+        if owner_row and owner_row.get("email"):
+            # "links" mode: large files become signed links, nothing to cap
+            limited = saved_for_email
+
+            if settings.EMAIL_ATTACHMENT_MODE != "links":
+                # Gmail limit ~25MB total. Keep safe at 20MB.
+                MAX_EMAIL_ATTACH_BYTES = 20 * 1024 * 1024
+
+                total = 0
+                limited = []
+                for a in saved_for_email:
+                    sz = int(a.get("size_bytes") or 0)
+                    if total + sz > MAX_EMAIL_ATTACH_BYTES:
+                        break
+                    limited.append(a)
+                    total += sz
+
+            enqueue_email(
+                "TASK_ASSIGNED",
+                owner_row["email"],
+                {
+                    "task_title": title,
+                    "task_desc": description,
+                    "task_status": status,
+                    "attachments": limited,     # ✅ all attachments (size-limited)
+                },
+            )
 
-        saved_for_email.append(
-            {
-                "path": saved_path,
-                "name": f.name,
-                "content_type": getattr(f, "content_type", "application/octet-stream"),
-                "size_bytes": int(size_bytes),
-            }
-        )
+    # 🖼️ preview generation runs in the background process pool
+    for it in items:
+        queue_thumbnail(it["storage_name"])
 
     # 🔔 notification
     # try:
@@ -144,33 +189,6 @@ def create_task(actor_id: str, actor_role: str, data: dict, uploaded_files=None)
             )
     except Exception:
         pass
-    
-
-    # ✅ Email with attachments (protect size)
-    if owner_row and owner_row.get("email"):
-        try:
-            # Gmail limit ~25MB total. Keep safe at 20MB.
-            MAX_EMAIL_ATTACH_BYTES = 20 * 1024 * 1024
-
-            total = 0
-            limited = []
-            for a in saved_for_email:
-                sz = int(a.get("size_bytes") or 0)
-                if total + sz > MAX_EMAIL_ATTACH_BYTES:
-                    break
-                limited.append(a)
-                total += sz
-
-            send_task_assigned_email(
-                to_email=owner_row["email"],
-                task_title=title,
-                task_desc=description,
-                task_status=status,
-                pdf_path=None,              # not needed anymore
-                attachments=limited,        # ✅ all attachments (size-limited)
-            )
-        except Exception:
-            pass
 
     return {
         "task_id": task_id,
@@ -223,17 +241,14 @@ def update_task(actor_id: str, actor_role: str, task_id: str, data: dict) -> Non
                     )
             else:
                 # User changed -> notify only admins who enabled in-app notifications
-                admin_ids = get_admin_ids_inapp_enabled()
-                for aid in admin_ids:
-                    if aid == str(actor_id):
-                        continue
-                    create_notification(
-                        recipient_id=aid,
-                        task_id=task_id,
-                        ntype="STATUS",
-                        message=f"User changed task status: {before_status} -> {status}",
-                        actor_id=actor_id,
-                    )
+                # one INSERT ... SELECT for all admins (not one round trip each)
+                create_notifications_for_role(
+                    role="ADMIN",
+                    task_id=task_id,
+                    ntype="STATUS",
+                    message=f"User changed task status: {before_status} -> {status}",
+                    actor_id=actor_id,
+                )
         except Exception:
             pass
 
@@ -319,6 +334,9 @@ def delete_task(actor_id: str, task_id: str) -> None:
 
 
 def get_download_file(attachment_id: str, actor_id: str, actor_role: str):
+    """
+    Returns (row, storage_name); bytes are read through get_storage().
+    """
     row = get_attachment_with_owner(attachment_id)
     if not row:
         raise LookupError("Attachment not found")
@@ -326,8 +344,73 @@ def get_download_file(attachment_id: str, actor_id: str, actor_role: str):
     if actor_role != "ADMIN" and str(row["owner_id"]) != str(actor_id):
         raise PermissionError("Forbidden")
 
-    abs_path = os.path.join(settings.MEDIA_ROOT, "task_attachments", row["storage_name"])
-    if not os.path.exists(abs_path):
+    if not get_storage().exists(row["storage_name"]):
+        raise FileNotFoundError("File missing on server")
+
+    return row, row["storage_name"]
+
+
+def get_download_file_signed(attachment_id: str, sig: str):
+    """
+    Download through a signed link from an assignment email (no session).
+    """
+    if not verify_attachment_link(sig, attachment_id, settings.EMAIL_LINK_HOURS * 3600):
+        raise PermissionError("Link expired or invalid")
+
+    row = get_attachment_with_owner(attachment_id)
+    if not row:
+        raise LookupError("Attachment not found")
+
+    if not get_storage().exists(row["storage_name"]):
         raise FileNotFoundError("File missing on server")
 
-    return row, abs_path
+    return row, row["storage_name"]
+
+
+def get_thumbnail_file(attachment_id: str, actor_id: str, actor_role: str):
+    row, storage_name = get_download_file(attachment_id, actor_id, actor_role)
+
+    if not supports_thumbnail(storage_name):
+        raise LookupError("No preview for this file type")
+
+    thumb_name = thumbnail_name(storage_name)
+    if not get_storage().exists(thumb_name):
+        if thumbnail_failed(storage_name):
+            raise LookupError("No preview for this file")
+        # not generated yet (or lost) -> queue again, client can retry
+        queue_thumbnail(storage_name)
+        raise FileNotFoundError("Preview not ready")
+
+    return row, thumb_name
+
+
+def get_task_zip_entries(task_id: str, actor_id: str, actor_role: str) -> tuple[dict, list[dict]]:
+    """
+    Same ACL as get_download_file: admin, or owner of the task.
+    Returns (task, [{"name":..., "size":..., "chunks":..., "modified":...}, ...])
+    """
+    task = get_task_basic(task_id)
+    if not task:
+        raise LookupError("Task not found")
+
+    if actor_role != "ADMIN" and str(task["owner_id"]) != str(actor_id):
+        raise PermissionError("Forbidden")
+
+    storage = get_storage()
+    entries = []
+    for a in list_attachments_for_tasks([task_id]):
+        if not storage.exists(a["storage_name"]):
+            continue
+        entries.append(
+            {
+                "name": a["original_name"],
+                "size": int(a["size_bytes"]),
+                "chunks": storage.stream(a["storage_name"]),  # lazy generator
+                "modified": a["created_at"],
+            }
+        )
+
+    if not entries:
+        raise FileNotFoundError("No attachments on this task")
+
+    return task, entries
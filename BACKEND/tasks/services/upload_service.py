@@ -0,0 +1,287 @@
+import glob
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend.utils.files import save_task_attachment_chunks
+from backend.utils.thumbnails import queue_thumbnail
+from backend.utils.validators import clean_filename
+
+from tasks.repositories.task_repo import get_task_acl
+from tasks.repositories.attachment_repo import insert_attachment, get_attachment_with_owner
+from tasks.repositories.upload_repo import (
+    create_upload_session,
+    get_upload_session,
+    lock_upload_session,
+    set_upload_status,
+    advance_upload_session,
+    complete_upload_session,
+    reset_upload_session,
+    list_expired_upload_sessions,
+    delete_upload_sessions,
+)
+from tasks.services.task_service import ALLOWED_EXTS, ALLOWED_CONTENT_TYPES
+
+READ_SIZE = 64 * 1024
+
+
+def _tmp_path(upload_id: str) -> str:
+    return os.path.join(settings.UPLOAD_TMP_DIR, f"{upload_id}.part")
+
+
+def _chunk_path(upload_id: str) -> str:
+    # one per PUT request, spliced into _tmp_path only after the offset is claimed
+    return os.path.join(settings.UPLOAD_TMP_DIR, f"{upload_id}.{uuid.uuid4().hex}.chunk")
+
+
+def _iter_file(path: str):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _session_state(s: dict) -> dict:
+    return {
+        "upload_id": str(s["id"]),
+        "original_name": s["original_name"],
+        "content_type": s["content_type"],
+        "size_bytes": int(s["size_bytes"]),
+        "received_bytes": int(s["received_bytes"]),
+        "status": s["status"],
+        "expires_at": s["expires_at"],
+        "chunk_max_bytes": settings.UPLOAD_CHUNK_MAX_BYTES,
+    }
+
+
+def _get_own_session(actor_id: str, upload_id: str, lock: bool = False) -> dict:
+    s = lock_upload_session(upload_id) if lock else get_upload_session(upload_id)
+    if not s:
+        raise LookupError("Upload not found")
+    if str(s["user_id"]) != str(actor_id):
+        raise PermissionError("Forbidden")
+    return s
+
+
+def _require_open(s: dict) -> None:
+    if s["status"] != "OPEN":
+        raise ValueError("Upload already finalized")
+    if s["expires_at"] <= timezone.now():
+        raise ValueError("Upload session expired")
+
+
+def start_upload(actor_id: str, data: dict) -> dict:
+    name = clean_filename(data["filename"])
+    if not name:
+        raise ValueError("Invalid file name")
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in ALLOWED_EXTS:
+        raise ValueError("Allowed files: PDF, DOCX, PNG, JPG/JPEG, WEBP")
+
+    ctype = data.get("content_type") or "application/octet-stream"
+    if data.get("content_type") and ctype not in ALLOWED_CONTENT_TYPES:
+        raise ValueError("Unsupported file type")
+
+    size_bytes = int(data["size_bytes"])
+    if size_bytes > settings.UPLOAD_MAX_BYTES:
+        raise ValueError(f"File too large (max {settings.UPLOAD_MAX_BYTES // (1024 * 1024)}MB).")
+
+    expires_at = timezone.now() + timedelta(hours=settings.UPLOAD_SESSION_HOURS)
+    s = create_upload_session(
+        user_id=actor_id,
+        original_name=name,
+        content_type=ctype,
+        size_bytes=size_bytes,
+        sha256=data["sha256"].lower(),
+        expires_at=expires_at,
+    )
+
+    os.makedirs(settings.UPLOAD_TMP_DIR, exist_ok=True)
+    open(_tmp_path(str(s["id"])), "wb").close()
+
+    return _session_state(s)
+
+
+def get_upload(actor_id: str, upload_id: str) -> dict:
+    return _session_state(_get_own_session(actor_id, upload_id))
+
+
+def put_chunk(actor_id: str, upload_id: str, offset: int, stream) -> dict:
+    """
+    Writes one chunk at `offset`. Offsets must be contiguous:
+    a client that lost track asks GET /api/uploads/<id> and resumes from received_bytes.
+    Raises FileExistsError on offset mismatch (another request got there first).
+
+    No lock is held while the body arrives: the chunk goes to its own part file, is
+    claimed with the advance_upload_session compare-and-swap, and only the winner
+    copies it into the upload file. A loser never touches the upload file.
+    """
+    s = _get_own_session(actor_id, upload_id)
+    _require_open(s)
+
+    if offset != int(s["received_bytes"]):
+        raise FileExistsError("Offset mismatch")
+
+    path = _tmp_path(upload_id)
+    if not os.path.exists(path):
+        raise FileNotFoundError("Upload data missing on server")
+
+    limit = settings.UPLOAD_CHUNK_MAX_BYTES
+    remaining = int(s["size_bytes"]) - offset
+    written = 0
+
+    part = _chunk_path(upload_id)
+    try:
+        with open(part, "wb") as f:
+            while True:
+                data = stream.read(READ_SIZE) if stream else b""
+                if not data:
+                    break
+                written += len(data)
+                if written > limit:
+                    raise ValueError(f"Chunk too large (max {limit} bytes).")
+                if written > remaining:
+                    raise ValueError("Chunk goes past declared file size")
+                f.write(data)
+
+        if not written:
+            raise ValueError("Empty chunk")
+
+        row = advance_upload_session(upload_id, offset, written)
+        if not row:
+            raise FileExistsError("Offset mismatch")
+
+        # the range [offset, offset + written) is ours now
+        with open(path, "r+b") as dst:
+            dst.seek(offset)
+            for chunk in _iter_file(part):
+                dst.write(chunk)
+    finally:
+        try:
+            os.remove(part)
+        except FileNotFoundError:
+            pass
+
+    s["received_bytes"] = row["received_bytes"]
+    return _session_state(s)
+
+
+def _finalized(s: dict, task_id: str) -> dict:
+    att = get_attachment_with_owner(str(s["attachment_id"]))
+    return {
+        "attachment_id": str(s["attachment_id"]),
+        "task_id": str(att["task_id"]) if att else task_id,
+    }
+
+
+def finalize_upload(actor_id: str, actor_role: str, upload_id: str, task_id: str) -> dict:
+    """
+    Idempotent and with short transactions only:
+      1. lock the row, check it, OPEN -> FINALIZING (commit)
+      2. verify sha256 and store the blob, no transaction open
+      3. insert the attachment + FINALIZING -> DONE in one transaction
+    A retry while 1-3 run gets FileExistsError (409); a retry after DONE returns the
+    same attachment_id. If storing fails the session goes back to OPEN.
+    """
+    acl = get_task_acl(task_id)
+    if not acl:
+        raise LookupError("Task not found")
+    if actor_role != "ADMIN" and str(acl["owner_id"]) != str(actor_id):
+        raise PermissionError("Forbidden")
+
+    path = _tmp_path(upload_id)
+
+    with transaction.atomic():
+        s = _get_own_session(actor_id, upload_id, lock=True)
+        if s["status"] == "DONE" and s["attachment_id"]:
+            return _finalized(s, task_id)
+        if s["status"] == "FINALIZING":
+            raise FileExistsError("Upload is being finalized")
+        _require_open(s)
+
+        if int(s["received_bytes"]) != int(s["size_bytes"]):
+            raise ValueError("Upload incomplete")
+
+        if not os.path.exists(path):
+            raise FileNotFoundError("Upload data missing on server")
+        if os.path.getsize(path) != int(s["size_bytes"]):
+            # last chunk claimed but still being copied in by its PUT
+            raise FileExistsError("Upload still being written, retry")
+
+        set_upload_status(upload_id, "OPEN", "FINALIZING")
+
+    try:
+        digest = hashlib.sha256()
+        for chunk in _iter_file(path):
+            digest.update(chunk)
+
+        if digest.hexdigest() != s["sha256"]:
+            # corrupted somewhere on the way -> start over on the same session
+            open(path, "wb").close()
+            reset_upload_session(upload_id)
+            raise ValueError("Checksum mismatch, upload again")
+
+        _, storage_name, size_bytes = save_task_attachment_chunks(
+            s["original_name"],
+            _iter_file(path),
+            preferred_name=s["original_name"],
+        )
+    except ValueError:
+        raise
+    except Exception:
+        set_upload_status(upload_id, "FINALIZING", "OPEN")
+        raise
+
+    with transaction.atomic():
+        att = insert_attachment(
+            task_id=task_id,
+            original_name=s["original_name"],
+            storage_name=storage_name,
+            content_type=s["content_type"],
+            size_bytes=size_bytes,
+            uploaded_by=actor_id,
+        )
+        attachment_id = str(att["id"])
+        complete_upload_session(upload_id, attachment_id)
+
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+    queue_thumbnail(storage_name)
+
+    return {"attachment_id": attachment_id, "task_id": task_id}
+
+
+def purge_expired_uploads(batch_size: int = 500) -> int:
+    """
+    Drops expired OPEN / stuck FINALIZING sessions and their temp data (incl. chunk
+    part files of interrupted PUTs). Returns number of sessions removed.
+    """
+    removed = 0
+    while True:
+        rows = list_expired_upload_sessions(limit=batch_size)
+        if not rows:
+            break
+
+        ids = [str(r["id"]) for r in rows]
+        for uid in ids:
+            leftovers = [_tmp_path(uid)] + glob.glob(os.path.join(settings.UPLOAD_TMP_DIR, f"{uid}.*.chunk"))
+            for path in leftovers:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        removed += delete_upload_sessions(ids)
+        if len(rows) < batch_size:
+            break
+
+    return removed
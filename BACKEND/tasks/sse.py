@@ -0,0 +1,278 @@
+"""
+GET /api/notifications/stream  (text/event-stream, served from backend/asgi.py)
+
+One LISTEN connection per process receives pg_notify('notifications', ...) from the
+notifications trigger and fans it out to the open streams of the recipient.
+
+Events:
+  unread        {"unread_count": n}        on connect and after every change
+  notification  <same row as GET /api/notifications>
+  expired       {}                         session revoked / idle -> stream ends
+"""
+import asyncio
+import json
+from datetime import date, datetime
+from http.cookies import SimpleCookie
+
+import psycopg2
+import psycopg2.extensions
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from authapp.repositories.session_repo import get_session
+from backend.utils.decorators import COOKIE_NAME, IDLE_SECONDS
+from tasks.selectors.notification_selector import get_notification, get_unread_count
+
+CHANNEL = "notifications"
+HEARTBEAT_SECONDS = 25
+RECONNECT_SECONDS = 2
+QUEUE_SIZE = 100
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _event(name: str, data) -> bytes:
+    return f"event: {name}\ndata: {json.dumps(data, default=_json_default)}\n\n".encode()
+
+
+class NotificationHub:
+    """
+    user_id -> set of asyncio.Queue (one per open stream).
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subs: dict[str, set[asyncio.Queue]] = {}
+        self._starting: asyncio.Lock | None = None
+
+    def _connect_kwargs(self) -> dict:
+        db = settings.DATABASES["default"]
+        return {
+            "dbname": db["NAME"],
+            "user": db["USER"],
+            "password": db["PASSWORD"],
+            "host": db["HOST"],
+            "port": db["PORT"],
+        }
+
+    def _open_listen_conn(self):
+        conn = psycopg2.connect(**self._connect_kwargs())
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {CHANNEL};")
+        return conn
+
+    async def _ensure_listening(self) -> None:
+        if self._conn is not None:
+            return
+        if self._starting is None:
+            self._starting = asyncio.Lock()
+
+        async with self._starting:
+            if self._conn is not None:
+                return
+            self._loop = asyncio.get_running_loop()
+            conn = await self._loop.run_in_executor(None, self._open_listen_conn)
+            self._conn = conn
+            self._loop.add_reader(conn.fileno(), self._on_readable)
+
+    def _on_readable(self) -> None:
+        conn = self._conn
+        try:
+            conn.poll()
+        except psycopg2.Error:
+            self._drop_conn()
+            self._loop.call_later(RECONNECT_SECONDS, self._schedule_reconnect)
+            return
+
+        while conn.notifies:
+            n = conn.notifies.pop(0)
+            try:
+                payload = json.loads(n.payload)
+            except ValueError:
+                continue
+            self._publish(str(payload.get("recipient_id")), payload)
+
+    def _drop_conn(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._conn.fileno())
+        except Exception:
+            pass
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    def _schedule_reconnect(self) -> None:
+        async def _again():
+            try:
+                await self._ensure_listening()
+            except Exception:
+                self._loop.call_later(RECONNECT_SECONDS, self._schedule_reconnect)
+                return
+            # events may have been missed while disconnected
+            for user_id in list(self._subs):
+                self._publish(user_id, {"event": "resync"})
+
+        if self._subs:
+            self._loop.create_task(_again())
+
+    def _publish(self, user_id: str, payload: dict) -> None:
+        for q in list(self._subs.get(user_id, ())):
+            try:
+                q.put_nowait(payload)
+            except asyncio.QueueFull:
+                # slow client: it still gets a fresh unread count with the next event
+                pass
+
+    async def subscribe(self, user_id: str) -> asyncio.Queue:
+        await self._ensure_listening()
+        q: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subs.setdefault(user_id, set()).add(q)
+        return q
+
+    def unsubscribe(self, user_id: str, q: asyncio.Queue) -> None:
+        subs = self._subs.get(user_id)
+        if not subs:
+            return
+        subs.discard(q)
+        if not subs:
+            self._subs.pop(user_id, None)
+
+
+hub = NotificationHub()
+
+
+def _header(scope, name: bytes) -> str:
+    for k, v in scope.get("headers", []):
+        if k == name:
+            return v.decode("latin-1")
+    return ""
+
+
+def _session_id(scope) -> str | None:
+    cookie = SimpleCookie()
+    try:
+        cookie.load(_header(scope, b"cookie"))
+    except Exception:
+        return None
+    morsel = cookie.get(COOKIE_NAME)
+    return morsel.value if morsel else None
+
+
+def _live_session(sid: str | None) -> dict | None:
+    """
+    Same rules as require_auth, but never touches last_seen_at (a stream is not user activity).
+    """
+    if not sid:
+        return None
+    s = get_session(sid)
+    if not s or s.get("revoked"):
+        return None
+    if (timezone.now() - s["last_seen_at"]).total_seconds() > IDLE_SECONDS:
+        return None
+    return s
+
+
+def _cors_headers(scope) -> list[tuple[bytes, bytes]]:
+    origin = _header(scope, b"origin")
+    if origin and origin in settings.CORS_ALLOWED_ORIGINS:
+        return [
+            (b"access-control-allow-origin", origin.encode()),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+    return []
+
+
+async def _wait_disconnect(receive) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def notification_stream(scope, receive, send) -> None:
+    sid = _session_id(scope)
+    session = await sync_to_async(_live_session)(sid)
+
+    if not session:
+        body = json.dumps(
+            {"success": False, "message": "Unauthorized", "errors": {"code": "SESSION_EXPIRED"}}
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 401,
+                "headers": [(b"content-type", b"application/json")] + _cors_headers(scope),
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+        return
+
+    user_id = str(session["user_id"])
+    q = await hub.subscribe(user_id)
+    disconnect = asyncio.ensure_future(_wait_disconnect(receive))
+
+    try:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ]
+                + _cors_headers(scope),
+            }
+        )
+        unread = await sync_to_async(get_unread_count)(user_id)
+        await send({"type": "http.response.body", "body": _event("unread", {"unread_count": unread}), "more_body": True})
+
+        while True:
+            getter = asyncio.ensure_future(q.get())
+            done, _ = await asyncio.wait(
+                {getter, disconnect},
+                timeout=HEARTBEAT_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if disconnect in done:
+                getter.cancel()
+                break
+
+            if getter not in done:
+                getter.cancel()
+                if not await sync_to_async(_live_session)(sid):
+                    await send({"type": "http.response.body", "body": _event("expired", {}), "more_body": True})
+                    break
+                await send({"type": "http.response.body", "body": b": ping\n\n", "more_body": True})
+                continue
+
+            evt = getter.result()
+            chunks = []
+            if evt.get("event") == "created" and evt.get("id"):
+                row = await sync_to_async(get_notification)(user_id, str(evt["id"]))
+                if row:
+                    chunks.append(_event("notification", row))
+
+            unread = await sync_to_async(get_unread_count)(user_id)
+            chunks.append(_event("unread", {"unread_count": unread}))
+            await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+    finally:
+        hub.unsubscribe(user_id, q)
+        disconnect.cancel()
+        try:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        except Exception:
+            pass
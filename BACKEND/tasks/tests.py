@@ -1,3 +1,171 @@
-from django.test import TestCase
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from backend.utils import user_labels
+from backend.utils.cursors import decode_cursor, encode_cursor
+from backend.utils.files import _reserve_storage_name
+from backend.utils.storage import LocalStorage
+from backend.utils.user_labels import GENERATION_KEY, UserLabelCache, get_user_labels, invalidate_user_labels
+from backend.utils.validators import clean_filename
+from backend.utils.zipstream import _unique_name
+from tasks.services.attachment_gc_service import collect_orphan_attachments
+
+U1 = str(uuid.uuid4())
+U2 = str(uuid.uuid4())
+U3 = str(uuid.uuid4())
+
+
+class CleanFilenameTests(SimpleTestCase):
+    def test_path_parts_are_dropped(self):
+        self.assertEqual(clean_filename("../../x.pdf"), "x.pdf")
+        self.assertEqual(clean_filename("..\\..\\evil.pdf"), "evil.pdf")
+        self.assertEqual(clean_filename("/etc/passwd"), "passwd")
+
+    def test_quotes_and_control_characters_are_removed(self):
+        self.assertEqual(clean_filename('a"b\'\r\n\x00.pdf'), "ab.pdf")
+
+    def test_nothing_usable_left_is_empty(self):
+        for name in ["", "  ", "..", ".", "/", "a/"]:
+            with self.subTest(name=name):
+                self.assertEqual(clean_filename(name), "")
+
+
+class ZipEntryNameTests(SimpleTestCase):
+    def test_stored_names_cannot_escape_the_archive_folder(self):
+        used: set[str] = set()
+        self.assertEqual(_unique_name("../../x.pdf", used), "x.pdf")
+        self.assertEqual(_unique_name("x.pdf", used), "x(1).pdf")
+        self.assertEqual(_unique_name("..", used), "document")
+
+
+class StorageNameReuseTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.storage = LocalStorage(tmp.name)
+
+    def _touch(self, name, age=0):
+        self.storage.put(name, [b"x"])
+        if age:
+            ts = os.path.getmtime(self.storage.path(name)) - age
+            os.utime(self.storage.path(name), (ts, ts))
+
+    def test_name_with_leftover_derived_file_is_not_reused(self):
+        self._touch("report.pdf.thumb.jpg")
+        name = _reserve_storage_name(self.storage, "report.pdf", None, set())
+        self.assertEqual(name, "report(1).pdf")
+
+    def test_gc_removes_orphan_blob_with_its_derived_files(self):
+        self._touch("gone.pdf", age=3600)
+        self._touch("gone.pdf.thumb.jpg")  # recent, still goes with its blob
+        self._touch("gone.pdf.thumb.failed")
+        self._touch("kept.pdf", age=3600)
+        self._touch("kept.pdf.thumb.jpg", age=3600)
+
+        with mock.patch("tasks.services.attachment_gc_service.get_storage", return_value=self.storage), \
+                mock.patch("tasks.services.attachment_gc_service.existing_storage_names", return_value={"kept.pdf"}):
+            collect_orphan_attachments(grace_seconds=60, dry_run=False)
+
+        self.assertEqual(sorted(os.listdir(self.storage.root)), ["kept.pdf", "kept.pdf.thumb.jpg"])
+        self.assertEqual(_reserve_storage_name(self.storage, "gone.pdf", None, set()), "gone.pdf")
+
+
+def _on_commit_now(func):
+    func()
+
+
+class UserLabelCacheTests(SimpleTestCase):
+    def test_lru_evicts_least_recently_used(self):
+        c = UserLabelCache(maxsize=2, ttl_seconds=60)
+        c.set_many({U1: "a@x", U2: "b@x"}, now=0)
+        c.get_many([U1], now=1)  # U1 is now the most recent
+        c.set_many({U3: "c@x"}, now=2)
+
+        hits, missing = c.get_many([U1, U2, U3], now=3)
+        self.assertEqual(hits, {U1: "a@x", U3: "c@x"})
+        self.assertEqual(missing, [U2])
+
+    def test_entries_expire_after_ttl(self):
+        c = UserLabelCache(maxsize=10, ttl_seconds=60)
+        c.set_many({U1: "a@x"}, now=0)
+
+        self.assertEqual(c.get_many([U1], now=60), ({U1: "a@x"}, []))
+        self.assertEqual(c.get_many([U1], now=61), ({}, [U1]))
+
+    def test_unknown_ids_are_cached_as_none(self):
+        c = UserLabelCache(maxsize=10, ttl_seconds=60)
+        c.set_many({U1: None}, now=0)
+
+        self.assertEqual(c.get_many([U1], now=1), ({U1: None}, []))
+
+
+@mock.patch.object(user_labels.transaction, "on_commit", _on_commit_now)
+class GetUserLabelsTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        user_labels._labels.clear()
+        patcher = mock.patch.object(user_labels, "fetch_all")
+        self.fetch_all = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.fetch_all.side_effect = lambda sql, params: [
+            {"id": uuid.UUID(uid), "email": f"{uid[:4]}@x"} for uid in params[0] if uid != U2
+        ]
+
+    def test_misses_are_loaded_in_one_query_then_cached(self):
+        labels = get_user_labels([U1, U2, None])
+        self.assertEqual(labels, {U1: f"{U1[:4]}@x", U2: None})
+        self.assertEqual(self.fetch_all.call_count, 1)
+        self.assertCountEqual(self.fetch_all.call_args.args[1][0], [U1, U2])
+
+        # both the known and the unknown id are served from the cache now
+        self.assertEqual(get_user_labels([U1, U2]), labels)
+        self.assertEqual(self.fetch_all.call_count, 1)
+
+        get_user_labels([U1, U3])
+        self.assertEqual(self.fetch_all.call_args.args[1][0], [U3])
+
+    def test_empty_input_skips_the_query(self):
+        self.assertEqual(get_user_labels([]), {})
+        self.fetch_all.assert_not_called()
+
+    def test_invalidate_drops_cached_labels(self):
+        get_user_labels([U1])
+        invalidate_user_labels()
+        get_user_labels([U1])
+        self.assertEqual(self.fetch_all.call_count, 2)
+
+    def test_generation_bump_from_another_process_drops_cached_labels(self):
+        get_user_labels([U1])
+        cache.set(GENERATION_KEY, 41, None)  # what invalidate_user_labels does elsewhere
+        get_user_labels([U1])
+        self.assertEqual(self.fetch_all.call_count, 2)
+
+
+class CursorTests(SimpleTestCase):
+    created_at = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    def test_round_trip_uuid_id(self):
+        row_id = uuid.uuid4()
+        self.assertEqual(decode_cursor(encode_cursor(self.created_at, row_id)), (self.created_at, str(row_id)))
+
+    def test_round_trip_int_id(self):
+        decoded = decode_cursor(encode_cursor(self.created_at, 987654321))
+        self.assertEqual(decoded, (self.created_at, 987654321))
+        self.assertIsInstance(decoded[1], int)
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(self.created_at, uuid.uuid4())
+        self.assertNotIn("=", cursor)
+        self.assertRegex(cursor, r"^[A-Za-z0-9_-]+$")
+
+    def test_invalid_cursors_raise_value_error(self):
+        bad_id = encode_cursor(self.created_at, "not-a-uuid")
+        for cursor in ["", "!!!", "bm9waXBl", bad_id]:
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor)
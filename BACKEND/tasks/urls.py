@@ -3,12 +3,18 @@ from .views import (
     TaskListCreateView,
     TaskDetailView,
     TaskAttachmentDownloadView,
+    TaskAttachmentThumbnailView,
+    TaskAttachmentsZipView,
     TaskSummaryView,
     TaskCommentsView,
     CommentUpdateView,
+    TaskHistoryView,
     NotificationListView,
     NotificationReadView,
     NotificationReadAllView,
+    UploadSessionCreateView,
+    UploadSessionDetailView,
+    UploadSessionFinalizeView,
 )
 
 urlpatterns = [
@@ -18,6 +24,7 @@ urlpatterns = [
 
     # Comments
     path("tasks/<uuid:task_id>/comments", TaskCommentsView.as_view()),
+    path("tasks/<uuid:task_id>/history", TaskHistoryView.as_view()),
     path("comments/<uuid:comment_id>", CommentUpdateView.as_view()),
 
     # Notifications
@@ -27,4 +34,11 @@ urlpatterns = [
 
     # Attachments
     path("attachments/<uuid:attachment_id>/download", TaskAttachmentDownloadView.as_view()),
+    path("attachments/<uuid:attachment_id>/thumbnail", TaskAttachmentThumbnailView.as_view()),
+    path("tasks/<uuid:task_id>/attachments.zip", TaskAttachmentsZipView.as_view()),
+
+    # Resumable chunked uploads
+    path("uploads", UploadSessionCreateView.as_view()),
+    path("uploads/<uuid:upload_id>", UploadSessionDetailView.as_view()),
+    path("uploads/<uuid:upload_id>/finalize", UploadSessionFinalizeView.as_view()),
 ]
\ No newline at end of file
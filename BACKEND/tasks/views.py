@@ -1,24 +1,35 @@
-from django.http import FileResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponseRedirect
+from django.utils.text import slugify
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from backend.utils.decorators import require_auth
 from backend.utils.responses import ok, fail
+from backend.utils.zipstream import stream_zip
+from backend.utils.streaming import streaming_response
+from backend.utils.storage import get_storage
+from backend.utils.cursors import decode_cursor
+from backend.utils.validators import clean_filename
 
 from tasks.serializers import (
     TaskCreateSerializer,
     TaskUpdateSerializer,
     CommentCreateSerializer,
     CommentUpdateSerializer,
+    CommentListSerializer,
+    TaskHistorySerializer,
     NotificationListSerializer,
+    UploadStartSerializer,
+    UploadFinalizeSerializer,
 )
-from tasks.selectors.task_selector import get_tasks_with_attachments
-from tasks.selectors.comment_selector import get_comments
-from tasks.selectors.notification_selector import get_notifications
-from tasks.services.task_service import create_task, update_task, delete_task, get_download_file
+from tasks.selectors.task_selector import get_tasks_with_attachments, get_task_history
+from tasks.selectors.comment_selector import get_comments_page
+from tasks.services.task_service import create_task, update_task, delete_task, get_download_file, get_download_file_signed, get_thumbnail_file, get_task_zip_entries
 from tasks.services.comment_service import add_comment, edit_comment , remove_comment
-from tasks.services.notification_service import read_notification, read_all
-from tasks.repositories.task_repo import get_task_summary_for_user
+from tasks.services.notification_service import list_my_notifications, read_notification, read_all
+from tasks.services.upload_service import start_upload, get_upload, put_chunk, finalize_upload
+from tasks.repositories.task_repo import get_task_summary_for_user, get_task_acl
 
 
 class TaskListCreateView(APIView):
@@ -121,11 +132,21 @@ class TaskDetailView(APIView):
 
 class TaskCommentsView(APIView):
     """
-    GET  /api/tasks/<uuid:task_id>/comments
+    GET  /api/tasks/<uuid:task_id>/comments?limit=50            -> latest page
+         &before=<next_before> (older) | &after=<next_after> (newer)
     POST /api/tasks/<uuid:task_id>/comments
     """
     @require_auth(roles=["ADMIN", "A", "B"])
     def get(self, request, task_id):
+        ser = CommentListSerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+
+        try:
+            before = decode_cursor(ser.validated_data["before"]) if ser.validated_data.get("before") else None
+            after = decode_cursor(ser.validated_data["after"]) if ser.validated_data.get("after") else None
+        except ValueError as e:
+            return fail("Invalid cursor", errors={"detail": str(e)}, status=400)
+
         # Permission is enforced inside comment_service on POST,
         # but for GET we should enforce same rule: Admin OR owner only.
         actor_id = request.user_ctx["id"]
@@ -142,8 +163,8 @@ class TaskCommentsView(APIView):
             if actor_role != "ADMIN" and str(acl["owner_id"]) != str(actor_id):
                 return fail("Forbidden", status=403)
 
-            rows = get_comments(str(task_id))
-            return ok(data={"comments": rows})
+            page = get_comments_page(str(task_id), limit=ser.validated_data["limit"], before=before, after=after)
+            return ok(data=page)
         except Exception as e:
             return fail("Failed", errors={"detail": str(e)}, status=400)
 
@@ -224,9 +245,41 @@ class CommentUpdateView(APIView):
         return ok(message="Comment deleted")
 
 
+class TaskHistoryView(APIView):
+    """
+    GET /api/tasks/<uuid:task_id>/history?limit=50&before=<next_before>
+    Task + its comments and attachments from audit_log, newest first.
+    Admin: any task (also deleted ones). Others: own tasks only.
+    """
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def get(self, request, task_id):
+        ser = TaskHistorySerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+
+        actor_id = request.user_ctx["id"]
+        actor_role = request.user_ctx["role"]
+
+        if actor_role != "ADMIN":
+            acl = get_task_acl(str(task_id))
+            if not acl:
+                return fail("Task not found", status=404)
+            if str(acl["owner_id"]) != str(actor_id):
+                return fail("Forbidden", status=403)
+
+        try:
+            before = decode_cursor(ser.validated_data["before"]) if ser.validated_data.get("before") else None
+        except ValueError as e:
+            return fail("Invalid cursor", errors={"detail": str(e)}, status=400)
+
+        page = get_task_history(str(task_id), limit=ser.validated_data["limit"], before=before)
+        return ok(data=page)
+
+
 class NotificationListView(APIView):
     """
     GET /api/notifications?unread_only=true&limit=20
+        &before=<next_before>            -> older page
+        &after=<next_after>&wait=25      -> only newer rows; long-poll up to `wait` seconds
     """
     @require_auth(roles=["ADMIN", "A", "B"])
     def get(self, request):
@@ -237,8 +290,21 @@ class NotificationListView(APIView):
         unread_only = ser.validated_data.get("unread_only", False)
         limit = ser.validated_data.get("limit", 20)
 
-        rows = get_notifications(user_id=actor_id, unread_only=unread_only, limit=limit)
-        return ok(data={"notifications": rows})
+        try:
+            before = decode_cursor(ser.validated_data["before"]) if ser.validated_data.get("before") else None
+            after = decode_cursor(ser.validated_data["after"]) if ser.validated_data.get("after") else None
+        except ValueError as e:
+            return fail("Invalid cursor", errors={"detail": str(e)}, status=400)
+
+        page = list_my_notifications(
+            user_id=actor_id,
+            unread_only=unread_only,
+            limit=limit,
+            before=before,
+            after=after,
+            wait=ser.validated_data.get("wait", 0),
+        )
+        return ok(data=page)
 
 
 class NotificationReadView(APIView):
@@ -270,13 +336,34 @@ class NotificationReadAllView(APIView):
 
 
 class TaskAttachmentDownloadView(APIView):
-    @require_auth(roles=["ADMIN", "A", "B"])
+    """
+    GET /api/attachments/<uuid:attachment_id>/download            (session)
+    GET /api/attachments/<uuid:attachment_id>/download?sig=<...>  (signed link from email)
+    """
+
     def get(self, request, attachment_id):
+        sig = request.GET.get("sig")
+        if not sig:
+            return self._get_with_session(request, attachment_id)
+
+        try:
+            row, storage_name = get_download_file_signed(attachment_id=str(attachment_id), sig=sig)
+        except PermissionError as e:
+            return fail(str(e), status=403)
+        except LookupError:
+            return fail("Attachment not found", status=404)
+        except FileNotFoundError:
+            return fail("File missing on server", status=404)
+
+        return self._serve(row, storage_name)
+
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def _get_with_session(self, request, attachment_id):
         actor_id = request.user_ctx["id"]
         actor_role = request.user_ctx["role"]
 
         try:
-            row, abs_path = get_download_file(
+            row, storage_name = get_download_file(
                 attachment_id=str(attachment_id),
                 actor_id=actor_id,
                 actor_role=actor_role,
@@ -288,6 +375,188 @@ class TaskAttachmentDownloadView(APIView):
         except FileNotFoundError:
             return fail("File missing on server", status=404)
 
-        resp = FileResponse(open(abs_path, "rb"), content_type=row["content_type"])
-        resp["Content-Disposition"] = f'attachment; filename="{row["original_name"]}"'
-        return resp
\ No newline at end of file
+        return self._serve(row, storage_name)
+
+    def _serve(self, row, storage_name):
+        storage = get_storage()
+        filename = clean_filename(row["original_name"]) or storage_name
+
+        # S3: hand out a short-lived direct URL, bytes never pass through Django
+        url = storage.presign(
+            storage_name,
+            expires=settings.S3_PRESIGN_SECONDS,
+            filename=filename,
+            content_type=row["content_type"],
+        )
+        if url:
+            return HttpResponseRedirect(url)
+
+        resp = FileResponse(storage.open(storage_name), content_type=row["content_type"])
+        resp["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return resp
+
+
+class TaskAttachmentThumbnailView(APIView):
+    """
+    GET /api/attachments/<uuid:attachment_id>/thumbnail
+    """
+    # not immutable: a storage name is free again once GC removed the blob
+    CACHE_SECONDS = 24 * 60 * 60
+
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def get(self, request, attachment_id):
+        actor_id = request.user_ctx["id"]
+        actor_role = request.user_ctx["role"]
+
+        try:
+            row, thumb_name = get_thumbnail_file(
+                attachment_id=str(attachment_id),
+                actor_id=actor_id,
+                actor_role=actor_role,
+            )
+        except LookupError as e:
+            return fail(str(e), status=404)
+        except PermissionError:
+            return fail("Forbidden", status=403)
+        except FileNotFoundError as e:
+            return fail(str(e), status=404)
+
+        storage = get_storage()
+
+        url = storage.presign(thumb_name, expires=settings.S3_PRESIGN_SECONDS, content_type="image/jpeg")
+        if url:
+            return HttpResponseRedirect(url)
+
+        resp = FileResponse(storage.open(thumb_name), content_type="image/jpeg")
+        resp["Cache-Control"] = f"private, max-age={self.CACHE_SECONDS}"
+        return resp
+
+
+class TaskAttachmentsZipView(APIView):
+    """
+    GET /api/tasks/<uuid:task_id>/attachments.zip
+    """
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def get(self, request, task_id):
+        actor_id = request.user_ctx["id"]
+        actor_role = request.user_ctx["role"]
+
+        try:
+            task, entries = get_task_zip_entries(
+                task_id=str(task_id),
+                actor_id=actor_id,
+                actor_role=actor_role,
+            )
+        except LookupError:
+            return fail("Task not found", status=404)
+        except PermissionError:
+            return fail("Forbidden", status=403)
+        except FileNotFoundError as e:
+            return fail(str(e), status=404)
+
+        filename = f"{slugify(task['title']) or 'task'}-attachments.zip"
+
+        resp = streaming_response(request, stream_zip(entries), content_type="application/zip")
+        resp["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return resp
+
+
+class UploadSessionCreateView(APIView):
+    """
+    POST /api/uploads  {filename, size_bytes, content_type, sha256}
+    """
+    parser_classes = [JSONParser]
+
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def post(self, request):
+        ser = UploadStartSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+
+        try:
+            state = start_upload(actor_id=request.user_ctx["id"], data=ser.validated_data)
+        except ValueError as e:
+            return fail(str(e), status=422)
+
+        return ok(message="Upload started", status=201, data=state)
+
+
+class UploadSessionDetailView(APIView):
+    """
+    GET /api/uploads/<uuid:upload_id>                 -> current offset (resume point)
+    PUT /api/uploads/<uuid:upload_id>?offset=<bytes>  -> raw chunk body
+    """
+    parser_classes = []
+
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def get(self, request, upload_id):
+        try:
+            state = get_upload(actor_id=request.user_ctx["id"], upload_id=str(upload_id))
+        except LookupError:
+            return fail("Upload not found", status=404)
+        except PermissionError:
+            return fail("Forbidden", status=403)
+
+        return ok(data=state)
+
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def put(self, request, upload_id):
+        actor_id = request.user_ctx["id"]
+
+        raw_offset = request.headers.get("Upload-Offset") or request.GET.get("offset")
+        try:
+            offset = int(raw_offset)
+        except (TypeError, ValueError):
+            return fail("offset is required", status=422)
+
+        try:
+            state = put_chunk(
+                actor_id=actor_id,
+                upload_id=str(upload_id),
+                offset=offset,
+                stream=request.stream,
+            )
+        except LookupError:
+            return fail("Upload not found", status=404)
+        except PermissionError:
+            return fail("Forbidden", status=403)
+        except FileExistsError as e:
+            current = get_upload(actor_id=actor_id, upload_id=str(upload_id))
+            return fail(str(e), errors={"received_bytes": current["received_bytes"]}, status=409)
+        except FileNotFoundError as e:
+            return fail(str(e), status=410)
+        except ValueError as e:
+            return fail(str(e), status=422)
+
+        return ok(message="Chunk stored", data=state)
+
+
+class UploadSessionFinalizeView(APIView):
+    """
+    POST /api/uploads/<uuid:upload_id>/finalize  {task_id}
+    """
+    parser_classes = [JSONParser]
+
+    @require_auth(roles=["ADMIN", "A", "B"])
+    def post(self, request, upload_id):
+        ser = UploadFinalizeSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+
+        try:
+            result = finalize_upload(
+                actor_id=request.user_ctx["id"],
+                actor_role=request.user_ctx["role"],
+                upload_id=str(upload_id),
+                task_id=str(ser.validated_data["task_id"]),
+            )
+        except LookupError as e:
+            return fail(str(e), status=404)
+        except PermissionError:
+            return fail("Forbidden", status=403)
+        except FileExistsError as e:
+            return fail(str(e), status=409)
+        except FileNotFoundError as e:
+            return fail(str(e), status=410)
+        except ValueError as e:
+            return fail(str(e), status=422)
+
+        return ok(message="Attachment added", status=201, data=result)
@@ -13,7 +13,39 @@ export type AuditLog = {
 
 import type { ApiResp } from "./types";
 
-export async function getAuditLogs(params?: { limit?: number; action?: string; entity?: string }) {
-  const res = await api.get<ApiResp<{ logs: AuditLog[] }>>("/api/admin/audit-logs", { params });
+export type AuditLogPage = {
+  logs: AuditLog[];
+  next_before: string | null; // pass as `before` for the next (older) page
+  has_more: boolean;
+};
+
+export async function getAuditLogs(params?: {
+  limit?: number;
+  action?: string;
+  entity?: string;
+  entity_id?: string;
+  actor_id?: string;
+  date_from?: string;
+  date_to?: string;
+  before?: string;
+}) {
+  const res = await api.get<ApiResp<AuditLogPage>>("/api/admin/audit-logs", { params });
   return res.data;
 }
+
+// streamed by the server (oldest first); same filters as getAuditLogs, no paging
+export async function exportAuditLogs(params?: {
+  format?: "ndjson" | "csv";
+  action?: string;
+  entity?: string;
+  entity_id?: string;
+  actor_id?: string;
+  date_from?: string;
+  date_to?: string;
+}) {
+  const res = await api.get("/api/admin/audit-logs/export", {
+    params,
+    responseType: "blob",
+  });
+  return res.data as Blob;
+}
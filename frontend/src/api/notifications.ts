@@ -14,8 +14,21 @@ export type NotificationRow = {
   actor_email?: string | null; // ✅
 };
 
-export async function getNotifications(params?: { unread_only?: boolean; limit?: number }) {
-  const res = await api.get<ApiResp<{ notifications: NotificationRow[] }>>(
+export type NotificationPage = {
+  notifications: NotificationRow[];
+  next_before: string | null; // pass as `before` for older rows
+  next_after: string | null; // pass as `after` for newer rows
+  has_more: boolean;
+};
+
+export async function getNotifications(params?: {
+  unread_only?: boolean;
+  limit?: number;
+  before?: string;
+  after?: string;
+  wait?: number; // with `after`: long-poll up to N seconds
+}) {
+  const res = await api.get<ApiResp<NotificationPage>>(
     "/api/notifications",
     { params } // ✅ no X-USER-ACTIVE
   );
@@ -38,4 +51,32 @@ export async function markOneRead(id: string) {
     { headers: { "X-USER-ACTIVE": "1" } }
   );
   return res.data;
-}
\ No newline at end of file
+}
+// ✅ server push (SSE). Needs the backend running under ASGI (uvicorn backend.asgi:application)
+export type NotificationStreamHandlers = {
+  onNotification: (n: NotificationRow) => void;
+  onUnread: (count: number) => void;
+  onClosed: () => void; // stream unavailable / session gone -> caller falls back to polling
+};
+
+export function subscribeNotifications(handlers: NotificationStreamHandlers) {
+  const baseURL = import.meta.env.VITE_API_BASE_URL || "";
+  const es = new EventSource(`${baseURL}/api/notifications/stream`, { withCredentials: true });
+
+  es.addEventListener("notification", (e) => {
+    handlers.onNotification(JSON.parse((e as MessageEvent).data));
+  });
+  es.addEventListener("unread", (e) => {
+    handlers.onUnread(JSON.parse((e as MessageEvent).data).unread_count);
+  });
+  es.addEventListener("expired", () => {
+    es.close();
+    handlers.onClosed();
+  });
+  es.onerror = () => {
+    // network blips: EventSource reconnects by itself; non-200 responses close it for good
+    if (es.readyState === EventSource.CLOSED) handlers.onClosed();
+  };
+
+  return () => es.close();
+}
@@ -1,6 +1,8 @@
 import { api } from "./axios";
 import type { ApiResp } from "./types";
 
+export type NotifyDigest = "OFF" | "HOURLY" | "DAILY";
+
 export type Profile = {
   id: string;
   email: string;
@@ -10,6 +12,7 @@ export type Profile = {
   bio: string;
   notify_email: boolean;
   notify_inapp: boolean;
+  notify_digest: NotifyDigest;
 };
 
 export type UpdateProfileInput = {
@@ -18,6 +21,7 @@ export type UpdateProfileInput = {
   bio: string;
   notify_email: boolean;
   notify_inapp: boolean;
+  notify_digest: NotifyDigest;
 };
 
 export type ChangePasswordInput = {
@@ -1,5 +1,6 @@
 import { api } from "./axios";
 import type { ApiResp } from "./types";
+import type { AuditLog } from "./audit";
 
 export type TaskStatus = "PENDING" | "IN_PROGRESS" | "COMPLETED";
 export type TaskPriority = "HIGH" | "MEDIUM" | "LOW";
@@ -21,6 +22,7 @@ export type TaskAttachment = {
   size_bytes: number;
   content_type: string;
   download_url: string;
+  thumbnail_url?: string | null;
   created_at: string;
 };
 
@@ -41,6 +43,20 @@ export type Task = {
   can_delete: boolean;
   attachments?: TaskAttachment[];
   comments?: TaskComment[];
+  comment_count?: number;
+};
+
+export type TaskCommentPage = {
+  comments: TaskComment[]; // oldest first
+  next_before: string | null; // pass as `before` for older comments
+  next_after: string | null; // pass as `after` for newer comments
+  has_more: boolean;
+};
+
+export type TaskHistoryPage = {
+  history: AuditLog[]; // newest first: the task, its comments and attachments
+  next_before: string | null; // pass as `before` for older entries
+  has_more: boolean;
 };
 
 const activeHeaders = { "X-USER-ACTIVE": "1" };
@@ -128,10 +144,29 @@ export async function downloadAttachment(attachmentId: string) {
   return res.data as Blob;
 }
 
-export async function getTaskComments(taskId: string) {
-  const res = await api.get<ApiResp<{ comments: TaskComment[] }>>(
+// ✅ latest page by default; `before` = load older
+export async function getTaskComments(
+  taskId: string,
+  params?: { limit?: number; before?: string; after?: string }
+) {
+  const res = await api.get<ApiResp<TaskCommentPage>>(
     `/api/tasks/${taskId}/comments`,
     {
+      params,
+      headers: activeHeaders,
+    }
+  );
+  return res.data;
+}
+
+export async function getTaskHistory(
+  taskId: string,
+  params?: { limit?: number; before?: string }
+) {
+  const res = await api.get<ApiResp<TaskHistoryPage>>(
+    `/api/tasks/${taskId}/history`,
+    {
+      params,
       headers: activeHeaders,
     }
   );
@@ -13,6 +13,8 @@ export default function CommentsSection({
   currentUserRole,
   adminEmail = "admin@demo.com",
   adminIds = [],
+  hasMore = false,
+  onLoadMore,
 }: {
   comments: TaskComment[];
   onAdd: (text: string) => Promise<void> | void;
@@ -25,6 +27,10 @@ export default function CommentsSection({
 
   adminEmail?: string;
   adminIds?: string[];
+
+  // older pages (comments are loaded newest page first)
+  hasMore?: boolean;
+  onLoadMore?: () => Promise<void> | void;
 }) {
   const [text, setText] = useState("");
   const [submitting, setSubmitting] = useState(false);
@@ -32,6 +38,17 @@ export default function CommentsSection({
   const [editingId, setEditingId] = useState<string | null>(null);
   const [editText, setEditText] = useState("");
   const [actionLoadingId, setActionLoadingId] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const handleLoadMore = async () => {
+    if (!onLoadMore) return;
+    try {
+      setLoadingMore(true);
+      await onLoadMore();
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const sorted = useMemo(() => {
     const arr = [...(comments || [])];
@@ -152,6 +169,14 @@ export default function CommentsSection({
           background: "rgba(0,0,0,0.12)",
         }}
       >
+        {hasMore && onLoadMore && (
+          <div style={{ textAlign: "center", marginBottom: 8 }}>
+            <button className="btn" onClick={handleLoadMore} disabled={loadingMore}>
+              {loadingMore ? "Loading..." : "Load earlier comments"}
+            </button>
+          </div>
+        )}
+
         {!sorted.length ? (
           <div className="muted small">No comments yet.</div>
         ) : (
@@ -1,9 +1,17 @@
-import { useEffect, useState } from "react";
-import { getNotifications, markAllRead, type NotificationRow } from "../api/notifications";
+import { useEffect, useRef, useState } from "react";
+import {
+  getNotifications,
+  markAllRead,
+  subscribeNotifications,
+  type NotificationRow,
+} from "../api/notifications";
 
 export default function NotificationBell() {
   const [open, setOpen] = useState(false);
   const [items, setItems] = useState<NotificationRow[]>([]);
+  const [serverUnread, setServerUnread] = useState<number | null>(null);
+  const itemsRef = useRef<NotificationRow[]>([]);
+  itemsRef.current = items;
 
   const load = async () => {
     try {
@@ -14,17 +22,38 @@ export default function NotificationBell() {
     }
   };
 
-    useEffect(() => {
+  useEffect(() => {
     load();
 
-    const id = window.setInterval(() => {
-      load();
-    }, 10000); // every 10 sec
+    let pollId: number | undefined;
 
-    return () => window.clearInterval(id);
+    // ✅ pushed by the server (SSE); polling only if the stream is not available
+    const unsubscribe = subscribeNotifications({
+      onNotification: (n) => {
+        setItems((prev) => (prev.some((p) => p.id === n.id) ? prev : [n, ...prev].slice(0, 20)));
+      },
+      onUnread: (count) => {
+        setServerUnread(count);
+        // read somewhere else (other tab / mark all) -> refresh the list
+        if (count < itemsRef.current.length) load();
+      },
+      onClosed: () => {
+        setServerUnread(null);
+        if (pollId === undefined) {
+          pollId = window.setInterval(() => {
+            load();
+          }, 10000); // every 10 sec
+        }
+      },
+    });
+
+    return () => {
+      unsubscribe();
+      if (pollId !== undefined) window.clearInterval(pollId);
+    };
   }, []);
 
-  const unreadCount = items.length;
+  const unreadCount = serverUnread ?? items.length;
 
   const onOpen = async () => {
     setOpen((p) => !p);
@@ -46,6 +46,7 @@ export default function ProfilePage() {
       bio: "",
       notify_email: true,
       notify_inapp: true,
+      notify_digest: "OFF",
     },
   });
 
@@ -66,6 +67,7 @@ export default function ProfilePage() {
         bio: profileQuery.data.bio || "",
         notify_email: profileQuery.data.notify_email,
         notify_inapp: profileQuery.data.notify_inapp,
+        notify_digest: profileQuery.data.notify_digest ?? "OFF",
       });
     }
   }, [profileQuery.data, profileForm]);
@@ -197,6 +199,15 @@ export default function ProfilePage() {
                     <input type="checkbox" {...profileForm.register("notify_inapp")} />
                     <span>Notify In App</span>
                   </label>
+
+                  <label className="checkbox-row">
+                    <span>Email digest</span>
+                    <select {...profileForm.register("notify_digest")}>
+                      <option value="OFF">Off</option>
+                      <option value="HOURLY">Hourly</option>
+                      <option value="DAILY">Daily</option>
+                    </select>
+                  </label>
                 </div>
 
                 <div className="full-width">
@@ -57,6 +57,8 @@ export default function UserDashboard() {
 
   const [comments, setComments] = useState<TaskComment[]>([]);
   const [commentsLoading, setCommentsLoading] = useState(false);
+  const [commentsBefore, setCommentsBefore] = useState<string | null>(null);
+  const [commentsHasMore, setCommentsHasMore] = useState(false);
 
   const [filter, setFilter] = useState<Record<TaskStatus, boolean>>({
     PENDING: true,
@@ -181,6 +183,8 @@ export default function UserDashboard() {
     try {
       const res = await getTaskComments(taskId);
       setComments(res.data?.comments || []);
+      setCommentsBefore(res.data?.next_before ?? null);
+      setCommentsHasMore(!!res.data?.has_more);
     } catch (e: any) {
       setErr(e?.response?.data?.message || "Failed to load comments");
     } finally {
@@ -188,6 +192,18 @@ export default function UserDashboard() {
     }
   };
 
+  const loadOlderComments = async () => {
+    if (expired || !editTask || !commentsBefore) return;
+    try {
+      const res = await getTaskComments(editTask.id, { before: commentsBefore });
+      setComments((prev) => [...(res.data?.comments || []), ...prev]);
+      setCommentsBefore(res.data?.next_before ?? null);
+      setCommentsHasMore(!!res.data?.has_more);
+    } catch (e: any) {
+      setErr(e?.response?.data?.message || "Failed to load comments");
+    }
+  };
+
   const openViewModal = async (t: Task) => {
     if (expired) return;
 
@@ -467,7 +483,7 @@ export default function UserDashboard() {
                       disabled={expired}
                       onClick={() => !expired && openCommentModal(t)}
                     >
-                      Add Comment
+                      Add Comment{t.comment_count ? ` (${t.comment_count})` : ""}
                     </button>
 
                     <button
@@ -812,6 +828,8 @@ export default function UserDashboard() {
               onAdd={expired ? noopAddComment : addCommentToCurrentTask}
               onEdit={expired ? noopEditComment : editCommentForCurrentTask}
               onDelete={expired ? noopDeleteComment : deleteCommentForCurrentTask}
+              hasMore={!expired && commentsHasMore}
+              onLoadMore={loadOlderComments}
             />
           )}
 
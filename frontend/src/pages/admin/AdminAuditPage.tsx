@@ -44,8 +44,10 @@ function safeParsePayload(payload: any): any {
     return { raw: String(data) };
   }
 
+  // diff payloads (UPDATE): key = identifying columns, old/new = changed columns only
   if (data?.new && typeof data.new === "object") {
     return {
+      ...(data.key && typeof data.key === "object" ? data.key : {}),
       ...data.new,
       __old: data.old ?? null,
       __new: data.new,
@@ -264,6 +266,9 @@ export default function AdminAuditPage() {
   const [action, setAction] = useState<string>("");
   const [q, setQ] = useState("");
   const [expandedId, setExpandedId] = useState<number | null>(null);
+  const [nextBefore, setNextBefore] = useState<string | null>(null);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const load = async () => {
     setErr("");
@@ -276,6 +281,8 @@ export default function AdminAuditPage() {
         action: action || undefined,
       });
       setLogs(res?.data?.logs ?? []);
+      setNextBefore(res?.data?.next_before ?? null);
+      setHasMore(!!res?.data?.has_more);
     } catch (e: any) {
       setErr(e?.response?.data?.message || "Failed to load audit logs");
     } finally {
@@ -283,6 +290,27 @@ export default function AdminAuditPage() {
     }
   };
 
+  // ✅ keyset paging: next (older) page after the last row
+  const loadMore = async () => {
+    if (!nextBefore) return;
+    setLoadingMore(true);
+    try {
+      const res = await getAuditLogs({
+        limit,
+        entity: entity || undefined,
+        action: action || undefined,
+        before: nextBefore,
+      });
+      setLogs((prev) => [...prev, ...(res?.data?.logs ?? [])]);
+      setNextBefore(res?.data?.next_before ?? null);
+      setHasMore(!!res?.data?.has_more);
+    } catch (e: any) {
+      setErr(e?.response?.data?.message || "Failed to load audit logs");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     load();
   }, [limit, entity, action]);
@@ -458,6 +486,14 @@ export default function AdminAuditPage() {
             {!loading && rows.length === 0 && (
               <div className="muted">No logs found.</div>
             )}
+
+            {!loading && hasMore && (
+              <div style={{ textAlign: "center", marginTop: 10 }}>
+                <button className="btn" onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? "Loading..." : "Load older"}
+                </button>
+              </div>
+            )}
           </div>
         </div>
       </div>
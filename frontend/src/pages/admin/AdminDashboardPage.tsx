@@ -166,6 +166,8 @@ export default function AdminDashboardPage() {
         onSubmit={a.submitEditTask}
         comments={a.comments}
         commentsLoading={a.commentsLoading}
+        commentsHasMore={a.commentsHasMore}
+        onLoadOlderComments={a.loadOlderComments}
         onAddComment={a.addCommentToCurrentTask}
         onEditComment={a.editCommentForCurrentTask}
         onDeleteComment={a.deleteCommentForCurrentTask}
@@ -336,6 +336,8 @@ export function EditTaskModal({
   onSubmit,
   comments,
   commentsLoading,
+  commentsHasMore,
+  onLoadOlderComments,
   onAddComment,
   onEditComment,
   onDeleteComment,
@@ -366,6 +368,8 @@ export function EditTaskModal({
   onSubmit: () => Promise<void>;
   comments: TaskComment[];
   commentsLoading: boolean;
+  commentsHasMore: boolean;
+  onLoadOlderComments: () => Promise<void>;
   onAddComment: (text: string) => Promise<void>;
   onEditComment: (commentId: string, text: string) => Promise<void>;
   onDeleteComment: (commentId: string) => Promise<void>;
@@ -450,6 +454,8 @@ export function EditTaskModal({
             onAdd={onAddComment}
             onEdit={onEditComment}
             onDelete={onDeleteComment}
+            hasMore={commentsHasMore}
+            onLoadMore={onLoadOlderComments}
           />
         )}
 
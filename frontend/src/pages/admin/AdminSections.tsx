@@ -378,7 +378,7 @@ export function TasksSection({
               </button>
 
               <button className="btn" onClick={() => onComment(t)}>
-                Add Comment
+                Add Comment{t.comment_count ? ` (${t.comment_count})` : ""}
               </button>
 
               <button className="btn" onClick={() => onEdit(t)} disabled={!t.can_edit_status}>
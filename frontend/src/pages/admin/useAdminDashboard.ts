@@ -83,6 +83,8 @@ export function useAdminDashboard() {
   // Comments
   const [comments, setComments] = useState<TaskComment[]>([]);
   const [commentsLoading, setCommentsLoading] = useState(false);
+  const [commentsBefore, setCommentsBefore] = useState<string | null>(null);
+  const [commentsHasMore, setCommentsHasMore] = useState(false);
 
   // Create user form
   const [newUser, setNewUser] = useState<{ email: string; role: "A" | "B" }>({
@@ -354,6 +356,8 @@ export function useAdminDashboard() {
     try {
       const res = await getTaskComments(taskId);
       setComments(res.data?.comments || []);
+      setCommentsBefore(res.data?.next_before ?? null);
+      setCommentsHasMore(!!res.data?.has_more);
     } catch (e: any) {
       setErr(e?.response?.data?.message || "Failed to load comments");
     } finally {
@@ -361,6 +365,18 @@ export function useAdminDashboard() {
     }
   };
 
+  const loadOlderComments = async () => {
+    if (!editTask || !commentsBefore) return;
+    try {
+      const res = await getTaskComments(editTask.id, { before: commentsBefore });
+      setComments((prev) => [...(res.data?.comments || []), ...prev]);
+      setCommentsBefore(res.data?.next_before ?? null);
+      setCommentsHasMore(!!res.data?.has_more);
+    } catch (e: any) {
+      setErr(e?.response?.data?.message || "Failed to load comments");
+    }
+  };
+
   const openViewModal = async (t: Task) => {
     setErr("");
     setEditTask(t);
@@ -561,6 +577,8 @@ export function useAdminDashboard() {
 
     comments,
     commentsLoading,
+    commentsHasMore,
+    loadOlderComments,
     addCommentToCurrentTask,
     editCommentForCurrentTask,
     deleteCommentForCurrentTask,
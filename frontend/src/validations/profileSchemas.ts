@@ -12,6 +12,7 @@ export const profileZodSchema = z.object({
   bio: z.string().max(500, "Bio must be at most 500 characters"),
   notify_email: z.boolean(),
   notify_inapp: z.boolean(),
+  notify_digest: z.enum(["OFF", "HOURLY", "DAILY"]),
 });
 
 